@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from app.persistence.text_index import InvertedIndex
 
 
 class Repository(ABC):
@@ -26,13 +28,126 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def find_range(self, attr_name, low=None, high=None):
+        pass
+
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """Repository en mémoire avec index secondaires optionnels.
+
+    Args:
+        indexes (iterable): Attributs indexés sans contrainte d'unicité.
+        unique_indexes (iterable): Attributs indexés dont la valeur doit
+                                   être unique (ex: email).
+        range_indexes (iterable): Attributs ordonnés (prix, coordonnées)
+                                  interrogeables par intervalle.
+        text_indexes (iterable): Attributs texte couverts par l'index
+                                 plein texte (voir search_text).
+
+    Les index sont tenus à jour par add, update et delete. Un objet modifié
+    directement (sans passer par update) doit être réindexé avec reindex.
+    """
+
+    def __init__(self, indexes=(), unique_indexes=(), range_indexes=(),
+                 text_indexes=()):
         self._storage = {}
+        # attribut -> {valeur: {id: objet}}
+        self._indexes = {}
+        self._unique = set()
+        # attribut -> (valeurs triées, ids aux mêmes positions)
+        self._range_indexes = {}
+        # id -> {attribut: valeur indexée}, pour désindexer même si l'objet
+        # a été modifié entre-temps
+        self._indexed_values = {}
+        self._range_values = {}
+        self._text_fields = tuple(text_indexes)
+        self._text_index = InvertedIndex() if self._text_fields else None
+        for attr_name in indexes:
+            self.add_index(attr_name)
+        for attr_name in unique_indexes:
+            self.add_index(attr_name, unique=True)
+        for attr_name in range_indexes:
+            self.add_range_index(attr_name)
+
+    def add_index(self, attr_name, unique=False):
+        """Déclare un index sur attr_name et l'alimente avec l'existant."""
+        self._indexes[attr_name] = {}
+        if unique:
+            self._unique.add(attr_name)
+        for obj in self._storage.values():
+            self._check_unique(obj, (attr_name,))
+            self._index_attr(obj, attr_name)
+
+    def add_range_index(self, attr_name):
+        """Déclare un index ordonné sur attr_name (recherche par intervalle)."""
+        self._range_indexes[attr_name] = ([], [])
+        for obj in self._storage.values():
+            self._range_index_attr(obj, attr_name)
+
+    def _check_unique(self, obj, attr_names=None):
+        for attr_name in attr_names or self._unique:
+            if attr_name not in self._unique:
+                continue
+            bucket = self._indexes[attr_name].get(getattr(obj, attr_name, None))
+            if bucket and any(obj_id != obj.id for obj_id in bucket):
+                raise ValueError(f"Duplicate value for unique attribute '{attr_name}'")
+
+    def _index_attr(self, obj, attr_name):
+        value = getattr(obj, attr_name, None)
+        self._indexes[attr_name].setdefault(value, {})[obj.id] = obj
+        self._indexed_values.setdefault(obj.id, {})[attr_name] = value
+
+    def _range_index_attr(self, obj, attr_name):
+        value = getattr(obj, attr_name, None)
+        if value is None:
+            return
+        values, ids = self._range_indexes[attr_name]
+        position = bisect_right(values, value)
+        values.insert(position, value)
+        ids.insert(position, obj.id)
+        self._range_values.setdefault(obj.id, {})[attr_name] = value
+
+    def _index(self, obj):
+        for attr_name in self._indexes:
+            self._index_attr(obj, attr_name)
+        for attr_name in self._range_indexes:
+            self._range_index_attr(obj, attr_name)
+        if self._text_index is not None:
+            self._text_index.add(obj.id, {
+                attr_name: getattr(obj, attr_name, None)
+                for attr_name in self._text_fields})
+
+    def _unindex(self, obj_id):
+        for attr_name, value in self._indexed_values.pop(obj_id, {}).items():
+            bucket = self._indexes[attr_name].get(value)
+            if bucket is not None:
+                bucket.pop(obj_id, None)
+                if not bucket:
+                    del self._indexes[attr_name][value]
+        for attr_name, value in self._range_values.pop(obj_id, {}).items():
+            values, ids = self._range_indexes[attr_name]
+            # Parcourt uniquement les entrées de même valeur
+            for position in range(bisect_left(values, value),
+                                  bisect_right(values, value)):
+                if ids[position] == obj_id:
+                    del values[position]
+                    del ids[position]
+                    break
+        if self._text_index is not None:
+            self._text_index.remove(obj_id)
+
+    def reindex(self, obj):
+        """Met à jour les index d'un objet modifié hors de update."""
+        self._check_unique(obj)
+        self._unindex(obj.id)
+        self._index(obj)
 
     def add(self, obj):
+        self._check_unique(obj)
+        self._unindex(obj.id)
         self._storage[obj.id] = obj
+        self._index(obj)
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
@@ -43,13 +158,72 @@ class InMemoryRepository(Repository):
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
+            for attr_name in self._unique.intersection(data):
+                bucket = self._indexes[attr_name].get(data[attr_name])
+                if bucket and any(other_id != obj_id for other_id in bucket):
+                    raise ValueError(
+                        f"Duplicate value for unique attribute '{attr_name}'")
+            self._unindex(obj_id)
             obj.update(data)
+            self._index(obj)
 
     def delete(self, obj_id):
         if obj_id in self._storage:
+            self._unindex(obj_id)
             del self._storage[obj_id]
 
     def get_by_attribute(self, attr_name, attr_value):
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            # Recherche O(1) dans l'index
+            bucket = index.get(attr_value)
+            return next(iter(bucket.values()), None) if bucket else None
         return next(
             (obj for obj in self._storage.values() if getattr(
                 obj, attr_name) == attr_value), None)
+
+    def find_range(self, attr_name, low=None, high=None):
+        """Retourne les objets dont attr_name est dans [low, high].
+
+        Avec un index ordonné, coûte O(log n + k) ; sinon parcours complet.
+        Une borne à None laisse l'intervalle ouvert de ce côté. Les objets
+        sont renvoyés par valeur croissante de attr_name.
+        """
+        range_index = self._range_indexes.get(attr_name)
+        if range_index is not None:
+            values, ids = range_index
+            start = 0 if low is None else bisect_left(values, low)
+            end = len(values) if high is None else bisect_right(values, high)
+            return [self._storage[obj_id] for obj_id in ids[start:end]]
+        matches = [obj for obj in self._storage.values()
+                   if getattr(obj, attr_name, None) is not None
+                   and (low is None or getattr(obj, attr_name) >= low)
+                   and (high is None or getattr(obj, attr_name) <= high)]
+        return sorted(matches, key=lambda obj: getattr(obj, attr_name))
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """Retourne tous les objets dont attr_name vaut attr_value."""
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            return list(index.get(attr_value, {}).values())
+        return [obj for obj in self._storage.values()
+                if getattr(obj, attr_name) == attr_value]
+
+    def search_text(self, query):
+        """Recherche plein texte sur les attributs de text_indexes.
+
+        Seuls les objets contenant tous les mots de la requête sont
+        retournés (le dernier mot est un préfixe), du plus pertinent au
+        moins pertinent (score BM25).
+
+        Returns:
+            list: Tuples (objet, score).
+
+        Raises:
+            ValueError: Sans index plein texte, ou si la requête ne
+                        contient aucun mot.
+        """
+        if self._text_index is None:
+            raise ValueError("This repository has no text index")
+        return [(self._storage[obj_id], score)
+                for obj_id, score in self._text_index.search(query)]
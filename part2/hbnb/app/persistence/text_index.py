@@ -0,0 +1,202 @@
+"""Index inversé en mémoire pour la recherche plein texte.
+
+Équivalent en mémoire des tables FTS5 de la partie 3 : chaque terme pointe
+vers les documents (et champs) qui le contiennent, si bien qu'une
+recherche ne parcourt que les listes des termes demandés. Les résultats
+sont classés par BM25, comme bm25() de SQLite.
+"""
+from bisect import bisect_left, insort
+from math import log
+import re
+import unicodedata
+
+_WORD = re.compile(r'\w+')
+# Paramètres usuels de BM25 (ceux de SQLite FTS5)
+_K1 = 1.2
+_B = 0.75
+
+
+def normalize(word):
+    """Minuscules sans accents, comme le tokenizer unicode61 de SQLite."""
+    decomposed = unicodedata.normalize('NFKD', word.lower())
+    return ''.join(char for char in decomposed
+                   if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """Découpe un texte en termes normalisés."""
+    return [normalize(word) for word in _WORD.findall(text or '')]
+
+
+def snippet(text, query, before='<mark>', after='</mark>', ellipsis='…',
+            size=12):
+    """Extrait de texte autour du premier terme trouvé, termes surlignés.
+
+    Args:
+        text (str): Texte d'origine.
+        query (str): Requête (le dernier terme est un préfixe).
+        before (str): Marqueur ouvrant d'un terme trouvé.
+        after (str): Marqueur fermant d'un terme trouvé.
+        ellipsis (str): Ajouté quand l'extrait est tronqué.
+        size (int): Nombre de mots de l'extrait.
+
+    Returns:
+        str: L'extrait, ou None si aucun terme n'est présent.
+    """
+    terms = tokenize(query)
+    if not terms or not text:
+        return None
+    exact, prefix = set(terms[:-1]), terms[-1]
+
+    def matches(word):
+        word = normalize(word)
+        return word in exact or word.startswith(prefix)
+
+    words = list(_WORD.finditer(text))
+    first = next((i for i, word in enumerate(words)
+                  if matches(word.group())), None)
+    if first is None:
+        return None
+    start = max(0, min(first - size // 2, len(words) - size))
+    end = min(len(words), start + size)
+
+    parts = [ellipsis] if start > 0 else []
+    position = words[start].start()
+    for word in words[start:end]:
+        parts.append(text[position:word.start()])
+        if matches(word.group()):
+            parts.append(f"{before}{word.group()}{after}")
+        else:
+            parts.append(word.group())
+        position = word.end()
+    if end < len(words):
+        parts.append(ellipsis)
+    else:
+        parts.append(text[position:])
+    return ''.join(parts)
+
+
+class InvertedIndex:
+    """Index inversé terme -> documents, avec classement BM25.
+
+    Les documents sont identifiés par un id et découpés en champs nommés
+    (ex: title, description) ; le score d'un document est la somme des
+    scores BM25 de ses champs.
+    """
+
+    def __init__(self):
+        # terme -> {doc_id: {champ: nombre d'occurrences}}
+        self._postings = {}
+        # termes triés, pour la recherche par préfixe
+        self._terms = []
+        # doc_id -> {champ: nombre de termes}
+        self._lengths = {}
+        # doc_id -> termes du document, pour le désindexer
+        self._doc_terms = {}
+        # champ -> nombre total de termes, pour la longueur moyenne
+        self._total_lengths = {}
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def add(self, doc_id, fields):
+        """Indexe (ou réindexe) un document.
+
+        Args:
+            doc_id: Identifiant du document.
+            fields (dict): Texte de chaque champ indexé.
+        """
+        self.remove(doc_id)
+        lengths, doc_terms = {}, set()
+        for field, text in fields.items():
+            terms = tokenize(text)
+            lengths[field] = len(terms)
+            self._total_lengths[field] = \
+                self._total_lengths.get(field, 0) + len(terms)
+            doc_terms.update(terms)
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    insort(self._terms, term)
+                counts = postings.setdefault(doc_id, {})
+                counts[field] = counts.get(field, 0) + 1
+        self._lengths[doc_id] = lengths
+        self._doc_terms[doc_id] = doc_terms
+
+    def remove(self, doc_id):
+        """Retire un document de l'index (sans effet s'il est absent)."""
+        lengths = self._lengths.pop(doc_id, None)
+        if lengths is None:
+            return
+        for field, length in lengths.items():
+            self._total_lengths[field] -= length
+        for term in self._doc_terms.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+
+    def _expand(self, term, prefix):
+        """Termes de l'index correspondant à un terme de la requête."""
+        if not prefix:
+            return [term] if term in self._postings else []
+        position = bisect_left(self._terms, term)
+        expanded = []
+        while position < len(self._terms) and \
+                self._terms[position].startswith(term):
+            expanded.append(self._terms[position])
+            position += 1
+        return expanded
+
+    def _bm25(self, postings):
+        """Score BM25 de chaque document pour une liste de postings."""
+        documents = len(self._lengths)
+        idf = log((documents - len(postings) + 0.5) / (len(postings) + 0.5)
+                  + 1)
+        scores = {}
+        for doc_id, counts in postings.items():
+            score = 0.0
+            for field, count in counts.items():
+                average = self._total_lengths[field] / documents or 1
+                length = self._lengths[doc_id][field]
+                score += idf * count * (_K1 + 1) / (
+                    count + _K1 * (1 - _B + _B * length / average))
+            scores[doc_id] = score
+        return scores
+
+    def search(self, query):
+        """Documents contenant tous les termes de la requête, classés.
+
+        Le dernier terme est recherché comme préfixe (saisie en cours).
+
+        Returns:
+            list: Tuples (doc_id, score), du plus pertinent au moins
+                  pertinent.
+
+        Raises:
+            ValueError: Si la requête ne contient aucun mot.
+        """
+        terms = tokenize(query)
+        if not terms:
+            raise ValueError("Search query must contain at least one word")
+        totals = None
+        for position, term in enumerate(terms):
+            postings = {}
+            for expanded in self._expand(term,
+                                         position == len(terms) - 1):
+                for doc_id, counts in self._postings[expanded].items():
+                    merged = postings.setdefault(doc_id, {})
+                    for field, count in counts.items():
+                        merged[field] = merged.get(field, 0) + count
+            scores = self._bm25(postings) if postings else {}
+            if totals is None:
+                totals = scores
+            else:
+                totals = {doc_id: score + scores[doc_id]
+                          for doc_id, score in totals.items()
+                          if doc_id in scores}
+            if not totals:
+                return []
+        return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
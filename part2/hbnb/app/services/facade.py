@@ -7,15 +7,19 @@ les repositories et fournit une interface
 unifiée pour toutes les opérations sur les modèles.
 """
 from app.persistence.repository import InMemoryRepository
+from app.persistence.text_index import snippet
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
 
 # Repositories globaux pour le partage de données entre les instances
-_user_repo = InMemoryRepository()
-_place_repo = InMemoryRepository()
-_review_repo = InMemoryRepository()
+# (index secondaires sur les attributs utilisés dans les recherches)
+_user_repo = InMemoryRepository(unique_indexes=('email',))
+_place_repo = InMemoryRepository(
+    range_indexes=('price', 'latitude', 'longitude'),
+    text_indexes=('title', 'description'))
+_review_repo = InMemoryRepository(indexes=('place',), text_indexes=('text',))
 _amenity_repo = InMemoryRepository()
 _initialized = False  # Variable globale de contrôle d'initialisation
 
@@ -121,6 +125,63 @@ class HBnBFacade:
         """
         return self.place_repo.get_all()
 
+    def get_places_in_range(self, attr_name, low=None, high=None):
+        """Récupère les hébergements dont un attribut est dans un intervalle.
+
+        Args:
+            attr_name (str): 'price', 'latitude' ou 'longitude'.
+            low (float): Borne inférieure incluse (None = pas de borne).
+            high (float): Borne supérieure incluse (None = pas de borne).
+
+        Returns:
+            list: Hébergements triés par valeur croissante de attr_name.
+
+        Raises:
+            ValueError: Si l'attribut ne peut pas être filtré par intervalle.
+        """
+        if attr_name not in ('price', 'latitude', 'longitude'):
+            raise ValueError(f"Cannot filter places by range on '{attr_name}'")
+        return self.place_repo.find_range(attr_name, low, high)
+
+    def search_places_text(self, query, limit=None):
+        """Recherche plein texte des hébergements.
+
+        Un hébergement correspond si son titre, sa description ou l'un de
+        ses avis contient tous les mots de la requête ; son score est la
+        somme des scores de l'hébergement et de ses avis.
+
+        Args:
+            query (str): Mots recherchés (le dernier peut être incomplet).
+            limit (int): Nombre maximum de résultats (None = tous).
+
+        Returns:
+            list: Tuples (Place, score, extrait surligné), du plus
+                  pertinent au moins pertinent.
+
+        Raises:
+            ValueError: Si la requête ne contient aucun mot.
+        """
+        scores, review_texts = {}, {}
+        for place, score in self.place_repo.search_text(query):
+            scores[place.id] = score
+        for review, score in self.review_repo.search_text(query):
+            place_id = review.place.id
+            scores[place_id] = scores.get(place_id, 0.0) + score
+            # Avis le plus pertinent de l'hébergement, pour l'extrait
+            review_texts.setdefault(place_id, review.text)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        results = []
+        for place_id, score in ranked[:limit]:
+            place = self.place_repo.get(place_id)
+            if place is None:
+                continue
+            excerpt = snippet(place.title, query) \
+                or snippet(place.description, query) \
+                or snippet(review_texts.get(place_id), query)
+            results.append((place, score, excerpt))
+        return results
+
     def update_place(self, place_id, place_data):
         """Met à jour un hébergement existant.
 
@@ -332,15 +393,12 @@ class HBnBFacade:
         if not place_id:
             return []
 
-        # On récupère toutes les reviews
-        all_reviews = self.review_repo.get_all()
+        place = self.place_repo.get(place_id)
+        if not place:
+            return []
 
-        # On filtre les reviews et on garde que celles du lieu spécifié
-        place_reviews = []
-        for review in all_reviews:
-            if review.place and review.place.id == place_id:
-                place_reviews.append(review)
-        return place_reviews
+        # Lecture directe dans l'index des reviews par hébergement
+        return self.review_repo.get_all_by_attribute('place', place)
 
     def updated_review(self, review_id, review_data):
         """Met à jour un avis existant.
@@ -382,6 +440,8 @@ class HBnBFacade:
 
         # Sauvegarde des modifications
         review.save()
+        # Texte modifié hors de update : mise à jour de l'index plein texte
+        self.review_repo.reindex(review)
         return review
 
     def delete_review(self, review_id):
@@ -0,0 +1,161 @@
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.persistence.repository import InMemoryRepository
+from app.persistence.text_index import snippet
+import unittest
+
+
+class TestInMemoryRepositoryIndexes(unittest.TestCase):
+    """Tests des index secondaires du repository en mémoire"""
+
+    def setUp(self):
+        self.repo = InMemoryRepository(indexes=('last_name',),
+                                       unique_indexes=('email',))
+        self.alice = User(email="alice@example.com", first_name="Alice",
+                          last_name="Martin")
+        self.bob = User(email="bob@example.com", first_name="Bob",
+                        last_name="Martin")
+        self.repo.add(self.alice)
+        self.repo.add(self.bob)
+
+    def test_unique_index_lookup(self):
+        self.assertIs(self.repo.get_by_attribute('email', "bob@example.com"),
+                      self.bob)
+        self.assertIsNone(self.repo.get_by_attribute('email', "x@example.com"))
+
+    def test_unique_index_rejects_duplicates(self):
+        clone = User(email="alice@example.com", first_name="Other",
+                     last_name="User")
+        with self.assertRaises(ValueError):
+            self.repo.add(clone)
+        with self.assertRaises(ValueError):
+            self.repo.update(self.bob.id, {'email': "alice@example.com"})
+
+    def test_non_unique_index_lookup(self):
+        self.assertEqual(
+            {u.id for u in self.repo.get_all_by_attribute('last_name', "Martin")},
+            {self.alice.id, self.bob.id})
+
+    def test_update_moves_index_entry(self):
+        self.repo.update(self.alice.id, {'email': "alice@new.com"})
+        self.assertIsNone(self.repo.get_by_attribute('email', "alice@example.com"))
+        self.assertIs(self.repo.get_by_attribute('email', "alice@new.com"),
+                      self.alice)
+
+    def test_delete_removes_index_entry(self):
+        self.repo.delete(self.bob.id)
+        self.assertIsNone(self.repo.get_by_attribute('email', "bob@example.com"))
+        self.assertEqual(self.repo.get_all_by_attribute('last_name', "Martin"),
+                         [self.alice])
+
+    def test_reindex_after_direct_change(self):
+        self.alice.last_name = "Durand"
+        self.repo.reindex(self.alice)
+        self.assertEqual(self.repo.get_all_by_attribute('last_name', "Durand"),
+                         [self.alice])
+
+    def test_unindexed_attribute_falls_back_to_scan(self):
+        self.assertIs(self.repo.get_by_attribute('first_name', "Bob"), self.bob)
+
+    def test_add_index_on_existing_data(self):
+        repo = InMemoryRepository()
+        wifi = Amenity(name="WiFi")
+        repo.add(wifi)
+        repo.add_index('name', unique=True)
+        self.assertIs(repo.get_by_attribute('name', "WiFi"), wifi)
+
+
+class TestInMemoryRepositoryRangeIndexes(unittest.TestCase):
+    """Tests des index ordonnés (recherche par intervalle)"""
+
+    def setUp(self):
+        self.repo = InMemoryRepository(range_indexes=('price',))
+        owner = User(email="owner@example.com", first_name="Property",
+                     last_name="Owner")
+        self.places = []
+        for price in (120.0, 45.0, 80.0, 45.0, 300.0):
+            place = Place(title=f"Place {price}", description="", price=price,
+                          latitude=0.0, longitude=0.0, owner=owner)
+            self.repo.add(place)
+            self.places.append(place)
+
+    def test_find_range_sorted_and_inclusive(self):
+        found = self.repo.find_range('price', 45.0, 120.0)
+        self.assertEqual([p.price for p in found], [45.0, 45.0, 80.0, 120.0])
+
+    def test_find_range_open_bounds(self):
+        self.assertEqual([p.price for p in self.repo.find_range('price', low=100)],
+                         [120.0, 300.0])
+        self.assertEqual([p.price for p in self.repo.find_range('price', high=50)],
+                         [45.0, 45.0])
+
+    def test_find_range_follows_update_and_delete(self):
+        self.repo.update(self.places[4].id, {'price': 50.0})
+        self.repo.delete(self.places[1].id)
+        found = self.repo.find_range('price', 40.0, 60.0)
+        self.assertEqual([p.id for p in found],
+                         [self.places[3].id, self.places[4].id])
+
+    def test_find_range_without_index_scans(self):
+        found = self.repo.find_range('latitude', -1.0, 1.0)
+        self.assertEqual(len(found), 5)
+
+
+
+class TestInMemoryRepositoryTextIndex(unittest.TestCase):
+    """Tests de l'index plein texte (index inversé)"""
+
+    def setUp(self):
+        self.repo = InMemoryRepository(text_indexes=('title', 'description'))
+        owner = User(email="owner@example.com", first_name="Property",
+                     last_name="Owner")
+        self.places = {}
+        for title, description in [
+                ("Studio Montmartre", "Petit studio calme près du Sacré-Cœur"),
+                ("Loft", "Grand loft lumineux avec terrasse"),
+                ("Chalet", "Chalet en bois, vue sur les pistes, calme")]:
+            place = Place(title=title, description=description, price=80.0,
+                          latitude=0.0, longitude=0.0, owner=owner)
+            self.repo.add(place)
+            self.places[title] = place
+
+    def _titles(self, query):
+        return [place.title for place, _ in self.repo.search_text(query)]
+
+    def test_all_words_required_accents_ignored(self):
+        self.assertEqual(self._titles("calme sacre"), ["Studio Montmartre"])
+        self.assertEqual(sorted(self._titles("CALME")),
+                         ["Chalet", "Studio Montmartre"])
+        self.assertEqual(self._titles("calme terrasse"), [])
+
+    def test_last_word_is_a_prefix(self):
+        self.assertEqual(self._titles("lumin"), ["Loft"])
+        self.assertEqual(self._titles("lumin grand"), [])
+
+    def test_index_follows_update_and_delete(self):
+        self.repo.update(self.places["Loft"].id,
+                         {'description': "Loft calme"})
+        self.repo.delete(self.places["Chalet"].id)
+        self.assertEqual(sorted(self._titles("calme")),
+                         ["Loft", "Studio Montmartre"])
+        self.assertEqual(self._titles("terrasse"), [])
+
+    def test_shorter_field_ranks_first(self):
+        owner = self.places["Loft"].owner
+        self.repo.add(Place(title="Calme", description="", price=80.0,
+                            latitude=0.0, longitude=0.0, owner=owner))
+        self.assertEqual(self._titles("calme")[0], "Calme")
+
+    def test_snippet_highlights_terms(self):
+        self.assertEqual(
+            snippet("Petit studio calme près du Sacré-Cœur", "sacre",
+                    size=3),
+            "…du <mark>Sacré</mark>-Cœur")
+        self.assertIsNone(snippet("Loft", "chalet"))
+        with self.assertRaises(ValueError):
+            self.repo.search_text("  !? ")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
 -- This script creates all tables
 
 -- Drop tables if they exist (for re-execution)
+-- Full-text (FTS5) tables are recreated and filled by the application
+DROP TABLE IF EXISTS places_fts;
+DROP TABLE IF EXISTS reviews_fts;
 DROP TABLE IF EXISTS place_amenity;
 DROP TABLE IF EXISTS reviews;
 DROP TABLE IF EXISTS places;
@@ -19,6 +22,9 @@ CREATE TABLE users (
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Indexes on updated_at: max(updated_at) of the HTTP validators (ETag)
+CREATE INDEX ix_users_updated_at ON users (updated_at);
+
 -- Create Amenity table
 CREATE TABLE amenities (
     id CHAR(36) PRIMARY KEY,
@@ -27,6 +33,8 @@ CREATE TABLE amenities (
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
 
+CREATE INDEX ix_amenities_updated_at ON amenities (updated_at);
+
 -- Create Place table
 CREATE TABLE places (
     id CHAR(36) PRIMARY KEY,
@@ -35,12 +43,30 @@ CREATE TABLE places (
     price DECIMAL(10, 2) NOT NULL,
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
+    geohash VARCHAR(12),
     owner_id CHAR(36) NOT NULL,
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_1 INT NOT NULL DEFAULT 0,
+    rating_2 INT NOT NULL DEFAULT 0,
+    rating_3 INT NOT NULL DEFAULT 0,
+    rating_4 INT NOT NULL DEFAULT 0,
+    rating_5 INT NOT NULL DEFAULT 0,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (owner_id) REFERENCES users(id)
 );
 
+-- Indexes for range filters, search and keyset-paginated sorts
+CREATE INDEX ix_places_price_id ON places (price, id);
+CREATE INDEX ix_places_latitude_longitude ON places (latitude, longitude);
+CREATE INDEX ix_places_longitude ON places (longitude);
+CREATE INDEX ix_places_created_at_id ON places (created_at, id);
+CREATE INDEX ix_places_review_count_id ON places (review_count, id);
+CREATE INDEX ix_places_updated_at ON places (updated_at);
+-- Spatial index for nearby searches (geohash prefix ranges)
+CREATE INDEX ix_places_geohash ON places (geohash);
+
 -- Create Review table
 CREATE TABLE reviews (
     id CHAR(36) PRIMARY KEY,
@@ -54,6 +80,14 @@ CREATE TABLE reviews (
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
+-- Indexes for the reviews of a place, sorted by date or rating
+CREATE INDEX ix_reviews_place_id_created_at ON reviews (place_id, created_at, id);
+CREATE INDEX ix_reviews_place_id_rating ON reviews (place_id, rating, id);
+CREATE INDEX ix_reviews_updated_at ON reviews (updated_at);
+
+-- One review per user and place
+CREATE UNIQUE INDEX uq_reviews_user_id_place_id ON reviews (user_id, place_id);
+
 -- Create Place-Amenity join table
 CREATE TABLE place_amenity (
     place_id CHAR(36) NOT NULL,
@@ -62,3 +96,5 @@ CREATE TABLE place_amenity (
     FOREIGN KEY (place_id) REFERENCES places(id),
     FOREIGN KEY (amenity_id) REFERENCES amenities(id)
 );
+
+CREATE INDEX ix_place_amenity_amenity_id_place_id ON place_amenity (amenity_id, place_id);
@@ -4,6 +4,12 @@ from flask_jwt_extended import JWTManager
 
 # Import des extensions depuis models
 from app.models import db, bcrypt
+from app.api.encoders import init_json_encoder
+from app.api.response_cache import init_response_cache
+from app.persistence.replicas import init_replicas
+from app.persistence.fulltext import ensure_fulltext_index
+from app.persistence.schema import upgrade_schema
+from app.persistence.sqlite import configure_sqlite_pragmas
 
 jwt = JWTManager()
 
@@ -13,16 +19,31 @@ def create_app(config_class="config.DevelopmentConfig"):
     
     api = Api(app, version='1.0', title='HBnB API',
               description='HBnB Application API')
+    # Encodeur JSON des réponses (orjson si disponible, sinon json)
+    init_json_encoder(app, api)
     
     jwt.init_app(app)
     db.init_app(app)
     bcrypt.init_app(app)
+    init_replicas(app)
 
     # Initialiser les modèles APRÈS les extensions
     with app.app_context():
+        # Avant toute connexion, pour que le pool entier soit réglé
+        configure_sqlite_pragmas(db.engine, app.config.get('SQLITE_PRAGMAS'))
         from app.models import init_models
         models = init_models()
         db.create_all()
+        # Base existante : colonnes et index ajoutés depuis sa création
+        upgraded = upgrade_schema(db.engine, db.metadata, app.logger)
+        from app.services import facade
+        if 'review_count' in upgraded.get('places', ()):
+            # Agrégats d'avis absents de l'ancienne base : calculés une fois
+            facade.repair_rating_stats()
+        # Hébergements sans geohash (ancienne base, import SQL direct)
+        facade.index_place_locations()
+        # Tables FTS5 : hors de portée de create_all
+        app.extensions['fulltext'] = ensure_fulltext_index(db.engine)
 
     from app.api.v1.users import api as users_ns
     # Importation du namespace des amenities
@@ -31,6 +52,12 @@ def create_app(config_class="config.DevelopmentConfig"):
     from app.api.v1.reviews import api as reviews_ns
     from app.api.v1.auth import api as auth_ns
     from app.api.v1.protected import api as protected_ns
+
+    # Cache de lecture optionnel devant les repositories
+    facade.configure_cache(app.config.get('REPOSITORY_CACHE_SIZE', 0),
+                           app.config.get('REPOSITORY_CACHE_TTL'))
+    # Cache des réponses HTTP, invalidé par les écritures de la façade
+    facade.configure_response_cache(init_response_cache(app))
     
 
     # Register the users namespace
@@ -42,4 +69,7 @@ def create_app(config_class="config.DevelopmentConfig"):
     api.add_namespace(auth_ns, path='/api/v1/auth')
     api.add_namespace(protected_ns, path='/api/v1/protected')
 
+    from app.commands import register_commands
+    register_commands(app)
+
     return app
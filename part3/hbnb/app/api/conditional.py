@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""Requêtes conditionnelles : ETag, Last-Modified et 304 Not Modified.
+
+Les validateurs sont calculés à partir de la version de la ressource (voir
+app.persistence.versions), lue par une requête d'agrégat avant la requête
+complète : si le client a déjà la représentation courante, la réponse 304
+part sans charger ni sérialiser d'objet.
+
+- objet : ETag fort (la version couvre tout le corps) ;
+- collection : ETag faible, une page pouvant être reconstruite à
+  l'identique après une écriture ailleurs dans la table.
+
+L'ETag dépend aussi de la représentation (chemin, paramètres, encodeur),
+d'où des validateurs identiques pour les routes Flask et la voie ASGI.
+Cache-Control: no-cache demande aux clients (dont le navigateur du front
+part4) de revalider à chaque fois plutôt que de réutiliser la réponse.
+"""
+import hashlib
+from datetime import datetime, timezone
+from flask import current_app, request
+from werkzeug.http import (http_date, parse_date, parse_etags, quote_etag,
+                           unquote_etag)
+
+
+def representation_key(path, query_string, encoder, indent=False):
+    """Identifie une représentation : mêmes octets pour une même version."""
+    return f'{encoder.name}:{int(indent)}:{path}?{query_string}'
+
+
+def validators(version, key, weak=False):
+    """ETag et date de dernière modification d'une version.
+
+    Args:
+        version (tuple): Version lue par le repository.
+        key (str): Représentation (voir representation_key).
+        weak (bool): ETag faible (collections).
+
+    Returns:
+        tuple: (ETag entre guillemets, datetime UTC ou None)
+    """
+    digest = hashlib.sha1(f'{key}|{version!r}'.encode('utf-8')).hexdigest()
+    dates = [value for value in version if isinstance(value, datetime)]
+    # updated_at est stocké en UTC naïf
+    last_modified = max(dates).replace(tzinfo=timezone.utc) \
+        if dates else None
+    return quote_etag(digest, weak), last_modified
+
+
+def validator_headers(etag, last_modified):
+    """En-têtes des validateurs, pour la réponse 200 comme pour la 304."""
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(etag, last_modified, if_none_match, if_modified_since):
+    """Indique si le client a déjà la représentation courante.
+
+    If-None-Match (comparaison faible) prime : If-Modified-Since n'est
+    consulté qu'en son absence, comme le prévoit la RFC 9110.
+    """
+    if if_none_match:
+        tag, _ = unquote_etag(etag)
+        return parse_etags(if_none_match).contains_weak(tag)
+    if if_modified_since and last_modified is not None:
+        since = parse_date(if_modified_since)
+        # Last-Modified est envoyé à la seconde près
+        return since is not None and \
+            last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def conditional_get(version, weak=False):
+    """Validateurs de la requête Flask courante et éventuelle 304.
+
+    À appeler avant la requête complète et la sérialisation.
+
+    Args:
+        version (tuple): Version de la ressource (None : ressource absente,
+                         pas de validateurs).
+        weak (bool): ETag faible (collections).
+
+    Returns:
+        tuple: (en-têtes à joindre à la réponse 200, réponse 304 ou None)
+    """
+    if version is None:
+        return {}, None
+    key = representation_key(request.path,
+                             request.query_string.decode('latin-1'),
+                             current_app.extensions['json_encoder'],
+                             current_app.debug)
+    etag, last_modified = validators(version, key, weak)
+    headers = validator_headers(etag, last_modified)
+    if is_not_modified(etag, last_modified,
+                       request.headers.get('If-None-Match'),
+                       request.headers.get('If-Modified-Since')):
+        return headers, current_app.response_class(status=304,
+                                                   headers=headers)
+    return headers, None
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""Encodage JSON des réponses de l'API, avec encodeur interchangeable.
+
+flask-restx encode par défaut avec le module json standard, en passant par
+une chaîne Python ré-encodée ensuite en UTF-8. Ici, l'encodeur est choisi
+au démarrage (JSON_ENCODER) :
+
+- 'orjson' : encodeur C, produit directement des octets et sérialise
+  nativement datetime, date et UUID (même format que isoformat()) ;
+- 'json' : module standard, avec les mêmes conversions via default= ;
+- 'auto' (défaut) : orjson s'il est installé, sinon json.
+
+Les longues listes (JSON_STREAM_MIN_ITEMS éléments et plus) sont encodées
+par tranches et envoyées au fil de l'eau, sans construire tout le corps.
+"""
+import json
+from datetime import date
+from itertools import islice
+from uuid import UUID
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle
+    orjson = None
+
+ENCODERS = ('auto', 'orjson', 'json')
+
+
+def _default(value):
+    """Conversions de json.dumps alignées sur celles d'orjson."""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} "
+                    "is not JSON serializable")
+
+
+class StdlibEncoder:
+    """Encodeur du module json standard."""
+
+    name = 'json'
+
+    def __init__(self, settings=None):
+        # RESTX_JSON : réglages de json.dumps, comme avec flask-restx
+        self.settings = dict(settings or {})
+        self.settings.setdefault('default', _default)
+
+    def dumps(self, data, indent=False):
+        """Encode un objet en octets UTF-8 (sans retour à la ligne)."""
+        settings = self.settings
+        if indent and 'indent' not in settings:
+            settings = dict(settings, indent=4)
+        return json.dumps(data, **settings).encode('utf-8')
+
+
+class OrjsonEncoder:
+    """Encodeur orjson."""
+
+    name = 'orjson'
+
+    def dumps(self, data, indent=False):
+        """Encode un objet en octets UTF-8 (sans retour à la ligne)."""
+        # Clés non chaînes acceptées, comme json.dumps
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+
+
+def create_encoder(name='auto', settings=None, logger=None):
+    """Crée l'encodeur demandé, avec repli sur json.
+
+    Args:
+        name (str): 'auto', 'orjson' ou 'json'.
+        settings (dict): Réglages de json.dumps (RESTX_JSON).
+        logger: Journal où signaler un repli sur json.
+
+    Raises:
+        ValueError: Si le nom d'encodeur est inconnu.
+    """
+    if name not in ENCODERS:
+        raise ValueError(f"JSON_ENCODER must be one of: {', '.join(ENCODERS)}")
+    if name != 'json' and orjson is not None and not settings:
+        return OrjsonEncoder()
+    if name == 'orjson' and logger is not None:
+        reason = 'RESTX_JSON is set' if orjson is not None \
+            else 'orjson is not installed'
+        logger.warning("JSON_ENCODER=orjson ignored (%s), using json", reason)
+    return StdlibEncoder(settings)
+
+
+def init_json_encoder(app, api):
+    """Installe l'encodeur configuré pour les réponses application/json."""
+    app.extensions['json_encoder'] = create_encoder(
+        app.config.get('JSON_ENCODER', 'auto'),
+        app.config.get('RESTX_JSON'), app.logger)
+    api.representations['application/json'] = output_json
+
+
+def _chunks(items, chunk_size):
+    """Découpe un itérable (liste ou générateur) en listes de chunk_size."""
+    items = iter(items)
+    chunk = list(islice(items, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, chunk_size))
+
+
+def iter_json_list(encoder, items, chunk_size):
+    """Encode une liste par tranches : '[', éléments séparés par ',', ']'.
+
+    Chaque tranche est encodée d'un bloc (une liste), puis privée de ses
+    crochets. items peut être un générateur : il n'est parcouru qu'au fil
+    de l'envoi.
+    """
+    yield b'['
+    for index, chunk in enumerate(_chunks(items, chunk_size)):
+        if index:
+            yield b','
+        yield encoder.dumps(chunk)[1:-1]
+    yield b']\n'
+
+
+def iter_ndjson(encoder, items, chunk_size):
+    """Encode des éléments en NDJSON (un objet JSON par ligne), par tranches."""
+    for chunk in _chunks(items, chunk_size):
+        yield b''.join(encoder.dumps(item) + b'\n' for item in chunk)
+
+
+def output_json(data, code, headers=None):
+    """Construit une réponse JSON avec l'encodeur de l'application."""
+    encoder = current_app.extensions['json_encoder']
+    stream_min = current_app.config.get('JSON_STREAM_MIN_ITEMS', 0)
+    if isinstance(data, list) and stream_min and len(data) >= stream_min \
+            and not current_app.debug:
+        chunk_size = current_app.config.get('JSON_STREAM_CHUNK_ITEMS', 500)
+        resp = current_app.response_class(
+            iter_json_list(encoder, data, chunk_size), status=code)
+    else:
+        # Toujours terminer par un retour à la ligne, comme flask-restx
+        resp = make_response(
+            encoder.dumps(data, indent=current_app.debug) + b'\n', code)
+    resp.headers.extend(headers or {})
+    return resp
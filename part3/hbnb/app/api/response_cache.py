@@ -0,0 +1,351 @@
+#!/usr/bin/python3
+"""Cache des réponses HTTP des lectures publiques, invalidé par les écritures.
+
+Les réponses 200 de GET /places/, /places/<id>, /amenities/ et
+/reviews/places/<id>/reviews sont gardées telles quelles (statut, en-têtes,
+octets du corps) : un hit ne touche ni la base ni l'encodeur.
+
+La clé couvre la représentation (chemin, paramètres, encodeur, voir
+representation_key), la portée d'authentification et les étiquettes de
+la réponse (ex: 'places', 'place:<id>'). Chaque étiquette a un jeton de
+génération ; invalider une étiquette lui donne un nouveau jeton, ce qui
+rend inaccessibles d'un coup toutes les entrées qui en dépendent, sans
+les énumérer (elles sont ensuite évincées par LRU ou TTL).
+
+La clé est calculée avant l'exécution de la vue : une réponse lue avant
+une écriture concurrente est rangée sous les anciens jetons, jamais
+servie après l'invalidation.
+
+Les invalidations sont déclenchées par les méthodes d'écriture de la
+façade, après le commit (voir HBnBFacade.configure_response_cache).
+
+Deux backends :
+
+- 'memory' : LRU en mémoire du processus (un seul worker) ;
+- 'redis' : partagé entre workers, via tout client compatible redis-py
+  (get, set, mget, mset) ; le paquet redis est une dépendance optionnelle.
+"""
+import hashlib
+import json
+import uuid
+from functools import wraps
+from flask import current_app, g, request
+from werkzeug.http import parse_date
+from app.api.conditional import is_not_modified, representation_key
+from app.persistence.cache import LRUCache
+
+try:
+    import redis
+except ImportError:  # dépendance optionnelle
+    redis = None
+
+BACKENDS = ('', 'memory', 'redis')
+
+# En-têtes propres à une réponse, jamais rejoués depuis le cache
+_UNCACHED_HEADERS = {'content-length', 'set-cookie', 'date', 'x-cache'}
+
+
+def _new_token():
+    return uuid.uuid4().hex
+
+
+class MemoryBackend:
+    """Réponses et jetons d'étiquettes en mémoire du processus.
+
+    Args:
+        maxsize (int): Nombre maximum de réponses gardées.
+        ttl (float): Durée de vie d'une réponse en secondes (None = infinie).
+    """
+
+    name = 'memory'
+    # Appels sans entrée/sortie : utilisables tels quels en asyncio
+    blocking = False
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.entries = LRUCache(maxsize, ttl)
+        # Un jeton évincé est recréé au hasard : ses réponses deviennent
+        # inaccessibles, ce qui est sûr
+        self._tokens = LRUCache(maxsize * 4)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, entry):
+        self.entries.set(key, entry)
+
+    def tokens(self, tags):
+        """Jetons courants des étiquettes (créés au premier usage)."""
+        tokens = []
+        for tag in tags:
+            token = self._tokens.get(tag)
+            if token is None:
+                token = _new_token()
+                self._tokens.set(tag, token)
+            tokens.append(token)
+        return tokens
+
+    def invalidate(self, tags):
+        for tag in tags:
+            self._tokens.set(tag, _new_token())
+
+    def stats(self):
+        return self.entries.stats()
+
+
+class RedisBackend:
+    """Réponses et jetons d'étiquettes partagés dans Redis.
+
+    Args:
+        client: Client compatible redis-py (get, set, mget, mset).
+        ttl (float): Durée de vie d'une réponse en secondes (None = infinie).
+        prefix (str): Préfixe des clés, pour partager une instance Redis.
+    """
+
+    name = 'redis'
+    # Appels réseau : exécutés hors de la boucle asyncio par la voie ASGI
+    blocking = True
+
+    def __init__(self, client, ttl=None, prefix='hbnb:responses:'):
+        self.client = client
+        self.ttl = int(ttl) if ttl else None
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_url(cls, url, ttl=None):
+        """Crée le backend à partir d'une URL redis://.
+
+        Raises:
+            RuntimeError: Si le paquet redis n'est pas installé.
+        """
+        if redis is None:
+            # Pas de repli en mémoire : chaque worker servirait ses propres
+            # réponses, périmées après une écriture faite par un autre
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND='redis' requires the redis package")
+        return cls(redis.Redis.from_url(url), ttl)
+
+    def get(self, key):
+        raw = self.client.get(f'{self.prefix}entry:{key}')
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        data = json.loads(raw)
+        return (data['status'], [tuple(header) for header in data['headers']],
+                data['body'].encode('utf-8'))
+
+    def set(self, key, entry):
+        status, headers, body = entry
+        # Corps JSON produit par l'encodeur de l'API : toujours en UTF-8
+        raw = json.dumps({'status': status, 'headers': headers,
+                          'body': body.decode('utf-8')})
+        self.client.set(f'{self.prefix}entry:{key}', raw, ex=self.ttl)
+
+    def tokens(self, tags):
+        """Jetons courants des étiquettes (créés au premier usage).
+
+        SET NX : deux workers qui créent le même jeton retiennent le même.
+        """
+        keys = [f'{self.prefix}tag:{tag}' for tag in tags]
+        tokens = self.client.mget(keys) if keys else []
+        missing = [key for key, token in zip(keys, tokens) if token is None]
+        if missing:
+            for key in missing:
+                self.client.set(key, _new_token(), nx=True)
+            tokens = self.client.mget(keys)
+        return [token.decode('ascii') if isinstance(token, bytes) else token
+                for token in tokens]
+
+    def invalidate(self, tags):
+        if tags:
+            self.client.mset({f'{self.prefix}tag:{tag}': _new_token()
+                              for tag in tags})
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'ttl': self.ttl,
+                'hit_ratio': self.hits / lookups if lookups else 0.0}
+
+
+class ResponseCache:
+    """Cache de réponses au-dessus d'un backend, commun à Flask et ASGI.
+
+    Une entrée est un tuple (statut, liste d'en-têtes (nom, valeur),
+    corps en octets).
+
+    Args:
+        backend: MemoryBackend ou RedisBackend.
+        max_body (int): Taille maximale d'un corps gardé, en octets.
+    """
+
+    def __init__(self, backend, max_body=1024 * 1024):
+        self.backend = backend
+        self.max_body = max_body
+
+    def key(self, representation, scope, tags):
+        """Clé d'une réponse, valable jusqu'à l'invalidation d'une étiquette.
+
+        Args:
+            representation (str): Voir representation_key.
+            scope (str): Portée d'authentification ('public' ou identité).
+            tags (iterable): Étiquettes dont dépend la réponse.
+
+        Returns:
+            str: Empreinte SHA-1 de la représentation et des jetons.
+        """
+        tags = sorted(set(tags))
+        tokens = self.backend.tokens(tags)
+        raw = f'{representation}|{scope}|{",".join(tokens)}'
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, status, headers, body):
+        """Garde une réponse 200 (sans effet pour les autres).
+
+        Returns:
+            bool: True si la réponse a été gardée.
+        """
+        if status != 200 or len(body) > self.max_body:
+            return False
+        headers = [(name, value) for name, value in headers
+                   if name.lower() not in _UNCACHED_HEADERS]
+        self.backend.set(key, (status, headers, body))
+        return True
+
+    def invalidate(self, tags):
+        self.backend.invalidate(sorted(set(tags)))
+
+    def stats(self):
+        return dict(self.backend.stats(), backend=self.backend.name)
+
+    @staticmethod
+    def not_modified(entry, if_none_match, if_modified_since):
+        """En-têtes de la 304 si le client a déjà la réponse gardée, sinon None.
+
+        Les validateurs gardés restent exacts : l'entrée disparaît à la
+        première écriture qui changerait la version de la ressource.
+        """
+        headers = {name: value for name, value in entry[1]
+                   if name in ('ETag', 'Last-Modified', 'Cache-Control')}
+        if 'ETag' not in headers:
+            return None
+        last_modified = parse_date(headers.get('Last-Modified'))
+        if is_not_modified(headers['ETag'], last_modified, if_none_match,
+                           if_modified_since):
+            return headers
+        return None
+
+
+def create_response_cache(config):
+    """Crée le cache de réponses décrit par la configuration.
+
+    Args:
+        config (dict): Configuration de l'application (RESPONSE_CACHE_*).
+
+    Returns:
+        ResponseCache: Le cache, ou None si RESPONSE_CACHE_BACKEND est vide.
+
+    Raises:
+        ValueError: Si le backend est inconnu.
+    """
+    name = config.get('RESPONSE_CACHE_BACKEND', '')
+    if name not in BACKENDS:
+        raise ValueError(f"RESPONSE_CACHE_BACKEND must be one of {BACKENDS}")
+    if not name:
+        return None
+    ttl = config.get('RESPONSE_CACHE_TTL')
+    if name == 'memory':
+        backend = MemoryBackend(config.get('RESPONSE_CACHE_SIZE', 1024), ttl)
+    else:
+        backend = RedisBackend.from_url(config['RESPONSE_CACHE_REDIS_URL'],
+                                        ttl)
+    return ResponseCache(backend,
+                         config.get('RESPONSE_CACHE_MAX_BODY', 1024 * 1024))
+
+
+def init_response_cache(app, cache=None):
+    """Active le cache de réponses de l'application Flask.
+
+    Args:
+        app (Flask): Application.
+        cache (ResponseCache): Cache à utiliser (défaut : selon la
+                               configuration, None le désactive).
+
+    Returns:
+        ResponseCache: Le cache actif ou None.
+    """
+    if cache is None:
+        cache = create_response_cache(app.config)
+    app.extensions['response_cache'] = cache
+    if cache is not None:
+        app.after_request(_store_response)
+    return cache
+
+
+def _auth_scope(vary_on_identity):
+    """Portée d'authentification de la requête Flask courante."""
+    if not vary_on_identity:
+        return 'public'
+    from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+    verify_jwt_in_request(optional=True)
+    identity = get_jwt_identity()
+    return 'anonymous' if identity is None else \
+        json.dumps(identity, sort_keys=True, default=str)
+
+
+def cached_response(tags, vary_on_identity=False):
+    """Sert la méthode GET d'une Resource depuis le cache de réponses.
+
+    Args:
+        tags (callable): Reçoit les arguments de la route, retourne les
+                         étiquettes dont dépend la réponse.
+        vary_on_identity (bool): Une entrée par identité JWT (routes dont la
+                                 réponse dépend de l'appelant).
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(resource, *args, **kwargs):
+            cache = current_app.extensions.get('response_cache')
+            if cache is None:
+                return method(resource, *args, **kwargs)
+            representation = representation_key(
+                request.path, request.query_string.decode('latin-1'),
+                current_app.extensions['json_encoder'], current_app.debug)
+            key = cache.key(representation, _auth_scope(vary_on_identity),
+                            tags(**kwargs))
+            entry = cache.get(key)
+            if entry is None:
+                # Rangée par _store_response une fois la réponse construite
+                g.response_cache_key = key
+                return method(resource, *args, **kwargs)
+            headers = cache.not_modified(
+                entry, request.headers.get('If-None-Match'),
+                request.headers.get('If-Modified-Since'))
+            if headers is not None:
+                return current_app.response_class(status=304, headers=dict(
+                    headers, **{'X-Cache': 'HIT'}))
+            status, cached_headers, body = entry
+            response = current_app.response_class(body, status=status,
+                                                  headers=cached_headers)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+        return wrapper
+    return decorator
+
+
+def _store_response(response):
+    """after_request : garde la réponse d'un miss de cached_response."""
+    key = g.pop('response_cache_key', None)
+    if key is None:
+        return response
+    response.headers['X-Cache'] = 'MISS'
+    # Les longues listes envoyées par tranches ne sont pas gardées
+    if response.status_code == 200 and not response.is_streamed:
+        current_app.extensions['response_cache'].set(
+            key, response.status_code, list(response.headers.items()),
+            response.get_data())
+    return response
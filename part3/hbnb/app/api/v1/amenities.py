@@ -7,6 +7,16 @@ la mise à jour des amenities dans l'application HBnB.
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from app.services import facade  # Import unifié comme dans users.py
+from app.api.v1.pagination import (get_pagination_args, pagination_headers,
+                                   pagination_params)
+from app.api.v1.batch import get_batch_items, run_batch
+from app.api.v1.fieldsets import fields_params, get_fields_arg, sparse
+from app.api.conditional import conditional_get
+from app.api.response_cache import cached_response
+from app.api.v1.lookup import (get_lookup_body_ids, get_lookup_ids,
+                               lookup_params, lookup_response)
+from app.models.amenity import Amenity
+from app.serializers import serializer
 
 # Création du namespace pour les opérations sur les amenities
 api = Namespace('amenities', description='Amenity operations')
@@ -16,6 +26,48 @@ amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description='Name of the amenity')
 })
 
+batch_result_model = api.model('AmenityBatchResult', {
+    'created': fields.Integer(description='Number of amenities created'),
+    'failed': fields.Integer(description='Number of items rejected'),
+    'results': fields.List(fields.Raw, description='Per-item result (index, id or error)')
+})
+
+lookup_model = api.model('AmenityLookup', {
+    'ids': fields.List(fields.String, required=True,
+                       description='IDs of the amenities to fetch')
+})
+
+
+def validate_amenity_data(amenity_data):
+    """Valide les données d'une amenity.
+
+    Args:
+        amenity_data (dict): Données envoyées par le client.
+
+    Returns:
+        str: Message d'erreur, ou None si les données sont valides.
+    """
+    name = amenity_data.get('name')
+    if not name:
+        return "Name is required"
+    # len() lèverait TypeError sur un nombre, une liste ou un objet
+    if not isinstance(name, str):
+        return "Name must be a string"
+    if len(name) > 50:
+        return "Name must be less than 50 characters"
+    return None
+
+
+# Champs d'un équipement dans la liste, pour ?fields=
+AMENITY_FIELDS = {
+    'id': lambda amenity: amenity.id,
+    'name': lambda amenity: amenity.name,
+}
+
+
+# Représentation complète d'un équipement (fonction précompilée)
+amenity_details = serializer(Amenity, 'detail')
+
 
 @api.route('/')
 class AmenityList(Resource):
@@ -36,14 +88,9 @@ class AmenityList(Resource):
         try:
             # Récupération et validation des données
             amenity_data = api.payload
-
-            # Vérifier que le nom est présent
-            if not amenity_data.get('name'):
-                return {"error": "Name is required"}, 400
-
-            # Vérifier que le nom ne dépasse pas 50 caractères
-            if len(amenity_data['name']) > 50:
-                return {"error": "Name must be less than 50 characters"}, 400
+            error = validate_amenity_data(amenity_data)
+            if error:
+                return {"error": error}, 400
 
             # Création de l'amenity après validation
             new_amenity = facade.create_amenity(amenity_data['name'])
@@ -67,28 +114,98 @@ class AmenityList(Resource):
             print(f"Error creating amenity: {str(e)}")
             return {"error": f"An unexpected error occurred: {str(e)}"}, 500
 
+    @api.doc(params=dict(pagination_params, **fields_params,
+                         **lookup_params))
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters, fields or ids')
     @api.response(500, 'Server error')
+    @cached_response(lambda: ('amenities',))
     def get(self):
-        """Get all amenities (PUBLIC)"""
+        """Get a page of amenities, or the amenities with the given ids (PUBLIC)"""
         try:
-            # Récupère toutes les amenities via la façade
-            amenities = facade.get_all_amenities()
+            # 304 sur une requête d'agrégat, avant la page elle-même
+            validators, not_modified = conditional_get(
+                facade.get_amenities_version(), weak=True)
+            if not_modified:
+                return not_modified
+            ids = get_lookup_ids()
+            if ids is not None:
+                return lookup_response(ids, facade.get_amenities_by_ids,
+                                       amenity_details) + (validators,)
+            # Récupère une page d'amenities via la façade
+            limit, cursor = get_pagination_args()
+            fields = get_fields_arg()
+            amenities, next_cursor = facade.get_amenities_page(
+                limit, cursor, fields or tuple(AMENITY_FIELDS))
 
             # Si aucune amenity n'existe, retourne une liste vide
             if not amenities:
-                return [], 200
+                return [], 200, validators
 
             # Formate la réponse pour inclure uniquement les champs nécessaires
-            result = []
-            for amenity in amenities:
-                result.append({'id': amenity.id, 'name': amenity.name})
-            return result, 200
+            if fields is None:
+                result = [amenity_details(amenity) for amenity in amenities]
+            else:
+                result = [sparse(amenity, AMENITY_FIELDS, fields)
+                          for amenity in amenities]
+            return result, 200, dict(pagination_headers(next_cursor),
+                                     **validators)
+        except ValueError as e:
+            return {"error": str(e)}, 400
         except Exception as e:
             print(f"Error retrieving amenities: {str(e)}")
             return {"error": "Failed to retrieve amenities"}, 500
 
 
+@api.route('/batch')
+class AmenityBatch(Resource):
+    @api.expect([amenity_model])
+    @api.response(201, 'All amenities successfully created', batch_result_model)
+    @api.response(207, 'Some amenities could not be created', batch_result_model)
+    @api.response(400, 'Invalid batch payload')
+    @api.response(403, 'Admin privileges required')
+    @api.response(500, 'Server error')
+    @jwt_required()
+    def post(self):
+        """Create many amenities at once (ADMIN ONLY)"""
+        current_user = get_jwt_identity()
+
+        # Vérification des privilèges admin
+        if not current_user.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+
+        try:
+            items = get_batch_items()
+            return run_batch(
+                items, validate_amenity_data,
+                lambda valid, chunk_size: facade.create_amenities_batch(
+                    [item['name'] for item in valid], chunk_size))
+
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        except Exception as e:
+            print(f"Error creating amenities batch: {str(e)}")
+            return {"error": "An unexpected error occurred"}, 500
+
+
+@api.route('/lookup')
+class AmenityLookup(Resource):
+    @api.expect(lookup_model)
+    @api.response(200, 'Amenities retrieved by ID')
+    @api.response(400, 'Invalid list of ids')
+    @api.response(500, 'Internal server error')
+    def post(self):
+        """Get the amenities with the given ids, for long lists (PUBLIC)"""
+        try:
+            return lookup_response(get_lookup_body_ids(),
+                                   facade.get_amenities_by_ids, amenity_details)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            print(f"Error looking up amenities: {str(e)}")
+            return {'error': 'An unexpected error occurred'}, 500
+
+
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
     @api.response(200, 'Amenity details retrieved successfully')
@@ -97,6 +214,10 @@ class AmenityResource(Resource):
     def get(self, amenity_id):
         """Get amenity by ID (PUBLIC)"""
         try:
+            validators, not_modified = conditional_get(
+                facade.get_amenity_version(amenity_id))
+            if not_modified:
+                return not_modified
             # Récupération de l'amenity par son ID
             amenity = facade.get_amenity_by_id(amenity_id)
 
@@ -106,7 +227,7 @@ class AmenityResource(Resource):
                     "error": f"Amenity with ID {amenity_id} not found"}, 404
 
             # Retourne les détails de l'amenity
-            return {'id': amenity.id, 'name': amenity.name}, 200
+            return amenity_details(amenity), 200, validators
         except Exception as e:
             print(f"Error retrieving amenity: {str(e)}")
             return {"error": "Failed to retrieve amenity"}, 500
@@ -131,11 +252,9 @@ class AmenityResource(Resource):
             amenity_data = api.payload
 
             # Validation des données d'entrée
-            if not amenity_data.get('name'):
-                return {"error": "Name is required"}, 400
-
-            if len(amenity_data['name']) > 50:
-                return {"error": "Name must be less than 50 characters"}, 400
+            error = validate_amenity_data(amenity_data)
+            if error:
+                return {"error": error}, 400
 
             # Vérifie d'abord si l'amenity existe
             existing_amenity = facade.get_amenity_by_id(amenity_id)
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""Outils partagés par les endpoints de création en masse (/batch).
+
+Un endpoint batch reçoit une liste JSON d'éléments, valide chacun d'eux,
+puis confie les éléments valides à la façade qui les insère par lots
+transactionnels. La réponse donne un résultat par élément, dans l'ordre.
+"""
+from flask import current_app, request
+
+
+def get_batch_items():
+    """Lit la liste d'éléments envoyée dans le corps de la requête.
+
+    Returns:
+        list: Les éléments à créer.
+
+    Raises:
+        ValueError: Si le corps n'est pas une liste non vide ou dépasse
+                    BATCH_MAX_ITEMS éléments.
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        raise ValueError("Request body must be a non-empty list of items")
+
+    max_items = current_app.config.get('BATCH_MAX_ITEMS', 10000)
+    if len(items) > max_items:
+        raise ValueError(f"A batch cannot contain more than {max_items} items")
+    return items
+
+
+def run_batch(items, validate, create):
+    """Valide puis crée une liste d'éléments.
+
+    Args:
+        items (list): Éléments reçus du client.
+        validate (callable): Reçoit un élément, retourne un message
+                             d'erreur ou None s'il est valide.
+        create (callable): Reçoit la liste des éléments valides et la
+                           taille de lot, retourne un tuple
+                           (objet ou None, erreur ou None) par élément.
+
+    Returns:
+        tuple: (corps de la réponse, code HTTP) — 201 si tout a été créé,
+               207 sinon.
+    """
+    results = [{'index': index} for index in range(len(items))]
+    valid = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            error = 'Each item must be a JSON object'
+        else:
+            error = validate(item)
+        if error:
+            results[index]['error'] = error
+        else:
+            valid.append(index)
+
+    if valid:
+        chunk_size = current_app.config.get('BATCH_CHUNK_SIZE', 500)
+        created = create([items[index] for index in valid], chunk_size)
+        for index, (obj, error) in zip(valid, created):
+            if obj is not None:
+                results[index]['id'] = obj.id
+            else:
+                results[index]['error'] = error
+
+    created_count = sum(1 for result in results if 'id' in result)
+    status = 201 if created_count == len(items) else 207
+    return {
+        'created': created_count,
+        'failed': len(items) - created_count,
+        'results': results
+    }, status
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""Export complet d'une collection, envoyé au fil de l'eau.
+
+Pour un dump (administration, ETL), GET /<ressource>/export parcourt toute
+la table par lots (yield_per) et encode chaque lot dès qu'il est lu : ni la
+liste des objets ni celle des dicts ne sont construites, la mémoire reste
+constante quelle que soit la taille de la table. Deux formats :
+
+- json (défaut) : un tableau JSON, comme les listes paginées ;
+- ndjson : un objet JSON par ligne (application/x-ndjson), lisible ligne
+  à ligne par le client.
+"""
+from flask import current_app, request, stream_with_context
+from app.api.encoders import iter_json_list, iter_ndjson
+
+EXPORT_FORMATS = {'json': 'application/json',
+                  'ndjson': 'application/x-ndjson'}
+
+# Paramètre documenté dans Swagger pour chaque export
+export_params = {
+    'format': 'json (a JSON array, default) or ndjson (one JSON object '
+              'per line); Accept: application/x-ndjson also selects ndjson'
+}
+
+
+def get_export_format():
+    """Lit le format demandé (?format=, sinon l'en-tête Accept).
+
+    Raises:
+        ValueError: Si le format est inconnu.
+    """
+    export_format = request.args.get('format')
+    if export_format is None:
+        best = request.accept_mimetypes.best_match(
+            ['application/json', 'application/x-ndjson'])
+        return 'ndjson' if best == 'application/x-ndjson' else 'json'
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    return export_format
+
+
+def export_response(iter_objs, to_dict, export_format='json'):
+    """Construit la réponse streamée d'un export.
+
+    Args:
+        iter_objs (callable): Méthode de la façade, iter_objs(batch_size)
+                              parcourt tous les objets.
+        to_dict (callable): Sérialise un objet.
+        export_format (str): 'json' ou 'ndjson'.
+
+    Returns:
+        Response: Réponse dont le corps est produit lot par lot.
+    """
+    encoder = current_app.extensions['json_encoder']
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    items = (to_dict(obj) for obj in iter_objs(batch_size))
+    if export_format == 'ndjson':
+        body = iter_ndjson(encoder, items, batch_size)
+    else:
+        body = iter_json_list(encoder, items, batch_size)
+    # Le contexte (et la session SQLAlchemy) reste ouvert pendant l'envoi
+    return current_app.response_class(
+        stream_with_context(body), mimetype=EXPORT_FORMATS[export_format])
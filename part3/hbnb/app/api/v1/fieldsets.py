@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""Champs partiels (``?fields=``) partagés par les endpoints de liste.
+
+Le client choisit les champs de chaque élément (ex: ?fields=id,title,price
+pour une carte d'hébergement) ; la façade ne charge que les colonnes
+correspondantes et seuls ces champs sont sérialisés. L'id est toujours
+renvoyé.
+"""
+from flask import request
+
+# Paramètre documenté dans Swagger pour chaque liste
+fields_params = {
+    'fields': 'Comma-separated fields to return, e.g. id,title,price '
+              '(default: all)'
+}
+
+
+def get_fields_arg():
+    """Lit le paramètre fields de la requête.
+
+    Returns:
+        tuple: Champs demandés dans l'ordre, id en premier, ou None si le
+               paramètre est absent (tous les champs).
+
+    Raises:
+        ValueError: Si le paramètre ne contient aucun champ.
+    """
+    value = request.args.get('fields')
+    if value is None:
+        return None
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    if not fields:
+        raise ValueError("fields must list at least one field")
+    return tuple(dict.fromkeys(['id'] + fields))
+
+
+def sparse(obj, getters, fields):
+    """Sérialise uniquement les champs demandés d'un objet.
+
+    Args:
+        obj: Objet chargé avec les options du même jeu de champs.
+        getters (dict): Fonction de lecture de chaque champ.
+        fields (tuple): Champs produits par get_fields_arg.
+
+    Returns:
+        dict: Représentation partielle de l'objet.
+    """
+    return {field: getters[field](obj) for field in fields}
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""Lecture groupée par IDs partagée par les endpoints de ressources.
+
+Un client qui connaît déjà des IDs (favoris, auteurs d'avis, amenities à
+afficher) les résout en un appel : GET /<ressource>/?ids=a,b,c ou, pour les
+longues listes, POST /<ressource>/lookup avec {"ids": [...]}. La façade lit
+tous les objets en une requête IN (...) et la réponse les donne par ID,
+avec la liste explicite des IDs introuvables.
+"""
+from flask import current_app, request
+
+# Paramètre documenté dans Swagger pour chaque liste
+lookup_params = {
+    'ids': 'Comma-separated IDs to fetch in one call; the response is '
+           '{"results": {id: item}, "missing": [ids]}'
+}
+
+
+def _check_ids(ids):
+    """Valide une liste d'IDs et la dédoublonne en conservant l'ordre."""
+    if not ids or not all(isinstance(obj_id, str) and obj_id
+                          for obj_id in ids):
+        raise ValueError("ids must be a non-empty list of IDs")
+    ids = list(dict.fromkeys(ids))
+    max_ids = current_app.config.get('LOOKUP_MAX_IDS', 1000)
+    if len(ids) > max_ids:
+        raise ValueError(f"A lookup cannot contain more than {max_ids} IDs")
+    return ids
+
+
+def get_lookup_ids():
+    """Lit le paramètre ids de la requête.
+
+    Returns:
+        list: IDs demandés, ou None si le paramètre est absent.
+
+    Raises:
+        ValueError: Si la liste est vide ou trop longue.
+    """
+    value = request.args.get('ids')
+    if value is None:
+        return None
+    return _check_ids([obj_id.strip() for obj_id in value.split(',')
+                       if obj_id.strip()])
+
+
+def get_lookup_body_ids():
+    """Lit la liste d'IDs envoyée dans le corps ({"ids": [...]}).
+
+    Raises:
+        ValueError: Si le corps ne contient pas une liste d'IDs valide.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('ids'), list):
+        raise ValueError('Request body must be {"ids": [...]}')
+    return _check_ids(data['ids'])
+
+
+def lookup_response(ids, get_many, to_dict):
+    """Résout des IDs et construit la réponse indexée par ID.
+
+    Args:
+        ids (list): IDs validés.
+        get_many (callable): Méthode de la façade, retourne
+                             (objets trouvés, IDs introuvables).
+        to_dict (callable): Sérialise un objet.
+
+    Returns:
+        tuple: (corps de la réponse, code HTTP 200)
+    """
+    found, missing = get_many(ids)
+    return {'results': {obj.id: to_dict(obj) for obj in found},
+            'missing': missing}, 200
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+"""Outils de pagination partagés par les endpoints de liste.
+
+Les listes sont paginées par curseur : le client passe ?limit= et ?cursor=,
+et le curseur de la page suivante est renvoyé dans l'en-tête X-Next-Cursor
+(le corps reste une liste JSON pour ne pas casser les clients existants).
+"""
+from flask import current_app, request
+
+# Paramètres documentés dans Swagger pour chaque endpoint paginé
+pagination_params = {
+    'limit': 'Maximum number of items to return',
+    'cursor': 'Opaque cursor returned in X-Next-Cursor by the previous page'
+}
+
+
+def get_pagination_args():
+    """Lit et valide les paramètres limit et cursor de la requête.
+
+    Returns:
+        tuple: (limit, cursor)
+
+    Raises:
+        ValueError: Si limit n'est pas un entier positif.
+    """
+    default_limit = current_app.config.get('PAGINATION_DEFAULT_LIMIT', 50)
+    max_limit = current_app.config.get('PAGINATION_MAX_LIMIT', 500)
+
+    limit = request.args.get('limit', default_limit)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be a positive integer")
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+
+    cursor = request.args.get('cursor') or None
+    return min(limit, max_limit), cursor
+
+
+def pagination_headers(next_cursor):
+    """Construit les en-têtes de réponse pour la page suivante."""
+    if not next_cursor:
+        return {}
+    return {'X-Next-Cursor': next_cursor}
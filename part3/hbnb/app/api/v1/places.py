@@ -1,6 +1,20 @@
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from app.services import facade
+from app.api.v1.pagination import (get_pagination_args, pagination_headers,
+                                   pagination_params)
+from app.api.v1.batch import get_batch_items, run_batch
+from app.api.v1.fieldsets import fields_params, get_fields_arg, sparse
+from app.api.conditional import conditional_get
+from app.api.response_cache import cached_response
+from app.api.v1.lookup import (get_lookup_body_ids, get_lookup_ids,
+                               lookup_params, lookup_response)
+from app.api.v1.export import (export_params, export_response,
+                               get_export_format)
+from app.models.place import Place
+from app.serializers import serializer
+from app.api.v1.reviews import review_details
 
 # Création du namespace pour les opérations sur les places
 api = Namespace('places', description='Place operations')
@@ -36,6 +50,169 @@ place_model = api.model('Place', {
     'amenities': fields.List(fields.String, required=False, description="List of amenities ID's"),
 })
 
+batch_result_model = api.model('PlaceBatchResult', {
+    'created': fields.Integer(description='Number of places created'),
+    'failed': fields.Integer(description='Number of items rejected'),
+    'results': fields.List(fields.Raw, description='Per-item result (index, id or error)')
+})
+
+lookup_model = api.model('PlaceLookup', {
+    'ids': fields.List(fields.String, required=True,
+                       description='IDs of the places to fetch')
+})
+
+
+def rating_stats(place):
+    """Agrégats d'avis d'un hébergement, lus sur sa ligne (aucune requête)."""
+    return {"review_count": place.review_count,
+            "average_rating": place.average_rating,
+            "rating_histogram": place.rating_histogram}
+
+
+# Lecture de chaque champ d'une carte, pour ?fields=
+PLACE_FIELDS = {
+    'id': lambda place: place.id,
+    'title': lambda place: place.title,
+    'description': lambda place: place.description,
+    'price': lambda place: place.price,
+    'latitude': lambda place: place.latitude,
+    'longitude': lambda place: place.longitude,
+    'owner_id': lambda place: place.owner_id,
+    'amenities': lambda place: [{"id": amenity.id, "name": amenity.name}
+                                for amenity in place.amenities],
+    'images': lambda place: place.images,
+    'review_count': lambda place: place.review_count,
+    'average_rating': lambda place: place.average_rating,
+    'rating_histogram': lambda place: place.rating_histogram,
+}
+
+
+# Carte et fiche d'un hébergement (fonctions précompilées)
+_place_card = serializer(Place, 'card')
+place_details = serializer(Place, 'detail')
+
+
+def place_card(place, fields=None):
+    """Représentation d'un hébergement dans une liste (profil list_card).
+
+    Avec fields, seuls les champs demandés sont produits.
+    """
+    if fields is not None:
+        return sparse(place, PLACE_FIELDS, fields)
+    return _place_card(place)
+
+
+def _float_arg(name):
+    """Lit un paramètre de requête numérique optionnel."""
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
+
+def get_search_args():
+    """Lit et valide les filtres de GET /places/search.
+
+    Returns:
+        dict: Arguments nommés de facade.search_places (hors pagination).
+
+    Raises:
+        ValueError: Si un filtre est mal formé.
+    """
+    bbox = [_float_arg(name)
+            for name in ('min_lat', 'min_lng', 'max_lat', 'max_lng')]
+    if any(value is None for value in bbox):
+        if any(value is not None for value in bbox):
+            raise ValueError("min_lat, min_lng, max_lat and max_lng "
+                             "must be given together")
+        bbox = None
+    amenities = request.args.get('amenities', '')
+    return {
+        'min_price': _float_arg('min_price'),
+        'max_price': _float_arg('max_price'),
+        'amenity_ids': [amenity_id.strip()
+                        for amenity_id in amenities.split(',')
+                        if amenity_id.strip()],
+        'bbox': tuple(bbox) if bbox else None,
+        'text_query': request.args.get('q') or None,
+        'sort': request.args.get('sort') or None,
+        'order': request.args.get('order', 'asc'),
+    }
+
+
+# Paramètres documentés dans Swagger pour la recherche
+search_params = dict(pagination_params, **fields_params, **{
+    'q': 'Words to find in the title, description or reviews',
+    'min_price': 'Minimum price per night (inclusive)',
+    'max_price': 'Maximum price per night (inclusive)',
+    'amenities': 'Comma-separated amenity IDs, all required',
+    'min_lat': 'Bounding box south latitude',
+    'min_lng': 'Bounding box west longitude',
+    'max_lat': 'Bounding box north latitude',
+    'max_lng': 'Bounding box east longitude (< min_lng crosses the antimeridian)',
+    'sort': "Sort key: 'relevance' (default with q), 'created_at' "
+            "(default otherwise), 'price' or 'review_count'",
+    'order': "Sort order: 'asc' (default) or 'desc'"
+})
+
+
+def get_nearby_args():
+    """Lit les paramètres obligatoires de GET /places/nearby.
+
+    Returns:
+        tuple: (lat, lng, radius_km)
+
+    Raises:
+        ValueError: Si un paramètre manque ou n'est pas un nombre.
+    """
+    values = tuple(_float_arg(name) for name in ('lat', 'lng', 'radius_km'))
+    if any(value is None for value in values):
+        raise ValueError("lat, lng and radius_km are required")
+    return values
+
+
+# Paramètres documentés dans Swagger pour la recherche de proximité
+nearby_params = {
+    'lat': 'Latitude of the search center',
+    'lng': 'Longitude of the search center',
+    'radius_km': 'Search radius in kilometers',
+    'limit': 'Maximum number of places to return'
+}
+
+
+def validate_place_data(place_data):
+    """Valide les données d'un nouvel hébergement.
+
+    Args:
+        place_data (dict): Données envoyées par le client.
+
+    Returns:
+        str: Message d'erreur, ou None si les données sont valides.
+    """
+    # Validation du titre: ne doit pas être vide
+    if not place_data.get('title'):
+        return 'Title is required'
+
+    # Validation du prix: doit être un nombre positif
+    price = place_data.get('price')
+    if not isinstance(price, (int, float)) or price <= 0:
+        return 'Price must be a positive number'
+
+    latitude = place_data.get('latitude')
+    longitude = place_data.get('longitude')
+
+    # Validation des coordonnées géographiques
+    if latitude is None or longitude is None:
+        return 'Latitude and longitude are required'
+    if not isinstance(latitude, (int, float)) or not -90 <= latitude <= 90:
+        return 'Latitude must be between -90 and 90 degrees'
+    if not isinstance(longitude, (int, float)) or not -180 <= longitude <= 180:
+        return 'Longitude must be between -180 and 180 degrees'
+    return None
+
 
 @api.route('/')
 class PlaceList(Resource):
@@ -55,24 +232,10 @@ class PlaceList(Resource):
             # Forcer l'utilisateur connecté comme propriétaire
             place_data['owner_id'] = current_user['id']
 
-            # Validation du titre: ne doit pas être vide
-            if not place_data.get('title'):
-                return {'error': 'Title is required'}, 400
-
-            # Validation du prix: doit être un nombre positif
-            if not place_data.get('price') or place_data['price'] <= 0:
-                return {'error': 'Price must be a positive number'}, 400
-
-            latitude = place_data.get('latitude')
-            longitude = place_data.get('longitude')
-
-            # Validation des coordonnées géographiques
-            if latitude is None or longitude is None:
-                return {'error': 'Latitude and longitude are required'}, 400
-            if not -90 <= latitude <= 90:
-                return {'error': 'Latitude must be between -90 and 90 degrees'}, 400
-            if not -180 <= longitude <= 180:
-                return {'error': 'Longitude must be between -180 and 180 degrees'}, 400
+            # Validation des champs (titre, prix, coordonnées)
+            error = validate_place_data(place_data)
+            if error:
+                return {'error': error}, 400
 
             # Vérification que le propriétaire existe
             owner = facade.get_user(place_data['owner_id'])
@@ -89,12 +252,12 @@ class PlaceList(Resource):
                 return {"id": new_place.id, "title": new_place.title,
                         "description": new_place.description, "price": new_place.price,
                         "latitude": new_place.latitude, "longitude": new_place.longitude,
-                        "owner_id": new_place.owner.id, "amenities": amenities_list}, 201
+                        "owner_id": new_place.owner_id, "amenities": amenities_list}, 201
 
             return {"id": new_place.id, "title": new_place.title,
                     "description": new_place.description, "price": new_place.price,
                     "latitude": new_place.latitude, "longitude": new_place.longitude,
-                    "owner_id": new_place.owner.id}, 201
+                    "owner_id": new_place.owner_id}, 201
 
         except ValueError as e:
             return {'error': str(e)}, 400
@@ -102,76 +265,241 @@ class PlaceList(Resource):
             print(f"Error creating place: {str(e)}")
             return {'error': 'An unexpected error occurred'}, 500
 
+    @api.doc(params=dict(pagination_params, **fields_params,
+                         **lookup_params))
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters, fields or ids')
     @api.response(500, 'Internal server error')
+    # ?ids= renvoie des fiches, propriétaire compris
+    @cached_response(lambda: ('places', 'amenities', 'users'))
     def get(self):
-        """Get all places (PUBLIC)"""
+        """Get a page of places, or the places with the given ids (PUBLIC)"""
         try:
-            places = facade.get_all_places()
-            result = []
-
+            # 304 sur une requête d'agrégat, avant la page elle-même
+            validators, not_modified = conditional_get(
+                facade.get_places_version(), weak=True)
+            if not_modified:
+                return not_modified
+            ids = get_lookup_ids()
+            if ids is not None:
+                return lookup_response(ids, facade.get_places_by_ids,
+                                       place_details) + (validators,)
+            limit, cursor = get_pagination_args()
+            fields = get_fields_arg()
+            places, next_cursor = facade.get_places_page(limit, cursor,
+                                                         fields=fields)
             # Formatage de chaque hébergement pour la réponse
-            for place in places:
-                if place.amenities:
-                    amenities_list = [{"id": amenity.id, "name": amenity.name}
-                                      for amenity in place.amenities]
-                    result.append({"id": place.id,
-                                   "title": place.title,
-                                   "description": place.description,
-                                   "price": place.price,
-                                   "latitude": place.latitude,
-                                   "longitude": place.longitude,
-                                   "owner_id": place.owner.id,
-                                   "amenities": amenities_list,
-                                   "images": place.images})
-                else:
-                    result.append({"id": place.id,
-                                   "title": place.title,
-                                   "description": place.description,
-                                   "price": place.price,
-                                   "latitude": place.latitude,
-                                   "longitude": place.longitude,
-                                   "owner_id": place.owner.id,
-                                   "images": place.images})
-            return result, 200
+            result = [place_card(place, fields) for place in places]
+            return result, 200, dict(pagination_headers(next_cursor),
+                                     **validators)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             print(f"Error retrieving places: {str(e)}")
             return {'error': 'An unexpected error occurred'}, 500
 
 
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.doc(params=search_params)
+    @api.response(200, 'Matching places retrieved successfully')
+    @api.response(400, 'Invalid search parameters')
+    @api.response(500, 'Internal server error')
+    def get(self):
+        """Search places by text, price, amenities and area (PUBLIC)"""
+        try:
+            limit, cursor = get_pagination_args()
+            search_args = get_search_args()
+            fields = get_fields_arg()
+            places, next_cursor = facade.search_places(
+                limit, cursor, fields=fields, **search_args)
+            result = [place_card(place, fields) for place in places]
+            if search_args['text_query'] is not None:
+                # Extrait surligné de chaque résultat (<mark>...</mark>)
+                excerpts = facade.get_search_snippets(
+                    search_args['text_query'], [place.id for place in places])
+                for card in result:
+                    card['snippet'] = excerpts.get(card['id'])
+            return result, 200, pagination_headers(next_cursor)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            print(f"Error searching places: {str(e)}")
+            return {'error': 'An unexpected error occurred'}, 500
+
+
+@api.route('/nearby')
+class PlaceNearby(Resource):
+    @api.doc(params=nearby_params)
+    @api.response(200, 'Places within the radius, nearest first')
+    @api.response(400, 'Invalid search parameters')
+    @api.response(500, 'Internal server error')
+    def get(self):
+        """Get places around a position, ordered by distance (PUBLIC)"""
+        try:
+            lat, lng, radius_km = get_nearby_args()
+            limit, _ = get_pagination_args()
+            results = facade.get_places_nearby(lat, lng, radius_km, limit)
+            return [dict(place_card(place), distance_km=round(distance, 3))
+                    for place, distance in results], 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            print(f"Error searching nearby places: {str(e)}")
+            return {'error': 'An unexpected error occurred'}, 500
+
+
+@api.route('/batch')
+class PlaceBatch(Resource):
+    @api.expect([place_model])
+    @api.response(201, 'All places successfully created', batch_result_model)
+    @api.response(207, 'Some places could not be created', batch_result_model)
+    @api.response(400, 'Invalid batch payload')
+    @api.response(401, 'Authentication required')
+    @api.response(404, 'Owner not found')
+    @api.response(500, 'Internal server error')
+    @jwt_required()
+    def post(self):
+        """Create many places at once (Authenticated users only)"""
+        try:
+            current_user = get_jwt_identity()
+            items = get_batch_items()
+
+            # Vérification unique du propriétaire pour tout le lot
+            owner = facade.get_user(current_user['id'])
+            if not owner:
+                return {'error': 'User does not exist'}, 404
+
+            return run_batch(
+                items, validate_place_data,
+                lambda valid, chunk_size: facade.create_places_batch(
+                    valid, owner.id, chunk_size))
+
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            print(f"Error creating places batch: {str(e)}")
+            return {'error': 'An unexpected error occurred'}, 500
+
+
+# Paramètres documentés dans Swagger pour la fiche d'un hébergement
+include_params = dict(pagination_params, **{
+    'include': 'Comma-separated relations to embed: owner, amenities, '
+               'reviews (limit/cursor then page the reviews)'
+})
+
+
+def get_include_arg():
+    """Lit le paramètre include de la requête.
+
+    Returns:
+        tuple: Relations demandées, ou None si le paramètre est absent.
+    """
+    value = request.args.get('include')
+    if value is None:
+        return None
+    return tuple(dict.fromkeys(name.strip() for name in value.split(',')
+                               if name.strip()))
+
+
+def place_compound(place, include, reviews):
+    """Fiche d'un hébergement avec les relations incluses.
+
+    Un propriétaire non inclus est représenté par son owner_id.
+    """
+    result = {"id": place.id, "title": place.title,
+              "description": place.description, "price": place.price,
+              "latitude": place.latitude, "longitude": place.longitude}
+    if 'owner' in include:
+        result["owner"] = {"id": place.owner.id,
+                           "first_name": place.owner.first_name,
+                           "last_name": place.owner.last_name,
+                           "email": place.owner.email}
+    else:
+        result["owner_id"] = place.owner_id
+    if 'amenities' in include:
+        result["amenities"] = [{"id": amenity.id, "name": amenity.name}
+                               for amenity in place.amenities]
+    result["images"] = place.images
+    result.update(rating_stats(place))
+    if reviews is not None:
+        result["reviews"] = [review_details(review) for review in reviews]
+    return result
+
+
+@api.route('/lookup')
+class PlaceLookup(Resource):
+    @api.expect(lookup_model)
+    @api.response(200, 'Places retrieved by ID')
+    @api.response(400, 'Invalid list of ids')
+    @api.response(500, 'Internal server error')
+    def post(self):
+        """Get the places with the given ids, for long lists (PUBLIC)"""
+        try:
+            return lookup_response(get_lookup_body_ids(),
+                                   facade.get_places_by_ids, place_details)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            print(f"Error looking up places: {str(e)}")
+            return {'error': 'An unexpected error occurred'}, 500
+
+
+@api.route('/export')
+class PlaceExport(Resource):
+    @api.doc(params=export_params)
+    @api.response(200, 'All places, streamed')
+    @api.response(400, 'Invalid export format')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """Export all places as a streamed JSON array or NDJSON (ADMIN ONLY)"""
+        current_user = get_jwt_identity()
+        if not current_user.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+        try:
+            return export_response(facade.iter_places, place_card, get_export_format())
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+
 @api.route('/<place_id>')
 class PlaceResource(Resource):
+    @api.doc(params=include_params)
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(400, 'Invalid include or pagination parameters')
     @api.response(404, 'Place not found')
     @api.response(500, 'Internal server error')
+    @cached_response(lambda place_id: (f'place:{place_id}', 'amenities',
+                                       'users'))
     def get(self, place_id):
         """Get place details by ID (PUBLIC)"""
         try:
-            place = facade.get_place(place_id)
+            include = get_include_arg()
+            # 304 sur une requête d'agrégat, avant la fiche elle-même
+            validators, not_modified = conditional_get(
+                facade.get_place_version(place_id, include or ()))
+            if not_modified:
+                return not_modified
+            if include is not None:
+                # Fiche et relations demandées en une seule réponse
+                limit, cursor = get_pagination_args()
+                place, reviews, next_cursor = \
+                    facade.get_place_with_includes(place_id, include,
+                                                   limit, cursor)
+                if not place:
+                    return {'error': 'Place not found'}, 404
+                return place_compound(place, include, reviews), 200, \
+                    dict(pagination_headers(next_cursor), **validators)
+
+            place = facade.get_place(place_id, profile='detail')
             if not place:
                 return {'error': 'Place not found'}, 404
 
-            # Préparation des informations du propriétaire
-            owner_details = {
-                "id": place.owner.id,
-                "first_name": place.owner.first_name,
-                "last_name": place.owner.last_name,
-                "email": place.owner.email
-            }
-
-            # Préparation de la réponse avec ou sans aménités
-            if place.amenities:
-                amenities_list = [{"id": amenity.id, "name": amenity.name}
-                                  for amenity in place.amenities]
-                return {"id": place.id, "title": place.title,
-                        "description": place.description, "price": place.price,
-                        "latitude": place.latitude, "longitude": place.longitude,
-                        "owner": owner_details, "amenities": amenities_list, "images": place.images}, 200
-
-            return {"id": place.id, "title": place.title,
-                    "description": place.description, "price": place.price,
-                    "latitude": place.latitude, "longitude": place.longitude,
-                    "owner": owner_details, "images": place.images}, 200
+            return place_details(place), 200, validators
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             print(f"Error retrieving place: {str(e)}")
             return {'error': 'An unexpected error occurred'}, 500
@@ -198,7 +526,7 @@ class PlaceResource(Resource):
             is_admin = current_user.get('is_admin', False)
             user_id = current_user.get('id')
             
-            if not is_admin and place.owner.id != user_id:
+            if not is_admin and place.owner_id != user_id:
                 return {'error': 'Unauthorized action'}, 403
 
             place_data = api.payload
@@ -232,7 +560,7 @@ class PlaceResource(Resource):
                 "price": updated_place.price,
                 "latitude": updated_place.latitude,
                 "longitude": updated_place.longitude,
-                "owner_id": updated_place.owner.id,
+                "owner_id": updated_place.owner_id,
                 "images": place.images
             }
 
@@ -5,9 +5,22 @@ Ce module fournit les endpoints REST pour la création, la consultation,
 la mise à jour et la suppression des avis dans l'application HBnB.
 Il permet également de récupérer les avis associés à un hébergement spécifique.
 """
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from app.services import facade
+from app.api.v1.pagination import (get_pagination_args, pagination_headers,
+                                   pagination_params)
+from app.api.v1.batch import get_batch_items, run_batch
+from app.api.v1.fieldsets import fields_params, get_fields_arg, sparse
+from app.api.conditional import conditional_get
+from app.api.response_cache import cached_response
+from app.api.v1.lookup import (get_lookup_body_ids, get_lookup_ids,
+                               lookup_params, lookup_response)
+from app.api.v1.export import (export_params, export_response,
+                               get_export_format)
+from app.models.review import Review
+from app.serializers import serializer
 
 # Création du namespace pour regrouper les routes liées aux reviews
 api = Namespace('reviews', description='Review operations')
@@ -19,6 +32,60 @@ review_model = api.model('Review', {
     'place_id': fields.String(required=True, description='ID of the place')  # <-- toujours demandé
 })
 
+batch_result_model = api.model('ReviewBatchResult', {
+    'created': fields.Integer(description='Number of reviews created'),
+    'failed': fields.Integer(description='Number of items rejected'),
+    'results': fields.List(fields.Raw, description='Per-item result (index, id or error)')
+})
+
+lookup_model = api.model('ReviewLookup', {
+    'ids': fields.List(fields.String, required=True,
+                       description='IDs of the reviews to fetch')
+})
+
+
+def validate_review_data(review_data):
+    """Valide les champs d'un nouvel avis (texte, note, hébergement).
+
+    Args:
+        review_data (dict): Données envoyées par le client.
+
+    Returns:
+        str: Message d'erreur, ou None si les données sont valides.
+    """
+    if not review_data.get('text'):
+        return 'Review text is required'
+    if not review_data.get('rating'):
+        return 'Rating is required'
+    if not review_data.get('place_id'):
+        return 'Place ID is required'
+    try:
+        rating = int(review_data['rating'])
+    except (ValueError, TypeError):
+        return 'Rating must be a number between 1 and 5'
+    if rating < 1 or rating > 5:
+        return 'Rating must be between 1 and 5'
+    return None
+
+
+# Champs d'un avis dans la liste, pour ?fields=
+REVIEW_FIELDS = {
+    'id': lambda review: review.id,
+    'text': lambda review: review.text,
+    'rating': lambda review: review.rating,
+    'user_id': lambda review: review.user_id,
+    'place_id': lambda review: review.place_id,
+    # Dates encodées en ISO 8601 par l'encodeur JSON (app.api.encoders)
+    'created_at': lambda review: review.created_at,
+    'updated_at': lambda review: review.updated_at,
+    'first_name': lambda review: review.user.first_name,  # <-- ajout Part4
+    'last_name': lambda review: review.user.last_name,    # <-- ajout Part4
+}
+
+
+# Représentation d'un avis avec le nom de son auteur (fonction précompilée)
+review_details = serializer(Review, 'detail')
+
 
 @api.route('/')
 class ReviewList(Resource):
@@ -38,25 +105,15 @@ class ReviewList(Resource):
             # Forcer l'utilisateur connecté comme auteur de la review
             reviews_data['user_id'] = current_user['id']
 
-            # Validation des champs obligatoires
-            if not reviews_data.get('text'):
-                return {'error': 'Review text is required'}, 400
-            if not reviews_data.get('rating'):
-                return {'error': 'Rating is required'}, 400
-            if not reviews_data.get('place_id'):
-                return {'error': 'Place ID is required'}, 400
-
-            # Validation du format et de la plage de la note
-            try:
-                rating = int(reviews_data['rating'])
-                if rating < 1 or rating > 5:
-                    return {'error': 'Rating must be between 1 and 5'}, 400
-            except (ValueError, TypeError):
-                return {'error': 'Rating must be a number between 1 and 5'}, 400
+            # Validation des champs obligatoires et de la note
+            error = validate_review_data(reviews_data)
+            if error:
+                return {'error': error}, 400
+            rating = int(reviews_data['rating'])
 
             # Récupération des entités associées (utilisateur et lieu)
             user = facade.get_user(reviews_data['user_id'])
-            place = facade.get_place(reviews_data['place_id'])
+            place = facade.get_place(reviews_data['place_id'], profile='minimal')
 
             # Vérification de l'existence des entités associées
             if not user:
@@ -65,14 +122,13 @@ class ReviewList(Resource):
                 return {'error': f'Place with ID {reviews_data["place_id"]} not found'}, 404
 
             # VALIDATION: Empêcher l'auto-review
-            if place.owner.id == current_user['id']:
+            if place.owner_id == current_user['id']:
                 return {'error': 'You cannot review your own place'}, 400
 
             # VALIDATION: Empêcher les reviews dupliquées
-            existing_reviews = facade.get_reviews_by_place(reviews_data['place_id'])
-            for review in existing_reviews:
-                if review.user.id == current_user['id']:
-                    return {'error': 'You have already reviewed this place'}, 400
+            if facade.has_reviewed_place(current_user['id'],
+                                         reviews_data['place_id']):
+                return {'error': 'You have already reviewed this place'}, 400
 
             # Création de l'avis une fois toutes les validations passées
             review = facade.create_review({
@@ -89,45 +145,125 @@ class ReviewList(Resource):
                 'rating': review.rating,
                 'user_id': user.id,
                 'place_id': reviews_data['place_id'],
-                'created_at': review.created_at.isoformat()
+                'created_at': review.created_at
             }, 201
 
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             print(f"Error creating review: {str(e)}")
             return {'error': 'An unexpected error occurred'}, 500
 
+    @api.doc(params=dict(pagination_params, **fields_params,
+                         **lookup_params))
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters, fields or ids')
     @api.response(500, 'Server error')
     def get(self):
-        """Get all reviews (PUBLIC)"""
+        """Get a page of reviews, or the reviews with the given ids (PUBLIC)"""
         try:
-            reviews = facade.get_all_reviews()
+            # 304 sur une requête d'agrégat, avant la page elle-même
+            validators, not_modified = conditional_get(
+                facade.get_reviews_version(), weak=True)
+            if not_modified:
+                return not_modified
+            ids = get_lookup_ids()
+            if ids is not None:
+                return lookup_response(ids, facade.get_reviews_by_ids,
+                                       review_details) + (validators,)
+            limit, cursor = get_pagination_args()
+            fields = get_fields_arg()
+            reviews, next_cursor = facade.get_reviews_page(limit, cursor,
+                                                           fields=fields)
 
             if not reviews:
-                return [], 200
-
-            result = []
-            for review in reviews:
-                review_data = {
-                    'id': review.id,
-                    'text': review.text,
-                    'rating': review.rating,
-                    'user_id': review.user.id,
-                    'place_id': review.place.id,
-                    'created_at': review.created_at.isoformat(),
-                    'updated_at': review.updated_at.isoformat(),
-                    'first_name': review.user.first_name,  # <-- ajout Part4
-                    'last_name': review.user.last_name     # <-- ajout Part4
-                }
-                result.append(review_data)
-
-            return result, 200
+                return [], 200, validators
+
+            if fields is None:
+                result = [review_details(review) for review in reviews]
+            else:
+                result = [sparse(review, REVIEW_FIELDS, fields)
+                          for review in reviews]
 
+            return result, 200, dict(pagination_headers(next_cursor),
+                                     **validators)
+
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             print(f"Error retrieving reviews: {str(e)}")
             return {'error': 'Failed to retrieve reviews'}, 500
 
 
+@api.route('/batch')
+class ReviewBatch(Resource):
+    @api.expect([review_model])
+    @api.response(201, 'All reviews successfully created', batch_result_model)
+    @api.response(207, 'Some reviews could not be created', batch_result_model)
+    @api.response(400, 'Invalid batch payload')
+    @api.response(401, 'Authentication required')
+    @api.response(500, 'Server error')
+    @jwt_required()
+    def post(self):
+        """Create many reviews at once (Authenticated users only)"""
+        try:
+            current_user = get_jwt_identity()
+            items = get_batch_items()
+
+            def create(valid, chunk_size):
+                # La note est convertie comme pour la création unitaire
+                reviews_data = [{'text': item['text'],
+                                 'rating': int(item['rating']),
+                                 'place_id': item['place_id']} for item in valid]
+                return facade.create_reviews_batch(
+                    reviews_data, current_user['id'], chunk_size)
+
+            return run_batch(items, validate_review_data, create)
+
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            print(f"Error creating reviews batch: {str(e)}")
+            return {'error': 'An unexpected error occurred'}, 500
+
+
+@api.route('/lookup')
+class ReviewLookup(Resource):
+    @api.expect(lookup_model)
+    @api.response(200, 'Reviews retrieved by ID')
+    @api.response(400, 'Invalid list of ids')
+    @api.response(500, 'Internal server error')
+    def post(self):
+        """Get the reviews with the given ids, for long lists (PUBLIC)"""
+        try:
+            return lookup_response(get_lookup_body_ids(),
+                                   facade.get_reviews_by_ids, review_details)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            print(f"Error looking up reviews: {str(e)}")
+            return {'error': 'An unexpected error occurred'}, 500
+
+
+@api.route('/export')
+class ReviewExport(Resource):
+    @api.doc(params=export_params)
+    @api.response(200, 'All reviews, streamed')
+    @api.response(400, 'Invalid export format')
+    @api.response(401, 'Authentication required')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """Export all reviews as a streamed JSON array or NDJSON (ADMIN ONLY)"""
+        current_user = get_jwt_identity()
+        if not current_user.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+        try:
+            return export_response(facade.iter_reviews, review_details, get_export_format())
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+
 @api.route('/<review_id>')
 class ReviewResource(Resource):
     @api.response(200, 'Review details retrieved successfully')
@@ -136,23 +272,16 @@ class ReviewResource(Resource):
     def get(self, review_id):
         """Get review details by ID (PUBLIC)"""
         try:
-            review = facade.get_review(review_id)
+            validators, not_modified = conditional_get(
+                facade.get_review_version(review_id))
+            if not_modified:
+                return not_modified
+            review = facade.get_review(review_id, profile='detail')
 
             if not review:
                 return {'error': f'Review with ID {review_id} not found'}, 404
 
-            review_data = {
-                'id': review.id,
-                'text': review.text,
-                'rating': review.rating,
-                'user_id': review.user.id,
-                'place_id': review.place.id,
-                'created_at': review.created_at.isoformat(),
-                'updated_at': review.updated_at.isoformat(),
-                'first_name': review.user.first_name,  # <-- ajout Part4
-                'last_name': review.user.last_name     # <-- ajout Part4
-            }
-            return review_data, 200
+            return review_details(review), 200, validators
 
         except Exception as e:
             print(f"Error retrieving review: {str(e)}")
@@ -180,11 +309,11 @@ class ReviewResource(Resource):
             is_admin = current_user.get('is_admin', False)
             user_id = current_user.get('id')
 
-            if not is_admin and existing_review.user.id != user_id:
+            if not is_admin and existing_review.user_id != user_id:
                 return {'error': 'Unauthorized action'}, 403
 
             # Vérifier que le place_id fourni correspond à la review (sécurité)
-            if 'place_id' in review_data and review_data['place_id'] != existing_review.place.id:
+            if 'place_id' in review_data and review_data['place_id'] != existing_review.place_id:
                 return {'error': 'Cannot change place_id of a review'}, 400
 
             # Traiter les champs modifiables
@@ -207,10 +336,10 @@ class ReviewResource(Resource):
                 'id': updated_review.id,
                 'text': updated_review.text,
                 'rating': updated_review.rating,
-                'user_id': updated_review.user.id,
-                'place_id': updated_review.place.id,
-                'created_at': updated_review.created_at.isoformat(),
-                'updated_at': updated_review.updated_at.isoformat(),
+                'user_id': updated_review.user_id,
+                'place_id': updated_review.place_id,
+                'created_at': updated_review.created_at,
+                'updated_at': updated_review.updated_at,
                 'first_name': updated_review.user.first_name,  # <-- ajout Part4
                 'last_name': updated_review.user.last_name     # <-- ajout Part4
             }, 200
@@ -239,7 +368,7 @@ class ReviewResource(Resource):
             is_admin = current_user.get('is_admin', False)
             user_id = current_user.get('id')
             
-            if not is_admin and existing_review.user.id != user_id:
+            if not is_admin and existing_review.user_id != user_id:
                 return {'error': 'Unauthorized action'}, 403
 
             # Suppression de l'avis via la façade
@@ -257,40 +386,45 @@ class ReviewResource(Resource):
 
 @api.route('/places/<place_id>/reviews')
 class PlaceReviewList(Resource):
+    @api.doc(params=dict(pagination_params, **{
+        'sort': "Sort key: 'created_at' (default) or 'rating'",
+        'order': "Sort order: 'asc' (default) or 'desc'"
+    }))
     @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(400, 'Invalid pagination or sort parameters')
     @api.response(404, 'Place not found')
     @api.response(500, 'Server error')
+    @cached_response(lambda place_id: (f'place-reviews:{place_id}', 'users'))
     def get(self, place_id):
-        """Get all reviews for a specific place (PUBLIC)"""
+        """Get a page of reviews for a specific place (PUBLIC)"""
         try:
+            limit, cursor = get_pagination_args()
+            sort = request.args.get('sort', 'created_at')
+            order = request.args.get('order', 'asc')
+
             # Vérification que l'hébergement existe
-            place = facade.get_place(place_id)
-            if not place:
+            # Version des seuls avis : None si l'hébergement n'existe pas
+            version = facade.get_place_reviews_version(place_id)
+            if version is None:
                 return {'error': f'Place with ID {place_id} not found'}, 404
+            # 304 sur une requête d'agrégat, avant la page elle-même
+            validators, not_modified = conditional_get(version, weak=True)
+            if not_modified:
+                return not_modified
 
-            # Récupération des avis pour cet hébergement
-            reviews = facade.get_reviews_by_place(place_id)
+            # Récupération d'une page des avis pour cet hébergement
+            reviews, next_cursor = facade.get_reviews_by_place_page(
+                place_id, limit, cursor, sort, order)
 
             if not reviews:
-                return [], 200
-
-            result = []
-            for review in reviews:
-                review_data = {
-                    'id': review.id,
-                    'text': review.text,
-                    'rating': review.rating,
-                    'user_id': review.user.id,
-                    'place_id': review.place.id,
-                    'created_at': review.created_at.isoformat(),
-                    'updated_at': review.updated_at.isoformat(),
-                    'first_name': review.user.first_name,  # <-- ajout Part4
-                    'last_name': review.user.last_name     # <-- ajout Part4
-                }
-                result.append(review_data)
-
-            return result, 200
+                return [], 200, validators
+
+            result = [review_details(review) for review in reviews]
+            return result, 200, dict(validators,
+                                     **pagination_headers(next_cursor))
 
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             print(f"Error retrieving reviews for place: {str(e)}")
             return {'error': 'Failed to retrieve reviews for place'}, 500
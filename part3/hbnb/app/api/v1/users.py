@@ -1,6 +1,14 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from app.services import facade
+from app.api.v1.pagination import (get_pagination_args, pagination_headers,
+                                   pagination_params)
+from app.api.v1.fieldsets import fields_params, get_fields_arg, sparse
+from app.api.conditional import conditional_get
+from app.api.v1.lookup import (get_lookup_body_ids, get_lookup_ids,
+                               lookup_params, lookup_response)
+from app.models.user import User
+from app.serializers import serializer
 import re
 
 # Création du namespace pour regrouper les routes liées aux utilisateurs
@@ -20,17 +28,56 @@ user_input_model = api.model('UserInput', {
     'last_name': fields.String(required=False, description='Last name of the user')
 })
 
+lookup_model = api.model('UserLookup', {
+    'ids': fields.List(fields.String, required=True,
+                       description='IDs of the users to fetch')
+})
+
+
+# Champs d'un utilisateur dans la liste, pour ?fields=
+USER_FIELDS = {
+    'id': lambda user: user.id,
+    'first_name': lambda user: user.first_name,
+    'last_name': lambda user: user.last_name,
+    'email': lambda user: user.email,
+}
+
+
+# Représentation publique d'un utilisateur, sans mot de passe (fonction
+# précompilée)
+user_details = serializer(User, 'detail')
+
 
 @api.route('/')
 class UserList(Resource):
+    @api.doc(params=dict(pagination_params, **fields_params,
+                         **lookup_params))
     @api.response(200, 'Users retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters, fields or ids')
     @api.response(500, 'Internal server error')
     def get(self):
-        """Get all users"""
+        """Get a page of users, or the users with the given ids"""
         try:
-            users = facade.get_all_users()
-            return [{'id': user.id, 'first_name': user.first_name,
-                     'last_name': user.last_name, 'email': user.email} for user in users], 200
+            # 304 sur une requête d'agrégat, avant la page elle-même
+            validators, not_modified = conditional_get(
+                facade.get_users_version(), weak=True)
+            if not_modified:
+                return not_modified
+            ids = get_lookup_ids()
+            if ids is not None:
+                return lookup_response(ids, facade.get_users_by_ids,
+                                       user_details) + (validators,)
+            limit, cursor = get_pagination_args()
+            fields = get_fields_arg()
+            users, next_cursor = facade.get_users_page(limit, cursor, fields)
+            if fields is None:
+                result = [user_details(user) for user in users]
+            else:
+                result = [sparse(user, USER_FIELDS, fields) for user in users]
+            return result, 200, dict(pagination_headers(next_cursor),
+                                     **validators)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
             print(f"Error retrieving users: {str(e)}")
             return {'error': 'An unexpected error occurred'}, 500
@@ -90,6 +137,24 @@ class UserList(Resource):
             return {'error': 'An unexpected error occurred'}, 500
 
 
+@api.route('/lookup')
+class UserLookup(Resource):
+    @api.expect(lookup_model)
+    @api.response(200, 'Users retrieved by ID')
+    @api.response(400, 'Invalid list of ids')
+    @api.response(500, 'Internal server error')
+    def post(self):
+        """Get the users with the given ids, for long lists"""
+        try:
+            return lookup_response(get_lookup_body_ids(),
+                                   facade.get_users_by_ids, user_details)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            print(f"Error looking up users: {str(e)}")
+            return {'error': 'An unexpected error occurred'}, 500
+
+
 @api.route('/<user_id>')
 class UserResource(Resource):
     @api.response(200, 'User details retrieved successfully')
@@ -97,11 +162,14 @@ class UserResource(Resource):
     def get(self, user_id):
         """Get user details by ID"""
         try:
+            validators, not_modified = conditional_get(
+                facade.get_user_version(user_id))
+            if not_modified:
+                return not_modified
             user = facade.get_user(user_id)
             if not user:
                 return {'error': 'User not found'}, 404
-            return {'id': user.id, 'first_name': user.first_name,
-                    'last_name': user.last_name, 'email': user.email}, 200
+            return user_details(user), 200, validators
         except Exception as e:
             print(f"Error retrieving user: {str(e)}")
             return {'error': 'An unexpected error occurred'}, 500
@@ -0,0 +1,331 @@
+#!/usr/bin/python3
+"""Application ASGI de HBnB.
+
+Les lectures publiques de l'API v1 (listes et détails des users, places,
+amenities et reviews) sont servies nativement en asyncio par la façade
+asynchrone : une requête qui attend la base ou un client lent n'occupe
+aucun thread. Toutes les autres routes (écritures authentifiées, auth,
+Swagger), ainsi que les lectures avec ?fields=, ?include= ou ?ids=, sont
+déléguées à l'application Flask existante via WsgiToAsgi, si bien que
+l'API exposée est strictement la même qu'avec run.py.
+
+Les routes natives envoient les mêmes validateurs (ETag, Last-Modified)
+que Flask et répondent 304 avant toute lecture complète. Celles que Flask
+met en cache (voir app.api.response_cache) partagent le même cache de
+réponses et les mêmes invalidations, sous des clés distinctes.
+"""
+import asyncio
+import re
+from urllib.parse import parse_qs
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy.ext.asyncio import create_async_engine
+from app import create_app
+from app.api.conditional import (is_not_modified, representation_key,
+                                 validator_headers, validators)
+from app.models import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.async_repository import create_async_session
+from app.persistence.sqlite import configure_sqlite_pragmas
+from app.serializers import serializer
+from app.services.async_facade import AsyncHBnBFacade
+
+# Paramètres que seules les routes Flask savent traiter (?fields=,
+# ?include=, ?ids=)
+_FLASK_ONLY_PARAMS = re.compile(r'(?:^|&)(?:fields|include|ids)=')
+
+
+def _request_headers(scope):
+    """En-têtes de la requête ASGI, noms en minuscules."""
+    return {name.decode('latin-1').lower(): value.decode('latin-1')
+            for name, value in scope.get('headers', [])}
+
+
+def _async_database_url(flask_app):
+    """Déduit l'URL async de la base de l'application Flask.
+
+    ASYNC_SQLALCHEMY_DATABASE_URI est prioritaire ; sinon l'URL SQLite
+    résolue par Flask-SQLAlchemy est reprise avec le driver aiosqlite.
+    """
+    url = flask_app.config.get('ASYNC_SQLALCHEMY_DATABASE_URI')
+    if url:
+        return url
+    with flask_app.app_context():
+        engine_url = db.engine.url
+    if engine_url.drivername != 'sqlite':
+        raise ValueError(
+            "Set ASYNC_SQLALCHEMY_DATABASE_URI for non-SQLite databases")
+    return engine_url.set(drivername='sqlite+aiosqlite')
+
+
+# Mêmes sérialiseurs précompilés que les routes Flask
+_place_to_dict = serializer(Place, 'card')
+_place_details_to_dict = serializer(Place, 'detail')
+_user_to_dict = serializer(User, 'detail')
+_amenity_to_dict = serializer(Amenity, 'detail')
+_review_to_dict = serializer(Review, 'detail')
+
+
+class HBnBAsgiApp:
+    """Application ASGI : routes de lecture asynchrones + repli Flask.
+
+    Args:
+        flask_app (Flask): Application Flask servant les autres routes.
+        facade (AsyncHBnBFacade): Façade asynchrone pour les lectures.
+        engine (AsyncEngine): Moteur async, fermé à l'arrêt du serveur.
+    """
+
+    def __init__(self, flask_app, facade, engine):
+        self.flask_app = flask_app
+        self.facade = facade
+        self.engine = engine
+        self.wsgi = WsgiToAsgi(flask_app)
+        # Même encodeur JSON et même cache de réponses que les routes Flask
+        self.encoder = flask_app.extensions['json_encoder']
+        self.cache = flask_app.extensions.get('response_cache')
+        facade = self.facade
+        # (motif, handler, (version de la ressource, ETag faible) ou None,
+        #  étiquettes du cache de réponses ou None)
+        self.routes = [
+            (re.compile(r'/api/v1/places/?'), self.list_places,
+             (facade.get_places_version, True),
+             lambda: ('places', 'amenities', 'users')),
+            # /places/search, /nearby et /export sont servis par Flask
+            (re.compile(r'/api/v1/places/(?!(?:search|nearby|export)$)'
+                        r'(?P<place_id>[^/]+)'),
+             self.get_place, (facade.get_place_version, False),
+             lambda place_id: (f'place:{place_id}', 'amenities', 'users')),
+            (re.compile(r'/api/v1/users/?'), self.list_users,
+             (facade.get_users_version, True), None),
+            (re.compile(r'/api/v1/users/(?P<user_id>[^/]+)'), self.get_user,
+             (facade.get_user_version, False), None),
+            (re.compile(r'/api/v1/amenities/?'), self.list_amenities,
+             (facade.get_amenities_version, True),
+             lambda: ('amenities',)),
+            (re.compile(r'/api/v1/amenities/(?P<amenity_id>[^/]+)'),
+             self.get_amenity, (facade.get_amenity_version, False), None),
+            (re.compile(r'/api/v1/reviews/?'), self.list_reviews,
+             (facade.get_reviews_version, True), None),
+            (re.compile(r'/api/v1/reviews/places/(?P<place_id>[^/]+)/reviews'),
+             self.list_place_reviews,
+             (facade.get_place_reviews_version, True),
+             lambda place_id: (f'place-reviews:{place_id}', 'users')),
+            (re.compile(r'/api/v1/reviews/(?!export$)(?P<review_id>[^/]+)'),
+             self.get_review, (facade.get_review_version, False), None),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET' \
+                and not _FLASK_ONLY_PARAMS.search(
+                    scope.get('query_string', b'').decode('latin-1')):
+            for pattern, handler, version, tags in self.routes:
+                match = pattern.fullmatch(scope['path'])
+                if match:
+                    return await self._dispatch(
+                        handler, match.groupdict(), scope, send, version,
+                        tags)
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _validators(self, version, params, scope):
+        """Validateurs de la requête et indicateur 304, comme conditional_get.
+
+        Returns:
+            tuple: (en-têtes des validateurs, True si non modifiée)
+        """
+        get_version, weak = version
+        current = await get_version(*params.values())
+        if current is None:
+            return {}, False
+        query_string = scope.get('query_string', b'').decode('latin-1')
+        etag, last_modified = validators(
+            current, representation_key(scope['path'], query_string,
+                                        self.encoder), weak)
+        request_headers = _request_headers(scope)
+        return validator_headers(etag, last_modified), is_not_modified(
+            etag, last_modified, request_headers.get('if-none-match'),
+            request_headers.get('if-modified-since'))
+
+    async def _cache_call(self, function, *args):
+        """Appelle le cache hors de la boucle si son backend fait des E/S."""
+        if self.cache.backend.blocking:
+            return await asyncio.to_thread(function, *args)
+        return function(*args)
+
+    async def _cached(self, tags, params, scope, send):
+        """Sert la réponse gardée s'il y en a une.
+
+        Returns:
+            tuple: (clé du cache pour ranger la réponse, True si servie)
+        """
+        query_string = scope.get('query_string', b'').decode('latin-1')
+        # Octets et en-têtes différents de Flask : clés séparées
+        representation = 'asgi:' + representation_key(
+            scope['path'], query_string, self.encoder)
+        key = await self._cache_call(self.cache.key, representation,
+                                     'public', tags(**params))
+        entry = await self._cache_call(self.cache.get, key)
+        if entry is None:
+            return key, False
+        request_headers = _request_headers(scope)
+        headers = self.cache.not_modified(
+            entry, request_headers.get('if-none-match'),
+            request_headers.get('if-modified-since'))
+        if headers is not None:
+            await self._send(send, 304, dict(headers, **{'X-Cache': 'HIT'}))
+        else:
+            status, cached_headers, payload = entry
+            await self._send(send, status, dict(
+                cached_headers, **{'X-Cache': 'HIT'}), payload=payload)
+        return key, True
+
+    async def _dispatch(self, handler, params, scope, send, version=None,
+                        tags=None):
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        headers = {}
+        key = None
+        try:
+            if self.cache is not None and tags is not None:
+                key, served = await self._cached(tags, params, scope, send)
+                if served:
+                    return
+                headers['X-Cache'] = 'MISS'
+            if version is not None:
+                conditional, not_modified = await self._validators(
+                    version, params, scope)
+                headers.update(conditional)
+                if not_modified:
+                    return await self._send(send, 304, headers)
+            body, status = await handler(query, headers, **params)
+        except ValueError as e:
+            body, status = {'error': str(e)}, 400
+        except Exception as e:
+            print(f"Error serving {scope['path']}: {str(e)}")
+            body, status = {'error': 'An unexpected error occurred'}, 500
+        finally:
+            await self.facade.close()
+        # Validateurs et curseur : réponses 200 seulement
+        headers = headers if status == 200 else {}
+        payload = self.encoder.dumps(body) + b'\n'
+        if key is not None and status == 200:
+            await self._cache_call(self.cache.set, key, status,
+                                   list(headers.items()), payload)
+        await self._send(send, status, headers, payload=payload)
+
+    async def _send(self, send, status, headers, payload=None):
+        """Envoie la réponse (sans corps pour une 304)."""
+        # ASGI : noms d'en-têtes en minuscules
+        raw_headers = [(name.lower().encode('latin-1'),
+                        value.encode('latin-1'))
+                       for name, value in headers.items()]
+        if payload is not None:
+            raw_headers += [(b'content-type', b'application/json'),
+                            (b'content-length', str(len(payload)).encode())]
+        else:
+            payload = b''
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': raw_headers})
+        await send({'type': 'http.response.body', 'body': payload})
+
+    def _pagination_args(self, query):
+        """Équivalent de get_pagination_args pour une requête ASGI."""
+        config = self.flask_app.config
+        limit = query.get('limit', [config.get('PAGINATION_DEFAULT_LIMIT', 50)])[0]
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValueError("limit must be a positive integer")
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+        cursor = query.get('cursor', [None])[0] or None
+        return min(limit, config.get('PAGINATION_MAX_LIMIT', 500)), cursor
+
+    async def _page(self, query, headers, get_page, to_dict):
+        limit, cursor = self._pagination_args(query)
+        objs, next_cursor = await get_page(limit, cursor)
+        if next_cursor:
+            headers['X-Next-Cursor'] = next_cursor
+        return [to_dict(obj) for obj in objs], 200
+
+    async def list_places(self, query, headers):
+        return await self._page(query, headers, self.facade.get_places_page,
+                                _place_to_dict)
+
+    async def get_place(self, query, headers, place_id):
+        place = await self.facade.get_place(place_id)
+        if not place:
+            return {'error': 'Place not found'}, 404
+        return _place_details_to_dict(place), 200
+
+    async def list_users(self, query, headers):
+        return await self._page(query, headers, self.facade.get_users_page,
+                                _user_to_dict)
+
+    async def get_user(self, query, headers, user_id):
+        user = await self.facade.get_user(user_id)
+        if not user:
+            return {'error': 'User not found'}, 404
+        return _user_to_dict(user), 200
+
+    async def list_amenities(self, query, headers):
+        return await self._page(query, headers,
+                                self.facade.get_amenities_page,
+                                _amenity_to_dict)
+
+    async def get_amenity(self, query, headers, amenity_id):
+        amenity = await self.facade.get_amenity_by_id(amenity_id)
+        if not amenity:
+            return {"error": f"Amenity with ID {amenity_id} not found"}, 404
+        return _amenity_to_dict(amenity), 200
+
+    async def list_reviews(self, query, headers):
+        return await self._page(query, headers, self.facade.get_reviews_page,
+                                _review_to_dict)
+
+    async def get_review(self, query, headers, review_id):
+        review = await self.facade.get_review(review_id)
+        if not review:
+            return {'error': f'Review with ID {review_id} not found'}, 404
+        return _review_to_dict(review), 200
+
+    async def list_place_reviews(self, query, headers, place_id):
+        limit, cursor = self._pagination_args(query)
+        sort = query.get('sort', ['created_at'])[0]
+        order = query.get('order', ['asc'])[0]
+        if not await self.facade.get_place(place_id):
+            return {'error': f'Place with ID {place_id} not found'}, 404
+        reviews, next_cursor = await self.facade.get_reviews_by_place_page(
+            place_id, limit, cursor, sort, order)
+        if next_cursor:
+            headers['X-Next-Cursor'] = next_cursor
+        return [_review_to_dict(review) for review in reviews], 200
+
+
+def create_asgi_app(config_class="config.DevelopmentConfig"):
+    """Crée l'application ASGI (à servir par uvicorn, hypercorn...).
+
+    Args:
+        config_class: Configuration passée à create_app.
+
+    Returns:
+        HBnBAsgiApp: L'application ASGI.
+    """
+    flask_app = create_app(config_class)
+    engine = create_async_engine(_async_database_url(flask_app))
+    configure_sqlite_pragmas(engine.sync_engine,
+                             flask_app.config.get('SQLITE_PRAGMAS'))
+    facade = AsyncHBnBFacade(create_async_session(engine))
+    return HBnBAsgiApp(flask_app, facade, engine)
@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+"""Commandes de maintenance (flask <commande>).
+
+Exemples :
+    flask --app run repair-rating-stats
+    flask --app run index-place-locations
+
+Les colonnes manquantes sont ajoutées au démarrage (app.persistence.schema) ;
+ces commandes recalculent leurs valeurs après un import SQL direct.
+"""
+import click
+from flask.cli import with_appcontext
+from app.services import facade
+
+
+@click.command('repair-rating-stats')
+@with_appcontext
+def repair_rating_stats_command():
+    """Recalcule les agrégats d'avis (nombre, somme, histogramme) des places."""
+    count = facade.repair_rating_stats()
+    click.echo(f"Rating stats recomputed ({count} places with reviews)")
+
+
+@click.command('index-place-locations')
+@with_appcontext
+def index_place_locations_command():
+    """Calcule le geohash (index de proximité) des places qui n'en ont pas."""
+    count = facade.index_place_locations()
+    click.echo(f"Geohash computed for {count} places")
+
+
+def register_commands(app):
+    """Enregistre les commandes de maintenance sur l'application."""
+    app.cli.add_command(repair_rating_stats_command)
+    app.cli.add_command(index_place_locations_command)
@@ -8,9 +8,11 @@ unifiée pour accéder aux classes de modèles dans l'application HBnB.
 # Import des extensions Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
+from app.persistence.replicas import RoutingSession
 
 # Instances partagées des extensions
-db = SQLAlchemy()
+# RoutingSession : lectures des repositories routables vers des réplicas
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 bcrypt = Bcrypt()
 
 # Import des modèles après la définition de db
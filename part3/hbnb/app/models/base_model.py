@@ -13,7 +13,9 @@ class BaseModel(db.Model):
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Indexée : max(updated_at) des validateurs HTTP (app.persistence.versions)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow,
+                           index=True)
 
     def save(self):
         """Update the updated_at timestamp whenever the object is modified"""
@@ -27,11 +29,7 @@ class BaseModel(db.Model):
         self.save()  # Update the updated_at timestamp
 
     def to_dict(self):
-        result = {}
-        for key, value in self.__dict__.items():
-            if isinstance(value, datetime):
-                result[key] = value.isoformat()
-            else:
-                result[key] = value
-        result['__class__'] = self.__class__.__name__
-        return result
+        """Serialize the mapped columns (datetimes as ISO strings)"""
+        # Sérialiseur compilé par modèle (vue 'columns' de app.serializers)
+        from app.serializers import serializer
+        return serializer(type(self), 'columns')(self)
@@ -1,28 +1,59 @@
 #!/usr/bin/python3
 from app.models.base_model import BaseModel
 from app.models import db, bcrypt
-from sqlalchemy import Column, Integer, String, ForeignKey
+from app.persistence.geo import encode_geohash
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, event
 from sqlalchemy.types import CHAR
 from sqlalchemy.orm import relationship
 
 place_amenity = db.Table('place_amenity',
     Column('place_id', CHAR(36), ForeignKey('places.id'), primary_key=True),
-    Column('amenity_id', CHAR(36), ForeignKey('amenities.id'), primary_key=True)
+    Column('amenity_id', CHAR(36), ForeignKey('amenities.id'), primary_key=True),
+    # Recherche des hébergements proposant une amenity donnée
+    Index('ix_place_amenity_amenity_id_place_id', 'amenity_id', 'place_id')
 )
 
 class Place(BaseModel):
     __tablename__ = 'places'
+    # Index composites de la recherche (filtre + tri paginé par clé)
+    __table_args__ = (
+        Index('ix_places_price_id', 'price', 'id'),
+        Index('ix_places_latitude_longitude', 'latitude', 'longitude'),
+        Index('ix_places_created_at_id', 'created_at', 'id'),
+        Index('ix_places_review_count_id', 'review_count', 'id'),
+        # Index spatial : recherche de proximité par préfixe de geohash
+        Index('ix_places_geohash', 'geohash'),
+    )
 
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(500), nullable=True)
     price = db.Column(db.Float(), nullable=False)
     latitude = db.Column(db.Float(), nullable=False)
-    longitude = db.Column(db.Float(), nullable=False)
-    amenities = relationship('Amenity', secondary=place_amenity, lazy='subquery',
+    longitude = db.Column(db.Float(), nullable=False, index=True)
+    # Geohash de (latitude, longitude), recalculé à chaque écriture
+    geohash = db.Column(db.String(12), nullable=True)
+    # Chargement paresseux : la façade choisit un profil (app.services.loaders)
+    amenities = relationship('Amenity', secondary=place_amenity, lazy=True,
                            backref=db.backref('places', lazy=True))
     owner_id = db.Column(db.String(36), ForeignKey('users.id'), nullable=False)
     reviews = relationship('Review', backref='place', lazy=True)
     images = Column(String(), nullable=True)
+    # Agrégats des avis, tenus à jour par la façade à chaque écriture d'avis
+    # (et recalculables par `flask repair-rating-stats`)
+    review_count = db.Column(db.Integer(), nullable=False, default=0,
+                             server_default='0')
+    rating_sum = db.Column(db.Integer(), nullable=False, default=0,
+                           server_default='0')
+    rating_1 = db.Column(db.Integer(), nullable=False, default=0,
+                         server_default='0')
+    rating_2 = db.Column(db.Integer(), nullable=False, default=0,
+                         server_default='0')
+    rating_3 = db.Column(db.Integer(), nullable=False, default=0,
+                         server_default='0')
+    rating_4 = db.Column(db.Integer(), nullable=False, default=0,
+                         server_default='0')
+    rating_5 = db.Column(db.Integer(), nullable=False, default=0,
+                         server_default='0')
     
     def __init__(self, title, description, price, latitude, longitude):
         super().__init__()
@@ -46,8 +77,32 @@ class Place(BaseModel):
         self.price = price
         self.latitude = latitude
         self.longitude = longitude
+        self.review_count = 0
+        self.rating_sum = 0
+        for star in range(1, 6):
+            setattr(self, f'rating_{star}', 0)
+
+    @property
+    def average_rating(self):
+        """Note moyenne arrondie au centième, None sans avis."""
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @property
+    def rating_histogram(self):
+        """Nombre d'avis par note, ex: {'1': 0, ..., '5': 12}."""
+        return {str(star): getattr(self, f'rating_{star}')
+                for star in range(1, 6)}
 
     def add_amenity(self, amenity):
         """Ajoute une amenité à cette place."""
         if amenity not in self.amenities:
             self.amenities.append(amenity)
+
+
+@event.listens_for(Place, 'before_insert')
+@event.listens_for(Place, 'before_update')
+def _update_geohash(mapper, connection, target):
+    """Tient le geohash à jour quand la position change."""
+    target.geohash = encode_geohash(target.latitude, target.longitude)
@@ -3,11 +3,18 @@
 
 from app.models.base_model import BaseModel
 from app.models import db, bcrypt
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 
 
 class Review(BaseModel):
     __tablename__ = 'reviews'
+    # Avis d'un hébergement, triés par date ou par note : servis par index
+    __table_args__ = (
+        Index('ix_reviews_place_id_created_at', 'place_id', 'created_at', 'id'),
+        Index('ix_reviews_place_id_rating', 'place_id', 'rating', 'id'),
+        # Un seul avis par utilisateur et par hébergement, garanti par la base
+        Index('uq_reviews_user_id_place_id', 'user_id', 'place_id', unique=True),
+    )
 
 
     text = db.Column(db.String(), nullable=False)
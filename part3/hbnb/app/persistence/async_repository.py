@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+"""Repository asynchrone (SQLAlchemy asyncio) pour le déploiement ASGI.
+
+Surface de lecture de SQLAlchemyRepository, mais chaque méthode est une
+coroutine : une requête en attente de la base ne bloque plus de thread.
+Aucune écriture : l'application ASGI les délègue à Flask, dont les
+repositories synchrones tiennent à jour agrégats et caches.
+Les sessions sont portées par une async_scoped_session, une par tâche
+asyncio (donc par requête HTTP), à libérer avec ``await session.remove()``.
+"""
+from asyncio import current_task
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_scoped_session, async_sessionmaker
+from app.models.review import Review
+from app.persistence.repository import keyset_page, split_page
+from app.persistence.versions import (collection_version_statement,
+                                      object_version_statement,
+                                      place_reviews_version_statement)
+
+
+def create_async_session(engine):
+    """Crée une session asynchrone à portée de tâche sur un moteur async.
+
+    Args:
+        engine (AsyncEngine): Moteur créé avec create_async_engine, avec un
+                              driver async (ex: sqlite+aiosqlite:///x.db).
+
+    Returns:
+        async_scoped_session: Fabrique de sessions, une par tâche asyncio.
+    """
+    # Pas d'expiration au commit : un accès d'attribut ne doit jamais
+    # déclencher d'E/S implicite en asyncio
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    return async_scoped_session(factory, scopefunc=current_task)
+
+
+class AsyncSQLAlchemyRepository:
+    """Repository asynchrone en lecture seule pour un modèle SQLAlchemy.
+
+    Les relations ne pouvant pas être chargées paresseusement en asyncio,
+    les méthodes de lecture acceptent des options de chargement
+    (selectinload, joinedload...) via le paramètre options.
+    """
+
+    def __init__(self, model, session):
+        self.model = model
+        self.session = session
+
+    async def get(self, obj_id, options=()):
+        if obj_id is None:
+            return None
+        return await self.session.get(self.model, obj_id, options=options)
+
+    async def get_many(self, obj_ids, options=()):
+        obj_ids = list(dict.fromkeys(obj_ids))
+        if not obj_ids:
+            return [], []
+        result = await self.session.scalars(
+            select(self.model).where(self.model.id.in_(obj_ids))
+            .options(*options))
+        by_id = {obj.id: obj for obj in result}
+        found = [by_id[obj_id] for obj_id in obj_ids if obj_id in by_id]
+        missing = [obj_id for obj_id in obj_ids if obj_id not in by_id]
+        return found, missing
+
+    async def get_all(self, options=(), criteria=()):
+        result = await self.session.scalars(
+            select(self.model).where(*criteria).options(*options))
+        return list(result)
+
+    async def get_page(self, limit, cursor=None, options=(), criteria=(),
+                       order_by='created_at', descending=False):
+        """Pagination par clé (order_by, id), comme la version synchrone.
+
+        Returns:
+            tuple: (liste des objets, curseur de la page suivante ou None)
+        """
+        statement = keyset_page(
+            select(self.model).where(*criteria).options(*options),
+            self.model, limit, cursor, order_by, descending)
+        objs = list(await self.session.scalars(statement))
+        return split_page(objs, limit, order_by)
+
+    async def get_version(self, obj_id=None, include=()):
+        """Version d'un objet ou de la table, comme la version synchrone."""
+        if obj_id is None:
+            statement = collection_version_statement(self.model)
+        else:
+            statement = object_version_statement(self.model, obj_id, include)
+        row = (await self.session.execute(statement)).first()
+        return None if row is None else tuple(row)
+
+    async def get_by_attribute(self, attr_name, attr_value, options=()):
+        result = await self.session.scalars(
+            select(self.model)
+            .where(getattr(self.model, attr_name) == attr_value)
+            .options(*options).limit(1))
+        return result.first()
+
+    async def find_range(self, attr_name, low=None, high=None, options=()):
+        column = getattr(self.model, attr_name)
+        statement = select(self.model).options(*options)
+        if low is not None:
+            statement = statement.where(column >= low)
+        if high is not None:
+            statement = statement.where(column <= high)
+        result = await self.session.scalars(
+            statement.order_by(column, self.model.id))
+        return list(result)
+
+
+class AsyncReviewRepository(AsyncSQLAlchemyRepository):
+    """Repository asynchrone des avis."""
+
+    def __init__(self, session):
+        super().__init__(Review, session)
+
+    async def get_place_version(self, place_id):
+        """Version des avis d'un hébergement, None s'il n'existe pas."""
+        row = (await self.session.execute(
+            place_reviews_version_statement(place_id))).first()
+        return None if row is None else tuple(row)
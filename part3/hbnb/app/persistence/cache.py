@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""Cache LRU avec expiration (TTL) utilisé par les repositories.
+
+Le cache ne conserve jamais d'objets ORM : les repositories y stockent des
+instantanés (dict des colonnes) détachés de toute session, qu'ils
+rattachent à la session courante lors d'un hit.
+"""
+from collections import OrderedDict
+from threading import Lock
+import time
+
+
+class LRUCache:
+    """Cache clé/valeur borné en taille, avec durée de vie des entrées.
+
+    Args:
+        maxsize (int): Nombre maximum d'entrées ; la moins récemment
+                       utilisée est évincée au-delà.
+        ttl (float): Durée de vie d'une entrée en secondes (None = infinie).
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Retourne la valeur associée à key, ou None (compté comme miss)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """Ajoute ou remplace une entrée, en évinçant la plus ancienne."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """Invalide une entrée (sans effet si elle est absente)."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Retourne les compteurs utiles au réglage de maxsize et ttl."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
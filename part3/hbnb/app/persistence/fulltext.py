@@ -0,0 +1,231 @@
+#!/usr/bin/python3
+"""Recherche plein texte SQLite (FTS5) sur les hébergements et les avis.
+
+Deux tables FTS5 à contenu externe indexent places (title, description) et
+reviews (text) sans dupliquer le texte : elles ne stockent que l'index
+inversé et relisent le texte dans la table d'origine pour les extraits.
+Des triggers les tiennent à jour à chaque INSERT, DELETE et UPDATE des
+colonnes indexées, y compris pour les écritures SQL directes.
+
+Les clés de places et reviews sont des UUID : leur rowid implicite peut
+être renuméroté par VACUUM, et l'index désignerait alors d'autres lignes.
+Chaque table indexée a donc une table <table>_fts_docs qui attribue à
+chaque ID un docid INTEGER PRIMARY KEY (stable), et l'index lit son
+contenu via la vue <table>_fts_content (docid, colonnes indexées).
+
+db.create_all() ne sait pas créer de table virtuelle : ensure_fulltext_index
+les crée (et remplit l'index d'une base existante) au démarrage.
+"""
+import re
+from html import escape
+from sqlalchemy import Float, String, bindparam, event, text
+from app.models.place import Place
+from app.models.review import Review
+
+# Poids de bm25() par colonne : un mot du titre compte plus que la description
+PLACE_WEIGHTS = (10.0, 1.0)
+
+_TOKEN = re.compile(r'\w+')
+
+# Délimiteurs passés à snippet() (caractères à usage privé), remplacés par
+# les balises une fois le texte échappé
+_OPEN, _CLOSE = '\ue000', '\ue001'
+
+# Table indexée -> colonnes indexées
+_INDEXED = {
+    'places': ('title', 'description'),
+    'reviews': ('text',),
+}
+
+
+def _index_ddl(table, columns):
+    """DDL de l'index d'une table : IDs, vue de contenu, FTS5, triggers."""
+    docs, content, fts = f'{table}_fts_docs', f'{table}_fts_content', \
+        f'{table}_fts'
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    docid = f'(SELECT docid FROM {docs} WHERE id = new.id)'
+    delete = (f"INSERT INTO {fts}({fts}, rowid, {names}) "
+              f"SELECT 'delete', docid, {old} FROM {docs} "
+              f"WHERE id = old.id;")
+    return [
+        f"""CREATE TABLE IF NOT EXISTS {docs} (
+            docid INTEGER PRIMARY KEY, id VARCHAR(36) NOT NULL UNIQUE)""",
+        f"""CREATE VIEW IF NOT EXISTS {content} AS
+            SELECT {docs}.docid, """
+        + ', '.join(f'{table}.{column}' for column in columns)
+        + f""" FROM {docs} JOIN {table} ON {table}.id = {docs}.id""",
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {names}, content='{content}', content_rowid='docid',
+            tokenize='unicode61 remove_diacritics 2')""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {docs}(id) VALUES (new.id);
+            INSERT INTO {fts}(rowid, {names}) VALUES ({docid}, {new});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table}
+        BEGIN
+            {delete}
+            DELETE FROM {docs} WHERE id = old.id;
+        END""",
+        # Seules les colonnes indexées : les agrégats d'avis changent souvent
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au
+        AFTER UPDATE OF {names} ON {table} BEGIN
+            {delete}
+            INSERT INTO {fts}(rowid, {names}) VALUES ({docid}, {new});
+        END""",
+    ]
+
+
+def _drop_index(connection, table):
+    """Supprime l'index d'une table (FTS5, vue, IDs et triggers)."""
+    for trigger in ('ai', 'ad', 'au'):
+        connection.exec_driver_sql(
+            f"DROP TRIGGER IF EXISTS {table}_fts_{trigger}")
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {table}_fts")
+    connection.exec_driver_sql(f"DROP VIEW IF EXISTS {table}_fts_content")
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {table}_fts_docs")
+
+
+def fulltext_supported(connection):
+    """Indique si la base est SQLite avec le module FTS5."""
+    if connection.dialect.name != 'sqlite':
+        return False
+    return bool(connection.exec_driver_sql(
+        "SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar())
+
+
+def ensure_fulltext_index(engine):
+    """Crée les tables FTS5 et leurs triggers s'ils n'existent pas.
+
+    Sur une base qui contenait déjà des hébergements ou des avis, l'index
+    est reconstruit depuis les tables d'origine à sa création ; un index
+    d'une version antérieure (indexé par rowid) est remplacé.
+
+    Returns:
+        bool: True si la recherche plein texte est disponible.
+    """
+    with engine.begin() as connection:
+        if not fulltext_supported(connection):
+            return False
+        existing = {name for name, in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for table, columns in _INDEXED.items():
+            fts, docs = f'{table}_fts', f'{table}_fts_docs'
+            if fts in existing and docs in existing:
+                continue
+            _drop_index(connection, table)
+            for ddl in _index_ddl(table, columns):
+                connection.exec_driver_sql(ddl)
+            connection.exec_driver_sql(
+                f"INSERT INTO {docs}(id) SELECT id FROM {table}")
+            connection.exec_driver_sql(
+                f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+    return True
+
+
+@event.listens_for(Place.__table__, 'before_drop')
+@event.listens_for(Review.__table__, 'before_drop')
+def _drop_fulltext_index(table, connection, **kwargs):
+    # Les triggers disparaissent avec leur table, pas l'index ni sa vue
+    if connection.dialect.name == 'sqlite':
+        _drop_index(connection, table.name)
+
+
+def match_expression(query):
+    """Traduit une saisie libre en expression MATCH FTS5.
+
+    Chaque mot devient une chaîne entre guillemets (aucune syntaxe FTS5
+    ne passe : AND, NEAR, *, colonnes...) ; tous les mots sont requis et
+    le dernier est un préfixe, pour la saisie en cours.
+
+    Raises:
+        ValueError: Si la requête ne contient aucun mot.
+    """
+    words = _TOKEN.findall(query or '')
+    if not words:
+        raise ValueError("Search query must contain at least one word")
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
+
+def ranked_places(match):
+    """Sous-requête (place_id, score) des hébergements trouvés.
+
+    Le score additionne le bm25() de l'hébergement et celui de ses avis ;
+    plus il est bas, plus le résultat est pertinent.
+    """
+    return text(f"""
+        SELECT place_id, sum(score) AS score FROM (
+            SELECT places.id AS place_id,
+                   bm25(places_fts, {PLACE_WEIGHTS[0]}, {PLACE_WEIGHTS[1]})
+                       AS score
+            FROM places_fts
+            JOIN places_fts_docs ON places_fts_docs.docid = places_fts.rowid
+            JOIN places ON places.id = places_fts_docs.id
+            WHERE places_fts MATCH :match
+            UNION ALL
+            SELECT reviews.place_id, bm25(reviews_fts)
+            FROM reviews_fts
+            JOIN reviews_fts_docs
+                ON reviews_fts_docs.docid = reviews_fts.rowid
+            JOIN reviews ON reviews.id = reviews_fts_docs.id
+            WHERE reviews_fts MATCH :match
+        ) GROUP BY place_id""").bindparams(match=match) \
+        .columns(place_id=String, score=Float).subquery('ranked')
+
+
+def snippets(session, match, place_ids, before='<mark>', after='</mark>',
+             ellipsis='…', tokens=12):
+    """Extraits surlignés pour une page d'hébergements trouvés.
+
+    L'extrait vient du titre ou de la description quand ils correspondent,
+    sinon de l'avis le plus pertinent de l'hébergement. Le texte saisi par
+    les utilisateurs est échappé (HTML) : seuls before et after sont du
+    balisage.
+
+    Args:
+        session (Session): Session (ou connexion) exécutant les requêtes.
+        match (str): Expression produite par match_expression.
+        place_ids (list): IDs des hébergements de la page.
+
+    Returns:
+        dict: place_id -> extrait.
+    """
+    if not place_ids:
+        return {}
+    params = {'match': match, 'before': _OPEN, 'after': _CLOSE,
+              'ellipsis': ellipsis, 'tokens': tokens,
+              'ids': list(place_ids)}
+    ids = bindparam('ids', expanding=True)
+    result = {}
+    # snippet(-1) choisit la colonne la plus pertinente
+    for place_id, excerpt in session.execute(text("""
+            SELECT places_fts_docs.id,
+                   snippet(places_fts, -1, :before, :after, :ellipsis,
+                           :tokens)
+            FROM places_fts
+            JOIN places_fts_docs ON places_fts_docs.docid = places_fts.rowid
+            WHERE places_fts MATCH :match AND places_fts_docs.id IN :ids
+            """).bindparams(ids), params):
+        result[place_id] = _highlight(excerpt, before, after)
+    missing = [place_id for place_id in place_ids if place_id not in result]
+    if missing:
+        params['ids'] = missing
+        for place_id, excerpt in session.execute(text("""
+                SELECT reviews.place_id,
+                       snippet(reviews_fts, 0, :before, :after, :ellipsis,
+                               :tokens)
+                FROM reviews_fts
+                JOIN reviews_fts_docs
+                    ON reviews_fts_docs.docid = reviews_fts.rowid
+                JOIN reviews ON reviews.id = reviews_fts_docs.id
+                WHERE reviews_fts MATCH :match AND reviews.place_id IN :ids
+                ORDER BY bm25(reviews_fts)""").bindparams(ids), params):
+            result.setdefault(place_id, _highlight(excerpt, before, after))
+    return result
+
+
+def _highlight(excerpt, before, after):
+    """Échappe un extrait de snippet() puis pose les balises de surlignage."""
+    return escape(excerpt).replace(_OPEN, before).replace(_CLOSE, after)
@@ -0,0 +1,164 @@
+#!/usr/bin/python3
+"""Index spatial par geohash et calculs de distance.
+
+Chaque hébergement stocke le geohash de sa position (colonne indexée) :
+deux points proches partagent en général un préfixe, si bien qu'une
+recherche « autour de moi » se ramène à quelques plages de l'index
+(geohash >= préfixe AND geohash < préfixe + '{'). Ce tri grossier laisse
+passer des points hors du cercle ; la distance exacte (haversine) est
+ensuite calculée par lots sur les seuls candidats, vectorisée avec numpy
+quand il est installé (dépendance optionnelle).
+"""
+from math import asin, cos, degrees, floor, radians, sin, sqrt
+
+try:
+    import numpy
+except ImportError:  # dépendance optionnelle
+    numpy = None
+
+EARTH_RADIUS_KM = 6371.0088
+# 9 caractères : cellules d'environ 5 m x 5 m
+GEOHASH_PRECISION = 9
+# Nombre maximum de plages d'index par zone de recherche
+MAX_CELLS = 16
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Caractère suivant 'z' : borne haute exclusive d'une plage de préfixe
+PREFIX_END = '{'
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Calcule le geohash d'une position.
+
+    Args:
+        latitude (float): Latitude entre -90 et 90.
+        longitude (float): Longitude entre -180 et 180.
+        precision (int): Nombre de caractères du geohash.
+
+    Returns:
+        str: Le geohash, ex: encode_geohash(48.8584, 2.2945) == 'u09tunquc'.
+    """
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        # Les bits alternent longitude / latitude, en commençant par la
+        # longitude
+        interval, coordinate = (lng_range, longitude) if even \
+            else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits, value = 0, 0
+    return ''.join(chars)
+
+
+def _cell_size(precision):
+    """Hauteur et largeur (en degrés) d'une cellule de geohash."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def _cell_index(value, origin, size, count):
+    return min(int(floor((value - origin) / size)), count - 1)
+
+
+def geohash_cells(min_lat, min_lng, max_lat, max_lng, max_cells=MAX_CELLS):
+    """Préfixes de geohash couvrant une zone (sans traversée d'antiméridien).
+
+    La précision retenue est la plus fine pour laquelle la zone tient dans
+    max_cells cellules (à la précision 1, toutes les cellules touchées).
+
+    Returns:
+        set: Préfixes dont l'union contient toute la zone.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size(precision)
+        rows, cols = round(180.0 / height), round(360.0 / width)
+        row_range = range(_cell_index(min_lat, -90.0, height, rows),
+                          _cell_index(max_lat, -90.0, height, rows) + 1)
+        col_range = range(_cell_index(min_lng, -180.0, width, cols),
+                          _cell_index(max_lng, -180.0, width, cols) + 1)
+        if len(row_range) * len(col_range) <= max_cells or precision == 1:
+            # Le geohash du centre de chaque cellule est son préfixe
+            return {encode_geohash(-90.0 + (row + 0.5) * height,
+                                   -180.0 + (col + 0.5) * width, precision)
+                    for row in row_range for col in col_range}
+
+
+def bounding_boxes(latitude, longitude, radius_km):
+    """Rectangles (min_lat, min_lng, max_lat, max_lng) contenant un cercle.
+
+    Un cercle qui traverse l'antiméridien est couvert par deux rectangles ;
+    un cercle qui contient un pôle, par une bande de toutes les longitudes.
+
+    Returns:
+        list: Un ou deux rectangles.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat = latitude - degrees(angle)
+    max_lat = latitude + degrees(angle)
+    if min_lat <= -90.0 or max_lat >= 90.0 \
+            or sin(angle) >= cos(radians(latitude)):
+        return [(max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0)]
+
+    delta_lng = degrees(asin(sin(angle) / cos(radians(latitude))))
+    min_lng, max_lng = longitude - delta_lng, longitude + delta_lng
+    if min_lng < -180.0:
+        return [(min_lat, min_lng + 360.0, max_lat, 180.0),
+                (min_lat, -180.0, max_lat, max_lng)]
+    if max_lng > 180.0:
+        return [(min_lat, min_lng, max_lat, 180.0),
+                (min_lat, -180.0, max_lat, max_lng - 360.0)]
+    return [(min_lat, min_lng, max_lat, max_lng)]
+
+
+def distances_km(latitude, longitude, points):
+    """Distances exactes (haversine) d'un point à une liste de points.
+
+    Avec numpy, le calcul porte sur tout le lot de candidats à la fois
+    (opérations sur tableaux) ; sinon, les termes propres à l'origine sont
+    calculés une seule fois et chaque point en une passe Python.
+
+    Args:
+        latitude (float): Latitude de l'origine.
+        longitude (float): Longitude de l'origine.
+        points (iterable): Couples (latitude, longitude).
+
+    Returns:
+        list: Distance en kilomètres de chaque point, dans l'ordre.
+    """
+    if numpy is not None:
+        return _distances_array(latitude, longitude, points)
+    lat0, lng0 = radians(latitude), radians(longitude)
+    cos_lat0 = cos(lat0)
+    diameter = 2 * EARTH_RADIUS_KM
+    result = []
+    for lat, lng in points:
+        lat, lng = radians(lat), radians(lng)
+        h = sin((lat - lat0) / 2) ** 2 \
+            + cos_lat0 * cos(lat) * sin((lng - lng0) / 2) ** 2
+        result.append(diameter * asin(min(1.0, sqrt(h))))
+    return result
+
+
+def _distances_array(latitude, longitude, points):
+    """distances_km vectorisée avec numpy."""
+    coordinates = numpy.radians(
+        numpy.asarray(points, dtype=float).reshape(-1, 2))
+    lat0, lng0 = radians(latitude), radians(longitude)
+    lat, lng = coordinates[:, 0], coordinates[:, 1]
+    h = numpy.sin((lat - lat0) / 2) ** 2 \
+        + cos(lat0) * numpy.cos(lat) * numpy.sin((lng - lng0) / 2) ** 2
+    distances = 2 * EARTH_RADIUS_KM * numpy.arcsin(
+        numpy.sqrt(numpy.minimum(h, 1.0)))
+    # Flottants Python : sérialisables par tous les encodeurs JSON
+    return distances.tolist()
@@ -0,0 +1,160 @@
+#!/usr/bin/python3
+"""Routage des lectures vers des réplicas en lecture seule.
+
+db.session reste l'unique session de l'application : RoutingSession choisit
+simplement le moteur de chaque requête SQL. Les lectures explicitement
+marquées (bloc ``read_from_replica()``, utilisé par les repositories) sont
+servies à tour de rôle par les moteurs réplicas ; tout le reste (flush,
+écritures, lectures non marquées, chargements paresseux) part sur le
+primaire. Les objets lus sur un réplica vivent dans la même identity map,
+leurs modifications sont donc bien écrites sur le primaire.
+
+Lecture de ses propres écritures : une session qui a écrit (flush non
+validé, unité de travail ouverte) lit sur le primaire ; après un commit,
+le client concerné continue à lire sur le primaire pendant
+REPLICA_READ_YOUR_WRITES_SECONDS, le temps que la réplication rattrape.
+"""
+from contextlib import contextmanager
+from itertools import cycle
+import os
+from threading import Lock
+from flask import current_app, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from app.persistence.cache import LRUCache
+from app.persistence.sqlite import configure_sqlite_pragmas
+
+
+def _consistency_key():
+    """Identifie le client dont on doit garantir la lecture des écritures.
+
+    En requête HTTP : le jeton d'authentification (à défaut l'adresse IP),
+    si bien qu'un client lit ses écritures sans pénaliser les autres. Hors
+    requête (scripts, tests) : une clé unique pour tout le processus.
+    """
+    if has_request_context():
+        return request.headers.get('Authorization') or request.remote_addr
+    return None
+
+
+class ReplicaRouter:
+    """Moteurs réplicas et fenêtre de lecture de ses propres écritures.
+
+    Args:
+        engines (list): Moteurs SQLAlchemy des réplicas.
+        read_your_writes_seconds (float): Durée pendant laquelle un client
+                                          qui vient d'écrire lit sur le
+                                          primaire.
+    """
+
+    def __init__(self, engines, read_your_writes_seconds=5.0):
+        self.engines = list(engines)
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._next_engine = cycle(self.engines)
+        self._lock = Lock()
+        self._recent_writes = LRUCache(maxsize=100000,
+                                       ttl=read_your_writes_seconds)
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    def next_engine(self):
+        """Retourne le réplica suivant (round-robin)."""
+        with self._lock:
+            return next(self._next_engine)
+
+    def record_write(self):
+        """Ouvre la fenêtre de lecture sur le primaire du client courant."""
+        if self.read_your_writes_seconds > 0:
+            self._recent_writes.set(_consistency_key(), True)
+
+    def recently_wrote(self):
+        return self._recent_writes.get(_consistency_key()) is not None
+
+    def dispose(self):
+        for engine in self.engines:
+            engine.dispose()
+
+
+class RoutingSession(Session):
+    """Session Flask-SQLAlchemy qui route les lectures marquées vers un réplica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('read_replica') \
+                and not self._flushing and has_app_context():
+            router = current_app.extensions.get('replica_router')
+            if router is not None:
+                if self._reads_own_writes(router):
+                    router.primary_reads += 1
+                else:
+                    router.replica_reads += 1
+                    return router.next_engine()
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_own_writes(self, router):
+        """Indique si la lecture doit voir des écritures pas encore répliquées."""
+        return bool(self.info.get('uow_depth') or self.info.get('has_writes')
+                    or self.new or self.dirty or self.deleted
+                    or router.recently_wrote())
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_session_writes(session, flush_context):
+    session.info['has_writes'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _record_committed_writes(session):
+    if session.info.pop('has_writes', False) and has_app_context():
+        router = current_app.extensions.get('replica_router')
+        if router is not None:
+            router.record_write()
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _forget_rolled_back_writes(session):
+    session.info.pop('has_writes', None)
+
+
+@contextmanager
+def read_from_replica(session):
+    """Autorise les requêtes du bloc à être servies par un réplica."""
+    previous = session.info.get('read_replica', False)
+    session.info['read_replica'] = True
+    try:
+        yield
+    finally:
+        session.info['read_replica'] = previous
+
+
+def init_replicas(app):
+    """Crée les moteurs réplicas déclarés dans SQLALCHEMY_REPLICA_URIS.
+
+    Les réplicas reprennent SQLALCHEMY_ENGINE_OPTIONS et SQLITE_PRAGMAS ;
+    comme pour le primaire, un chemin SQLite relatif est résolu dans le
+    dossier instance/. Sans réplica configuré, tout va au primaire.
+
+    Returns:
+        ReplicaRouter: Le routeur enregistré, ou None.
+    """
+    uris = app.config.get('SQLALCHEMY_REPLICA_URIS') or []
+    if not uris:
+        app.extensions.pop('replica_router', None)
+        return None
+
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    engines = []
+    for uri in uris:
+        url = make_url(uri)
+        if url.get_backend_name() == 'sqlite' and url.database \
+                and url.database != ':memory:' \
+                and not os.path.isabs(url.database):
+            url = url.set(database=os.path.join(app.instance_path,
+                                                url.database))
+        engine = create_engine(url, **options)
+        configure_sqlite_pragmas(engine, app.config.get('SQLITE_PRAGMAS'))
+        engines.append(engine)
+    router = ReplicaRouter(
+        engines, app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 5.0))
+    app.extensions['replica_router'] = router
+    return router
@@ -1,20 +1,230 @@
 from abc import ABC, abstractmethod
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import datetime
+from heapq import nsmallest
+from itertools import chain
+from sqlalchemy import and_, case, event, func, inspect, or_, select, update
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from app.models.user import User # Import your models
+from app.models.review import Review
+from app.models.place import Place, place_amenity
 from app.models import db
+from flask import current_app
+from app.persistence.cache import LRUCache
+from app.persistence.fulltext import match_expression, ranked_places, snippets
+from app.persistence.geo import (PREFIX_END, bounding_boxes, distances_km,
+                                 encode_geohash, geohash_cells)
+from app.persistence.replicas import read_from_replica
+from app.persistence.versions import (collection_version_statement,
+                                      object_version_statement,
+                                      place_reviews_version_statement)
+
+# Caches de lecture actifs, par modèle (voir SQLAlchemyRepository.enable_cache)
+_model_caches = {}
+
+
+def _evict(model, obj_ids=None):
+    """Retire des objets des caches de lecture du modèle (None = tous)."""
+    for cache in _model_caches.get(model, ()):
+        if obj_ids is None:
+            cache.clear()
+        else:
+            for obj_id in obj_ids:
+                cache.delete(obj_id)
+
+
+def forget_cached(session, model, obj_ids=None):
+    """Périme des objets du cache de lecture, maintenant et après le commit.
+
+    Entre le flush et le commit, une autre session lit encore l'ancienne
+    ligne validée et peut la remettre en cache : les IDs sont donc retenus
+    dans session.info et retirés de nouveau une fois la transaction
+    terminée.
+
+    Args:
+        session (Session): Session qui écrit.
+        model: Classe du modèle.
+        obj_ids (iterable): IDs modifiés (None = tout le cache du modèle).
+    """
+    pending = session.info.setdefault('cache_invalidations', {})
+    if obj_ids is None or pending.get(model, ()) is None:
+        pending[model] = None
+    else:
+        obj_ids = list(obj_ids)
+        pending.setdefault(model, set()).update(obj_ids)
+    _evict(model, obj_ids)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _invalidate_cached_objects(session, flush_context):
+    """Invalide le cache de tout objet modifié ou supprimé par un flush.
+
+    Couvre aussi les modifications faites hors du repository (ex: setattr
+    dans la façade), puisque toute écriture passe par un flush.
+    """
+    for obj in list(session.dirty) + list(session.deleted):
+        forget_cached(session, type(obj), [obj.id])
+
+
+@event.listens_for(db.session, 'after_commit')
+def _evict_committed_objects(session):
+    """Retire du cache les objets écrits, une fois les écritures visibles."""
+    for model, obj_ids in session.info.pop('cache_invalidations', {}).items():
+        _evict(model, obj_ids)
+
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def _evict_rolled_back_objects(session, previous_transaction):
+    """Par sécurité, retire aussi du cache les objets d'écritures annulées.
+
+    Un savepoint annulé laisse la transaction englobante ouverte : ses IDs
+    restent retenus pour le commit à venir.
+    """
+    pending = session.info.get('cache_invalidations', {})
+    if previous_transaction.parent is None:
+        session.info.pop('cache_invalidations', None)
+    for model, obj_ids in pending.items():
+        _evict(model, obj_ids)
+
+
+def encode_position(value, obj_id):
+    """Encode une position (valeur de tri, id) en curseur opaque."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, float):
+        # repr : relu à l'identique par float()
+        value = repr(value)
+    raw = f"{value}|{obj_id}"
+    return urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def encode_cursor(obj, attr='created_at'):
+    """Encode la position (valeur de tri, id) d'un objet en curseur opaque."""
+    value = getattr(obj, attr)
+    if value is None and attr == 'created_at':
+        value = datetime.min
+    return encode_position(value, obj.id)
+
+
+def decode_cursor(cursor, parse=datetime.fromisoformat):
+    """Décode un curseur en tuple (valeur de tri, id).
+
+    Args:
+        cursor (str): Curseur produit par encode_cursor.
+        parse (callable): Convertit la valeur de tri (created_at par défaut).
+
+    Raises:
+        ValueError: Si le curseur est mal formé.
+    """
+    try:
+        raw = urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        value, obj_id = raw.split('|', 1)
+        return parse(value), obj_id
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_page(statement, model, limit, cursor=None, order_by='created_at',
+                descending=False):
+    """Applique la pagination par clé (order_by, id) à une requête.
+
+    Fonctionne aussi bien sur un Query que sur un select() (repository
+    asynchrone) : seuls filter/where, order_by et limit sont utilisés.
+
+    Returns:
+        La requête filtrée après le curseur, triée, limitée à limit + 1
+        lignes (la ligne en trop indique qu'une page suivante existe).
+    """
+    column = getattr(model, order_by)
+    if cursor:
+        python_type = column.type.python_type
+        parse = datetime.fromisoformat if python_type is datetime \
+            else python_type
+        value, obj_id = decode_cursor(cursor, parse)
+        if descending:
+            after = or_(column < value, and_(column == value, model.id < obj_id))
+        else:
+            after = or_(column > value, and_(column == value, model.id > obj_id))
+        statement = statement.filter(after)
+    if descending:
+        statement = statement.order_by(column.desc(), model.id.desc())
+    else:
+        statement = statement.order_by(column, model.id)
+    return statement.limit(limit + 1)
+
+
+def split_page(objs, limit, order_by='created_at'):
+    """Sépare la page de la ligne en trop et calcule le curseur suivant.
+
+    Returns:
+        tuple: (liste des objets, curseur de la page suivante ou None)
+    """
+    page = objs[:limit]
+    next_cursor = encode_cursor(page[-1], order_by) \
+        if len(objs) > limit else None
+    return page, next_cursor
+
+def in_transaction():
+    """Indique si une unité de travail est ouverte sur la session courante."""
+    return db.session.info.get('uow_depth', 0) > 0
+
+
+@contextmanager
+def transaction():
+    """Unité de travail : un seul commit pour toutes les écritures du bloc.
+
+    Les repositories n'appellent plus commit() à l'intérieur du bloc ; tout
+    est validé en une transaction à la sortie, ou annulé si une exception
+    remonte. Les blocs imbriqués rejoignent la transaction englobante.
+    """
+    info = db.session.info
+    depth = info.get('uow_depth', 0)
+    info['uow_depth'] = depth + 1
+    try:
+        yield db.session
+        if depth == 0:
+            db.session.commit()
+    except Exception:
+        if depth == 0:
+            db.session.rollback()
+        raise
+    finally:
+        info['uow_depth'] = depth
+
 
 class Repository(ABC):
     @abstractmethod
     def add(self, obj):
         pass
 
+    @abstractmethod
+    def add_many(self, objs):
+        pass
+
     @abstractmethod
     def get(self, obj_id):
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        pass
+
+    def get_for_update(self, obj_id):
+        """Récupère un objet destiné à être modifié (donc à jour)."""
+        return self.get(obj_id)
+
     @abstractmethod
     def get_all(self):
         pass
 
+    def iter_all(self, batch_size=1000):
+        """Parcourt tous les objets (par lots quand le stockage le permet)."""
+        return iter(self.get_all())
+
     @abstractmethod
     def update(self, obj_id, data):
         pass
@@ -27,27 +237,108 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def get_page(self, limit, cursor=None):
+        pass
+
+    @abstractmethod
+    def find_range(self, attr_name, low=None, high=None):
+        pass
+
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    """Repository en mémoire, avec index ordonnés optionnels.
+
+    Args:
+        range_indexes (iterable): Attributs ordonnés (prix, coordonnées)
+                                  interrogeables par intervalle.
+
+    Les index sont tenus à jour par add, add_many, update et delete. Un
+    objet modifié directement (sans passer par update) doit être réindexé
+    avec reindex.
+    """
+
+    def __init__(self, range_indexes=()):
         self._storage = {}
+        # attribut -> (valeurs triées, ids aux mêmes positions)
+        self._range_indexes = {}
+        # id -> {attribut: valeur indexée}, pour désindexer même si l'objet
+        # a été modifié entre-temps
+        self._range_values = {}
+        for attr_name in range_indexes:
+            self.add_range_index(attr_name)
+
+    def add_range_index(self, attr_name):
+        """Déclare un index ordonné sur attr_name (recherche par intervalle)."""
+        self._range_indexes[attr_name] = ([], [])
+        for obj in self._storage.values():
+            self._range_index_attr(obj, attr_name)
+
+    def _range_index_attr(self, obj, attr_name):
+        value = getattr(obj, attr_name, None)
+        if value is None:
+            return
+        values, ids = self._range_indexes[attr_name]
+        position = bisect_right(values, value)
+        values.insert(position, value)
+        ids.insert(position, obj.id)
+        self._range_values.setdefault(obj.id, {})[attr_name] = value
+
+    def _index(self, obj):
+        for attr_name in self._range_indexes:
+            self._range_index_attr(obj, attr_name)
+
+    def _unindex(self, obj_id):
+        for attr_name, value in self._range_values.pop(obj_id, {}).items():
+            values, ids = self._range_indexes[attr_name]
+            # Parcourt uniquement les entrées de même valeur
+            for position in range(bisect_left(values, value),
+                                  bisect_right(values, value)):
+                if ids[position] == obj_id:
+                    del values[position]
+                    del ids[position]
+                    break
+
+    def reindex(self, obj):
+        """Met à jour les index d'un objet modifié hors de update."""
+        self._unindex(obj.id)
+        self._index(obj)
 
     def add(self, obj):
+        self._unindex(obj.id)
         self._storage[obj.id] = obj
+        self._index(obj)
+
+    def add_many(self, objs):
+        for obj in objs:
+            self.add(obj)
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
 
+    def get_many(self, obj_ids):
+        found, missing = [], []
+        for obj_id in dict.fromkeys(obj_ids):
+            obj = self._storage.get(obj_id)
+            if obj is None:
+                missing.append(obj_id)
+            else:
+                found.append(obj)
+        return found, missing
+
     def get_all(self):
         return list(self._storage.values())
 
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
+            self._unindex(obj_id)
             obj.update(data)
+            self._index(obj)
 
     def delete(self, obj_id):
         if obj_id in self._storage:
+            self._unindex(obj_id)
             del self._storage[obj_id]
 
     def get_by_attribute(self, attr_name, attr_value):
@@ -55,39 +346,591 @@ class InMemoryRepository(Repository):
             (obj for obj in self._storage.values() if getattr(
                 obj, attr_name) == attr_value), None)
 
+    def find_range(self, attr_name, low=None, high=None):
+        """Retourne les objets dont attr_name est dans [low, high].
+
+        Avec un index ordonné, coûte O(log n + k) ; sinon parcours complet.
+        Une borne à None laisse l'intervalle ouvert de ce côté. Les objets
+        sont renvoyés par valeur croissante de attr_name.
+        """
+        range_index = self._range_indexes.get(attr_name)
+        if range_index is not None:
+            values, ids = range_index
+            start = 0 if low is None else bisect_left(values, low)
+            end = len(values) if high is None else bisect_right(values, high)
+            return [self._storage[obj_id] for obj_id in ids[start:end]]
+        matches = [obj for obj in self._storage.values()
+                   if getattr(obj, attr_name, None) is not None
+                   and (low is None or getattr(obj, attr_name) >= low)
+                   and (high is None or getattr(obj, attr_name) <= high)]
+        return sorted(matches, key=lambda obj: getattr(obj, attr_name))
+
+    def get_page(self, limit, cursor=None):
+        def position(obj):
+            return (obj.created_at or datetime.min, obj.id)
+
+        objs = sorted(self._storage.values(), key=position)
+        if cursor:
+            after = decode_cursor(cursor)
+            objs = [obj for obj in objs if position(obj) > after]
+        page = objs[:limit]
+        next_cursor = encode_cursor(page[-1]) if len(objs) > limit else None
+        return page, next_cursor
+
 class SQLAlchemyRepository(Repository):
-    def __init__(self, model):
+    def __init__(self, model, autocommit=True):
         self.model = model
+        # Si False, add/update/delete se contentent de préparer les
+        # changements dans la session ; le commit revient à l'appelant.
+        self.autocommit = autocommit
+        self.cache = None
+
+    def enable_cache(self, maxsize=1024, ttl=None):
+        """Active un cache de lecture LRU/TTL devant get et get_many.
+
+        Le cache stocke des instantanés détachés (valeurs des colonnes) ;
+        un objet modifié ou supprimé par un flush en est retiré au flush
+        puis à la fin de la transaction (voir forget_cached).
+        """
+        self.disable_cache()
+        self.cache = LRUCache(maxsize, ttl)
+        _model_caches.setdefault(self.model, []).append(self.cache)
+        return self.cache
+
+    def disable_cache(self):
+        """Désactive le cache de lecture s'il était actif."""
+        if self.cache is not None:
+            _model_caches[self.model].remove(self.cache)
+            self.cache = None
+
+    def _snapshot(self, obj):
+        return {attr.key: getattr(obj, attr.key)
+                for attr in inspect(self.model).column_attrs}
+
+    def _from_snapshot(self, snapshot):
+        """Rattache un instantané à la session courante, sans requête SQL."""
+        obj = inspect(self.model).class_manager.new_instance()
+        for key, value in snapshot.items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        return db.session.merge(obj, load=False)
+
+    def _can_cache(self):
+        # Pas de mise en cache de données non encore validées
+        return not (in_transaction() or db.session.new
+                    or db.session.dirty or db.session.deleted)
+
+    def commit(self):
+        """Valide la session, sauf en mode staging ou dans une transaction."""
+        if self.autocommit and not in_transaction():
+            db.session.commit()
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        self.commit()
 
-    def get(self, obj_id):
-        return self.model.query.get(obj_id)
+    def add_many(self, objs):
+        """Insère une liste d'objets dans une seule transaction.
 
-    def get_all(self):
-        return self.model.query.all()
+        SQLAlchemy regroupe les INSERT d'un même flush en requêtes
+        multi-lignes, d'où un seul aller-retour et un seul commit par lot.
+        """
+        db.session.add_all(objs)
+        self.commit()
+
+    def _read(self):
+        """Bloc dont les requêtes peuvent être servies par un réplica."""
+        return read_from_replica(db.session)
+
+    def get(self, obj_id, options=()):
+        """Récupère un objet par son ID.
+
+        Args:
+            obj_id (str): ID de l'objet.
+            options (tuple): Options de chargement des relations (voir
+                             app.services.loaders), appliquées si l'objet
+                             est lu en base.
+        """
+        if obj_id is None:
+            return None
+        if self.cache is None:
+            with self._read():
+                return db.session.get(self.model, obj_id, options=options)
+
+        # Objet déjà chargé et à jour dans la session : rien à faire
+        obj = db.session.identity_map.get(identity_key(self.model, obj_id))
+        if obj is not None and not inspect(obj).expired_attributes:
+            return obj
+
+        snapshot = self.cache.get(obj_id)
+        if snapshot is not None:
+            return self._from_snapshot(snapshot)
+
+        with self._read():
+            obj = db.session.get(self.model, obj_id, options=options)
+        if obj is not None and self._can_cache():
+            self.cache.set(obj_id, self._snapshot(obj))
+        return obj
+
+    def get_many(self, obj_ids, options=()):
+        """Récupère plusieurs objets en une seule requête IN (...).
+
+        Avec le cache actif, seuls les IDs absents du cache sont demandés
+        à la base.
+
+        Args:
+            obj_ids (iterable): IDs recherchés.
+            options (tuple): Options de chargement des relations, appliquées
+                             aux objets lus en base.
+
+        Returns:
+            tuple: (objets trouvés dans l'ordre des IDs, IDs introuvables)
+        """
+        # Dédoublonne en conservant l'ordre demandé
+        obj_ids = list(dict.fromkeys(obj_ids))
+        if not obj_ids:
+            return [], []
+
+        by_id = {}
+        if self.cache is not None:
+            for obj_id in obj_ids:
+                snapshot = self.cache.get(obj_id)
+                if snapshot is not None:
+                    by_id[obj_id] = self._from_snapshot(snapshot)
+
+        to_load = [obj_id for obj_id in obj_ids if obj_id not in by_id]
+        if to_load:
+            with self._read():
+                loaded = self.model.query.options(*options).filter(
+                    self.model.id.in_(to_load)).all()
+            can_cache = self.cache is not None and self._can_cache()
+            for obj in loaded:
+                by_id[obj.id] = obj
+                if can_cache:
+                    self.cache.set(obj.id, self._snapshot(obj))
+
+        found = [by_id[obj_id] for obj_id in obj_ids if obj_id in by_id]
+        missing = [obj_id for obj_id in obj_ids if obj_id not in by_id]
+        return found, missing
+
+    def get_all(self, options=()):
+        with self._read():
+            return self.model.query.options(*options).all()
+
+    def get_version(self, obj_id=None, include=()):
+        """Version d'un objet, ou de toute la table sans obj_id.
+
+        Une seule requête d'agrégat, sans charger d'objet (voir
+        app.persistence.versions) ; sert aux validateurs HTTP.
+
+        Args:
+            obj_id (str): ID de l'objet (None : la collection).
+            include (iterable): Relations embarquées dans la réponse.
+
+        Returns:
+            tuple: Valeurs de la version, ou None si l'objet n'existe pas.
+        """
+        if obj_id is None:
+            statement = collection_version_statement(self.model)
+        else:
+            statement = object_version_statement(self.model, obj_id, include)
+        with self._read():
+            row = db.session.execute(statement).first()
+        return None if row is None else tuple(row)
+
+    def iter_all(self, batch_size=1000, options=()):
+        """Parcourt tous les objets par lots, triés par (created_at, id).
+
+        Les lignes sont lues batch_size par batch_size (yield_per, curseur
+        côté serveur quand le pilote le permet) et les relations chargées
+        lot par lot : la mémoire utilisée ne dépend pas de la taille de la
+        table, tant que l'appelant ne garde pas les objets.
+
+        Args:
+            batch_size (int): Nombre de lignes lues à la fois.
+            options (tuple): Options de chargement des relations.
+
+        Yields:
+            Les objets du modèle.
+        """
+        statement = select(self.model).options(*options).order_by(
+            self.model.created_at, self.model.id).execution_options(
+                yield_per=batch_size)
+        with self._read():
+            yield from db.session.scalars(statement)
+
+    def get_for_update(self, obj_id):
+        """Lit l'objet sur le primaire, sans cache ni réplica.
+
+        À utiliser avant une modification, pour ne jamais écrire à partir
+        d'une copie en retard.
+        """
+        if obj_id is None:
+            return None
+        return db.session.get(self.model, obj_id)
 
     def update(self, obj_id, data):
-        obj = self.get(obj_id)
+        obj = self.get_for_update(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            self.commit()
 
     def delete(self, obj_id):
-        obj = self.get(obj_id)
+        obj = self.get_for_update(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            self.commit()
 
     def get_by_attribute(self, attr_name, attr_value):
-        return self.model.query.filter(getattr(self.model, attr_name) == attr_value).first()
+        with self._read():
+            return self.model.query.filter(getattr(self.model, attr_name) == attr_value).first()
+
+    def find_range(self, attr_name, low=None, high=None):
+        """Retourne les objets dont attr_name est dans [low, high].
+
+        Traduit en WHERE ... BETWEEN (ou >= / <= si une borne vaut None),
+        servi par l'index de la colonne. Résultats triés par attr_name.
+        """
+        column = getattr(self.model, attr_name)
+        query = self.model.query
+        if low is not None and high is not None:
+            query = query.filter(column.between(low, high))
+        elif low is not None:
+            query = query.filter(column >= low)
+        elif high is not None:
+            query = query.filter(column <= high)
+        with self._read():
+            return query.order_by(column, self.model.id).all()
+
+    def get_page(self, limit, cursor=None, query=None, order_by='created_at',
+                 descending=False):
+        """Pagination par clé (keyset) sur (order_by, id).
+
+        Contrairement à un OFFSET, le coût d'une page ne dépend pas de sa
+        position dans la table : on reprend juste après le dernier élément vu.
+
+        Returns:
+            tuple: (liste des objets, curseur de la page suivante ou None)
+        """
+        if query is None:
+            query = self.model.query
+        # On demande un élément de plus pour savoir s'il existe une suite
+        query = keyset_page(query, self.model, limit, cursor, order_by,
+                            descending)
+        with self._read():
+            objs = query.all()
+        return split_page(objs, limit, order_by)
     
+# Colonnes d'agrégats des avis maintenues sur Place
+RATING_STATS_COLUMNS = ('review_count', 'rating_sum', 'rating_1', 'rating_2',
+                        'rating_3', 'rating_4', 'rating_5')
+
+# Candidats d'une recherche de proximité lus et filtrés par lots de cette taille
+NEARBY_CHUNK_SIZE = 5000
+
+
+def rating_stats_update(place_id, changes):
+    """Construit l'UPDATE atomique des agrégats d'avis d'un hébergement.
+
+    Les compteurs sont incrémentés côté base (col = col + delta) : deux
+    avis écrits en même temps ne peuvent pas s'écraser.
+
+    Args:
+        place_id (str): ID de l'hébergement.
+        changes (dict): Variation du nombre d'avis par note, ex: {4: 1}
+                        pour un avis ajouté, {2: -1, 5: 1} pour une note
+                        modifiée de 2 à 5.
+
+    Returns:
+        Update: Instruction à exécuter dans la transaction de l'écriture.
+    """
+    values = {
+        'review_count': Place.review_count + sum(changes.values()),
+        'rating_sum': Place.rating_sum + sum(
+            rating * delta for rating, delta in changes.items()),
+    }
+    for rating, delta in changes.items():
+        column = getattr(Place, f'rating_{rating}')
+        values[column.key] = column + delta
+    return update(Place).where(Place.id == place_id).values(**values) \
+        .execution_options(synchronize_session=False)
+
+
+class PlaceRepository(SQLAlchemyRepository):
+    def __init__(self, autocommit=True):
+        super().__init__(Place, autocommit)
+
+    def _forget_rating_stats(self, place_ids=None):
+        """Périme les agrégats en mémoire (session et cache de lecture)."""
+        for obj in list(db.session.identity_map.values()):
+            if isinstance(obj, Place) and \
+                    (place_ids is None or obj.id in place_ids):
+                db.session.expire(obj, RATING_STATS_COLUMNS)
+        forget_cached(db.session, Place, place_ids)
+
+    def adjust_rating_stats(self, place_id, changes):
+        """Applique une variation aux agrégats d'avis d'un hébergement.
+
+        Args:
+            place_id (str): ID de l'hébergement.
+            changes (dict): Variation du nombre d'avis par note.
+        """
+        changes = {rating: delta for rating, delta in changes.items()
+                   if delta}
+        if not changes:
+            return
+        db.session.execute(rating_stats_update(place_id, changes))
+        self._forget_rating_stats({place_id})
+        self.commit()
+
+    def search(self, limit, cursor=None, min_price=None, max_price=None,
+               amenity_ids=(), bbox=None, order_by='created_at',
+               descending=False, options=(), text_query=None):
+        """Recherche paginée d'hébergements, filtrée entièrement en SQL.
+
+        Args:
+            limit (int): Taille de la page.
+            cursor (str): Curseur de la page précédente.
+            min_price (float): Prix minimum inclus.
+            max_price (float): Prix maximum inclus.
+            amenity_ids (iterable): Amenities que l'hébergement doit toutes
+                                    proposer.
+            bbox (tuple): (min_lat, min_lng, max_lat, max_lng) ; si
+                          min_lng > max_lng, la zone traverse l'antiméridien.
+            order_by (str): Colonne de tri (avec id pour départager), ou
+                            'relevance' avec text_query (meilleurs
+                            résultats d'abord).
+            descending (bool): Tri décroissant.
+            options (tuple): Options de chargement des relations.
+            text_query (str): Mots recherchés dans le titre, la
+                              description ou les avis (index FTS5).
+
+        Returns:
+            tuple: (liste des objets Place, curseur suivant ou None)
+
+        Raises:
+            ValueError: Si la recherche plein texte est indisponible ou la
+                        requête vide.
+        """
+        query = self.model.query.options(*options)
+        ranked = None
+        if text_query is not None:
+            ranked = ranked_places(self._match(text_query))
+            query = query.join(ranked, ranked.c.place_id == Place.id)
+        if min_price is not None:
+            query = query.filter(Place.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Place.price <= max_price)
+        if bbox is not None:
+            min_lat, min_lng, max_lat, max_lng = bbox
+            query = query.filter(Place.latitude.between(min_lat, max_lat))
+            if min_lng <= max_lng:
+                query = query.filter(Place.longitude.between(min_lng, max_lng))
+            else:
+                query = query.filter(or_(Place.longitude >= min_lng,
+                                         Place.longitude <= max_lng))
+        amenity_ids = set(amenity_ids)
+        if amenity_ids:
+            # Hébergements ayant toutes les amenities demandées, via l'index
+            # (amenity_id, place_id) de la table d'association
+            matching = select(place_amenity.c.place_id) \
+                .where(place_amenity.c.amenity_id.in_(amenity_ids)) \
+                .group_by(place_amenity.c.place_id) \
+                .having(func.count() == len(amenity_ids))
+            query = query.filter(Place.id.in_(matching))
+        if order_by == 'relevance':
+            return self._relevance_page(query, ranked, limit, cursor)
+        return self.get_page(limit, cursor, query, order_by, descending)
+
+    def _match(self, text_query):
+        if not current_app.extensions.get('fulltext'):
+            raise ValueError("Full-text search is not available")
+        return match_expression(text_query)
+
+    def _relevance_page(self, query, ranked, limit, cursor):
+        """Pagination par clé (score, id) des résultats plein texte."""
+        if ranked is None:
+            raise ValueError("Sorting by relevance requires a text query")
+        if cursor:
+            score, obj_id = decode_cursor(cursor, float)
+            query = query.filter(or_(
+                ranked.c.score > score,
+                and_(ranked.c.score == score, Place.id > obj_id)))
+        query = query.add_columns(ranked.c.score) \
+            .order_by(ranked.c.score, Place.id).limit(limit + 1)
+        with self._read():
+            rows = query.all()
+        page = rows[:limit]
+        next_cursor = encode_position(page[-1].score, page[-1][0].id) \
+            if len(rows) > limit else None
+        return [place for place, _ in page], next_cursor
+
+    def search_snippets(self, text_query, place_ids):
+        """Extraits surlignés des hébergements trouvés par text_query.
+
+        Returns:
+            dict: place_id -> extrait ('<mark>' autour des mots trouvés).
+        """
+        match = self._match(text_query)
+        with self._read():
+            return snippets(db.session, match, place_ids)
+
+    def nearby(self, latitude, longitude, radius_km, limit, options=()):
+        """Hébergements les plus proches d'un point, dans un rayon donné.
+
+        Tri grossier par l'index geohash (quelques plages de préfixes
+        couvrant le rectangle englobant du cercle, restreintes à ce
+        rectangle), puis distance exacte calculée sur les candidats, lus
+        par lots : seuls les `limit` plus proches restent en mémoire.
+        Un hébergement sans geohash (import SQL direct non encore indexé)
+        est lu dans le rectangle, jamais ignoré.
+
+        Args:
+            latitude (float): Latitude du centre.
+            longitude (float): Longitude du centre.
+            radius_km (float): Rayon de recherche en kilomètres.
+            limit (int): Nombre maximum d'hébergements.
+            options (tuple): Options de chargement des relations.
+
+        Returns:
+            list: Tuples (Place, distance en km), du plus proche au plus
+                  lointain.
+        """
+        ranges = []
+        for box in bounding_boxes(latitude, longitude, radius_km):
+            min_lat, min_lng, max_lat, max_lng = box
+            # « + 0 » : filtre sur la ligne lue, sans que l'index
+            # (latitude, longitude) soit préféré aux plages de geohash
+            in_box = and_((Place.latitude + 0).between(min_lat, max_lat),
+                          (Place.longitude + 0).between(min_lng, max_lng))
+            # Chaque terme du OR est une plage de ix_places_geohash
+            ranges += [and_(Place.geohash >= cell,
+                            Place.geohash < cell + PREFIX_END, in_box)
+                       for cell in sorted(geohash_cells(*box))]
+            ranges.append(and_(Place.geohash.is_(None), in_box))
+
+        nearest = []
+        with self._read():
+            candidates = db.session.execute(
+                select(Place.id, Place.latitude, Place.longitude)
+                .where(or_(*ranges))
+                .execution_options(yield_per=NEARBY_CHUNK_SIZE))
+            for rows in candidates.partitions():
+                distances = distances_km(
+                    latitude, longitude,
+                    [(row.latitude, row.longitude) for row in rows])
+                nearest = nsmallest(limit, chain(nearest, (
+                    (distance, row.id)
+                    for row, distance in zip(rows, distances)
+                    if distance <= radius_km)))
+        if not nearest:
+            return []
+        with self._read():
+            places = {place.id: place for place in self.model.query
+                      .options(*options)
+                      .filter(Place.id.in_([place_id
+                                            for _, place_id in nearest]))}
+        return [(places[place_id], distance)
+                for distance, place_id in nearest if place_id in places]
+
+    def fill_missing_geohashes(self, chunk_size=1000):
+        """Calcule le geohash des hébergements qui n'en ont pas.
+
+        Appelée au démarrage de l'application (base antérieure à la
+        colonne, import SQL direct) ; les écritures de l'application le
+        tiennent à jour. Sans commit s'il n'y a rien à calculer.
+
+        Returns:
+            int: Nombre d'hébergements mis à jour.
+        """
+        count = 0
+        while True:
+            rows = db.session.execute(
+                select(Place.id, Place.latitude, Place.longitude)
+                .where(Place.geohash.is_(None)).limit(chunk_size)).all()
+            if not rows:
+                break
+            db.session.execute(update(Place), [
+                {'id': row.id,
+                 'geohash': encode_geohash(row.latitude, row.longitude)}
+                for row in rows])
+            count += len(rows)
+        if count:
+            forget_cached(db.session, Place)
+            self.commit()
+        return count
+
+    def recompute_rating_stats(self):
+        """Recalcule les agrégats de tous les hébergements depuis les avis.
+
+        Un seul GROUP BY sur reviews, puis un UPDATE groupé par clé
+        primaire ; les hébergements sans avis sont remis à zéro.
+
+        Returns:
+            int: Nombre d'hébergements ayant au moins un avis.
+        """
+        stars = [func.sum(case((Review.rating == star, 1), else_=0))
+                 for star in range(1, 6)]
+        rows = db.session.query(
+            Review.place_id, func.count(Review.id), func.sum(Review.rating),
+            *stars
+        ).join(Place, Place.id == Review.place_id) \
+            .group_by(Review.place_id).all()
+
+        db.session.execute(
+            update(Place).values(**{column: 0
+                                    for column in RATING_STATS_COLUMNS})
+            .execution_options(synchronize_session=False))
+        if rows:
+            db.session.execute(update(Place), [
+                dict(zip(('id',) + RATING_STATS_COLUMNS, row))
+                for row in rows])
+        self._forget_rating_stats()
+        self.commit()
+        return len(rows)
+
+
 class UserRepository(SQLAlchemyRepository):
-    def __init__(self):
-        super().__init__(User)
+    def __init__(self, autocommit=True):
+        super().__init__(User, autocommit)
 
     def get_user_by_email(self, email):
-        return self.model.query.filter_by(email=email).first()
\ No newline at end of file
+        return self.model.query.filter_by(email=email).first()
+
+
+class ReviewRepository(SQLAlchemyRepository):
+    def __init__(self, autocommit=True):
+        super().__init__(Review, autocommit)
+
+    def get_by_place(self, place_id, options=()):
+        """Retourne les avis d'un hébergement (index sur reviews.place_id)."""
+        with self._read():
+            return self.model.query.filter_by(place_id=place_id) \
+                .options(*options) \
+                .order_by(self.model.created_at, self.model.id).all()
+
+    def get_page_by_place(self, place_id, limit, cursor=None,
+                          order_by='created_at', descending=False,
+                          options=()):
+        """Page des avis d'un hébergement, triée par order_by puis id."""
+        query = self.model.query.filter_by(place_id=place_id) \
+            .options(*options)
+        return self.get_page(limit, cursor, query, order_by, descending)
+
+    def get_place_version(self, place_id):
+        """Version des avis d'un hébergement, None s'il n'existe pas."""
+        with self._read():
+            row = db.session.execute(
+                place_reviews_version_statement(place_id)).first()
+        return None if row is None else tuple(row)
+
+    def get_reviewed_place_ids(self, user_id, place_ids):
+        """Retourne, parmi place_ids, ceux que l'utilisateur a déjà notés."""
+        place_ids = list(place_ids)
+        if not place_ids:
+            return set()
+        rows = db.session.query(self.model.place_id).filter(
+            self.model.user_id == user_id,
+            self.model.place_id.in_(place_ids)).all()
+        return {row.place_id for row in rows}
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""Mise à niveau du schéma d'une base existante, au démarrage.
+
+db.create_all() crée les tables absentes mais ne modifie jamais une table
+existante : une base créée avant l'ajout d'une colonne (ex: agrégats
+d'avis ou geohash de places) ferait échouer toute requête qui la lit.
+upgrade_schema ajoute les colonnes et les index manquants ; le calcul des
+valeurs des nouvelles colonnes reste à la charge de l'application.
+"""
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateColumn
+
+
+def add_missing_columns(connection, table):
+    """Ajoute à une table les colonnes absentes de la base.
+
+    Seules les colonnes nullables ou ayant une valeur par défaut côté
+    serveur peuvent être ajoutées ainsi (ALTER TABLE ... ADD COLUMN).
+
+    Args:
+        connection (Connection): Connexion dans une transaction ouverte.
+        table (Table): Table SQLAlchemy du modèle.
+
+    Returns:
+        list: Noms des colonnes ajoutées.
+    """
+    existing = {column['name']
+                for column in inspect(connection).get_columns(table.name)}
+    added = []
+    for column in table.columns:
+        if column.name in existing or \
+                (column.server_default is None and not column.nullable):
+            continue
+        ddl = CreateColumn(column).compile(dialect=connection.dialect)
+        connection.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {ddl}')
+        added.append(column.name)
+    return added
+
+
+def upgrade_schema(engine, metadata, logger=None):
+    """Ajoute les colonnes et les index manquants des tables existantes.
+
+    À appeler après metadata.create_all(). Un index unique que les données
+    actuelles violent (ex: doublons d'avis) n'est pas créé : l'erreur est
+    signalée dans le journal et le démarrage continue.
+
+    Args:
+        engine (Engine): Moteur de la base.
+        metadata (MetaData): Métadonnées des modèles.
+        logger: Journal où signaler les index non créés.
+
+    Returns:
+        dict: Colonnes ajoutées par nom de table (tables modifiées seules).
+    """
+    upgraded = {}
+    with engine.begin() as connection:
+        tables = set(inspect(connection).get_table_names())
+        for table in metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            added = add_missing_columns(connection, table)
+            if added:
+                upgraded[table.name] = added
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                with engine.begin() as connection:
+                    index.create(connection, checkfirst=True)
+            except IntegrityError as e:
+                if logger is not None:
+                    logger.warning("Index %s not created: %s", index.name,
+                                   e.orig)
+    return upgraded
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""Réglages SQLite appliqués à chaque connexion du pool.
+
+Les PRAGMA de performance (journal_mode, synchronous, mmap_size...) sont
+propres à une connexion SQLite : ils doivent être rejoués à chaque
+ouverture de connexion par le pool, d'où le hook sur l'événement
+``connect`` du moteur.
+"""
+import re
+from sqlalchemy import event
+
+_PRAGMA_NAME = re.compile(r'[a-z_]+')
+_PRAGMA_VALUE = re.compile(r'-?\d+|[A-Za-z_]+')
+
+
+def _pragma_statements(pragmas):
+    """Construit les instructions PRAGMA, en refusant toute valeur douteuse.
+
+    Raises:
+        ValueError: Si un nom ou une valeur de PRAGMA est invalide.
+    """
+    statements = []
+    for name, value in pragmas.items():
+        value = str(value)
+        if not _PRAGMA_NAME.fullmatch(name) or \
+                not _PRAGMA_VALUE.fullmatch(value):
+            raise ValueError(f"Invalid SQLite pragma: {name}={value}")
+        statements.append(f"PRAGMA {name}={value}")
+    return statements
+
+
+def configure_sqlite_pragmas(engine, pragmas):
+    """Applique un jeu de PRAGMA à chaque connexion ouverte par un moteur.
+
+    Sans effet si le moteur ne pointe pas sur SQLite ou si pragmas est vide.
+
+    Args:
+        engine (Engine): Moteur SQLAlchemy (pour un AsyncEngine, passer
+                         engine.sync_engine).
+        pragmas (dict): PRAGMA à appliquer, ex: {'journal_mode': 'WAL'}.
+
+    Raises:
+        ValueError: Si un nom ou une valeur de PRAGMA est invalide.
+    """
+    if not pragmas or engine.dialect.name != 'sqlite':
+        return
+    statements = _pragma_statements(pragmas)
+
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def get_sqlite_pragmas(connection, names):
+    """Lit la valeur courante de quelques PRAGMA (diagnostic, tests).
+
+    Args:
+        connection (Connection): Connexion SQLAlchemy ouverte.
+        names (iterable): Noms des PRAGMA à lire.
+
+    Returns:
+        dict: Valeur de chaque PRAGMA.
+    """
+    values = {}
+    for name in names:
+        if not _PRAGMA_NAME.fullmatch(name):
+            raise ValueError(f"Invalid SQLite pragma: {name}")
+        values[name] = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+    return values
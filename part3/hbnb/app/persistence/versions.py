@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""Versions des ressources, base des validateurs HTTP (ETag, Last-Modified).
+
+La version d'une ressource est un tuple lu par une seule requête
+d'agrégat, sans charger ni sérialiser d'objet :
+
+- un objet : son updated_at, plus celui des objets embarqués dans sa
+  réponse (propriétaire, amenities, auteurs des avis) ;
+- une collection : max(updated_at) et nombre de lignes de la table, plus
+  le max(updated_at) des objets embarqués dans ses éléments.
+
+Toute écriture visible dans une réponse change donc sa version : les
+colonnes ont onupdate (y compris les UPDATE d'agrégats d'avis), et une
+suppression change le nombre de lignes. Les requêtes sont construites ici
+et exécutées par les repositories synchrone et asynchrone ; l'option
+d'exécution resource_version les distingue des lectures de données pour
+les hooks d'exécution (comptage des requêtes, métriques).
+"""
+from sqlalchemy import func, select
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.models.user import User
+
+
+def _max_updated_at(model, *criteria):
+    """Sous-requête scalaire : max(updated_at) des lignes de model."""
+    return select(func.max(model.updated_at)).where(*criteria) \
+        .scalar_subquery()
+
+
+def _place_amenities(place_id_column):
+    """max(updated_at) et nombre des amenities d'un hébergement."""
+    linked = place_amenity.c.place_id == place_id_column
+    return (
+        select(func.max(Amenity.updated_at))
+        .join(place_amenity, place_amenity.c.amenity_id == Amenity.id)
+        .where(linked).scalar_subquery(),
+        select(func.count()).select_from(place_amenity).where(linked)
+        .scalar_subquery(),
+    )
+
+
+def _place_reviews(place_id_column):
+    """max(updated_at) et nombre des avis d'un hébergement, plus le
+    max(updated_at) de leurs auteurs (nom embarqué dans chaque avis)."""
+    of_place = Review.place_id == place_id_column
+    return (
+        _max_updated_at(Review, of_place),
+        select(func.count(Review.id)).where(of_place).scalar_subquery(),
+        select(func.max(User.updated_at))
+        .join(Review, Review.user_id == User.id)
+        .where(of_place).scalar_subquery(),
+    )
+
+
+def _embedded(model, include=()):
+    """Sous-requêtes des objets embarqués dans la réponse d'un objet."""
+    if model is Place:
+        aggregates = [_max_updated_at(User, User.id == Place.owner_id),
+                      *_place_amenities(Place.id)]
+        if 'reviews' in include:
+            aggregates += _place_reviews(Place.id)
+        return aggregates
+    if model is Review:
+        return [_max_updated_at(User, User.id == Review.user_id)]
+    return []
+
+
+def object_version_statement(model, obj_id, include=()):
+    """Requête de la version d'un objet.
+
+    Args:
+        model: Classe du modèle.
+        obj_id (str): ID de l'objet.
+        include (iterable): Relations embarquées en plus (ex: 'reviews'
+                            pour la fiche d'un hébergement).
+
+    Returns:
+        Select: Une ligne (updated_at, ...) ou aucune si l'objet n'existe
+                pas.
+    """
+    return select(model.updated_at, *_embedded(model, include)) \
+        .where(model.id == obj_id).execution_options(resource_version=True)
+
+
+def place_reviews_version_statement(place_id):
+    """Requête de la version des avis d'un hébergement (liste paginée).
+
+    Indépendante de l'hébergement lui-même : modifier sa fiche ne change
+    pas la liste de ses avis.
+
+    Returns:
+        Select: Une ligne (max(updated_at), nombre d'avis, max(updated_at)
+                des auteurs), ou aucune si l'hébergement n'existe pas.
+    """
+    return select(*_place_reviews(Place.id)).where(Place.id == place_id) \
+        .execution_options(resource_version=True)
+
+
+def collection_version_statement(model):
+    """Requête de la version d'une collection (toute la table).
+
+    Returns:
+        Select: Une ligne (max(updated_at), count, ...).
+    """
+    aggregates = []
+    if model is Place:
+        # Amenities embarquées dans chaque carte, propriétaire dans les
+        # fiches renvoyées par ?ids=
+        aggregates += [_max_updated_at(Amenity), _max_updated_at(User)]
+    elif model is Review:
+        # Nom de l'auteur embarqué dans chaque avis
+        aggregates.append(_max_updated_at(User))
+    return select(func.max(model.updated_at), func.count(model.id),
+                  *aggregates).execution_options(resource_version=True)
@@ -0,0 +1,287 @@
+#!/usr/bin/python3
+"""Sérialiseurs précompilés par modèle et par vue.
+
+Chaque vue (ex: la carte d'un hébergement dans une liste, la fiche d'un
+avis) est décrite une fois par la liste de ses champs, puis compilée au
+chargement du module en une fonction Python « à plat » :
+
+    def serialize_place_card(obj):
+        d = obj.__dict__
+        try:
+            result = {'id': d['id'], 'title': d['title'], ...}
+        except KeyError:
+            return _fallback(obj)
+        ...
+
+Aucune boucle sur les attributs, aucun isinstance ni getattr par champ,
+et les attributs déjà chargés sont lus dans l'instance sans passer par les
+descripteurs de SQLAlchemy : le coût d'un objet est proche de celui d'un
+dict littéral. Les vues imbriquées (propriétaire, amenities) appellent
+directement la fonction compilée de la vue cible.
+
+BaseModel.to_dict utilise la vue 'columns', construite depuis les colonnes
+du mapper (et non plus depuis __dict__, qui contient _sa_instance_state).
+"""
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm import configure_mappers
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+class _Context:
+    """État de la génération d'une fonction : noms globaux et préambule.
+
+    En mode rapide, les attributs mappés (colonnes et relations) sont lus
+    directement dans obj.__dict__ (variable d), sans passer par les
+    descripteurs de SQLAlchemy ; un attribut non chargé y est absent et
+    lève KeyError, ce qui bascule sur la version lente (obj.<attribut>).
+    """
+
+    def __init__(self, attrs, fast):
+        self.names = {}
+        self.prelude = []
+        self.attrs = attrs
+        self.fast = fast
+
+    def read(self, source):
+        """Expression lisant obj.<source> (chemin pointé accepté)."""
+        first, _, rest = source.partition('.')
+        if self.fast and first in self.attrs:
+            expression = f'd[{first!r}]'
+        else:
+            expression = f'obj.{first}'
+        return f'{expression}.{rest}' if rest else expression
+
+    def variable(self, expression):
+        """Évalue une expression une fois, dans le préambule."""
+        var = f'_v{len(self.prelude)}'
+        self.prelude.append(f'{var} = {expression}')
+        return var
+
+    def function(self, function):
+        """Rend une fonction accessible au code généré."""
+        name = f'_s{len(self.names)}'
+        self.names[name] = function
+        return name
+
+
+class Field:
+    """Champ lu tel quel : obj.<source> (chemin pointé accepté)."""
+
+    def __init__(self, key, source=None):
+        self.key = key
+        self.source = source or key
+        for part in self.source.split('.'):
+            if not part.isidentifier():
+                raise ValueError(f"Invalid field source '{self.source}'")
+
+    def compile(self, context):
+        """Retourne l'expression Python produisant la valeur du champ."""
+        return context.read(self.source)
+
+
+class IsoDate(Field):
+    """Date convertie en chaîne ISO 8601 (None conservé)."""
+
+    def compile(self, context):
+        var = context.variable(context.read(self.source))
+        return f'None if {var} is None else {var}.isoformat()'
+
+
+class Group(Field):
+    """Sous-dict de colonnes, ex: {'1': obj.rating_1, ...}."""
+
+    def __init__(self, key, sources):
+        self.key = key
+        self.sources = dict(sources)
+        for source in self.sources.values():
+            Field(key, source)
+
+    def compile(self, context):
+        return '{' + ', '.join(f'{name!r}: {context.read(source)}'
+                               for name, source in self.sources.items()) + '}'
+
+
+class Nested(Field):
+    """Objet lié sérialisé par une autre vue (None conservé)."""
+
+    def __init__(self, key, model, view, source=None):
+        super().__init__(key, source)
+        self.target = (model, view)
+
+    def compile(self, context):
+        function = context.function(serializer(*self.target))
+        var = context.variable(context.read(self.source))
+        return f'None if {var} is None else {function}({var})'
+
+
+class NestedList(Nested):
+    """Collection liée, chaque élément sérialisé par une autre vue.
+
+    Avec omit_empty, la clé est absente quand la collection est vide.
+    """
+
+    def __init__(self, key, model, view, source=None, omit_empty=False):
+        super().__init__(key, model, view, source)
+        self.omit_empty = omit_empty
+
+    def compile(self, context):
+        function = context.function(serializer(*self.target))
+        return f'[{function}(item) for item in {context.read(self.source)}]'
+
+
+class Constant(Field):
+    """Valeur fixe, identique pour tous les objets."""
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+
+    def compile(self, context):
+        return repr(self.value)
+
+
+_REGISTRY = {}
+
+
+def _generate(name, fields, attrs, fast, fallback=None):
+    """Source et noms globaux d'une fonction de sérialisation."""
+    context = _Context(attrs, fast)
+    items = [f'{field.key!r}: {field.compile(context)}' for field in fields]
+    omitted = [field.key for field in fields
+               if getattr(field, 'omit_empty', False)]
+    indent = '        ' if fast else '    '
+
+    lines = [f'def {name}(obj):']
+    if fast:
+        context.names['_fallback'] = fallback
+        lines += ['    d = obj.__dict__', '    try:']
+    lines += [f'{indent}{statement}' for statement in context.prelude]
+    lines.append(f'{indent}result = {{' + ', '.join(items) + '}')
+    if fast:
+        # Attribut non chargé (expiré, différé, relation paresseuse)
+        lines += ['    except KeyError:', '        return _fallback(obj)']
+    for key in omitted:
+        lines.append(f'    if not result[{key!r}]:')
+        lines.append(f'        del result[{key!r}]')
+    lines.append('    return result')
+    return '\n'.join(lines), context.names
+
+
+def compile_serializer(name, fields, model=None):
+    """Génère la fonction de sérialisation d'une liste de champs.
+
+    Avec un modèle, la fonction lit les attributs chargés directement dans
+    l'instance et ne passe par les descripteurs qu'en repli.
+
+    Args:
+        name (str): Nom de la fonction générée (pour les traces).
+        fields (list): Champs (Field ou nom d'attribut), dans l'ordre des
+                       clés du dict produit.
+        model: Classe mappée des objets sérialisés (optionnel).
+
+    Returns:
+        callable: Fonction obj -> dict.
+    """
+    fields = [Field(field) if isinstance(field, str) else field
+              for field in fields]
+    functions, attrs = [], set()
+    if model is not None:
+        # Les backrefs (Review.user...) n'existent qu'une fois configurés
+        configure_mappers()
+        attrs = set(inspect(model).attrs.keys())
+    for function_name, fast in ((f'{name}_slow', False), (name, True)):
+        if fast and not attrs:
+            break
+        source, names = _generate(function_name, fields, attrs, fast,
+                                  functions[-1] if functions else None)
+        exec(compile(source, f'<serializer {function_name}>', 'exec'),
+             names)
+        function = names[function_name]
+        function.__source__ = source
+        functions.append(function)
+    return functions[-1]
+
+
+def _column_fields(model):
+    """Champs de la vue 'columns' : colonnes du mapper et __class__."""
+    fields = []
+    for attr in inspect(model).column_attrs:
+        column = attr.columns[0]
+        if isinstance(column.type, DateTime):
+            fields.append(IsoDate(attr.key))
+        else:
+            fields.append(Field(attr.key))
+    fields.append(Constant('__class__', model.__name__))
+    return fields
+
+
+def register(model, view, fields):
+    """Compile et enregistre la vue d'un modèle.
+
+    Returns:
+        callable: La fonction compilée.
+    """
+    name = f'serialize_{model.__name__.lower()}_{view}'
+    function = compile_serializer(name, fields, model)
+    _REGISTRY[(model, view)] = function
+    return function
+
+
+def serializer(model, view):
+    """Retourne la fonction compilée d'une vue.
+
+    La vue 'columns' est compilée à la première demande pour les modèles
+    qui ne sont pas enregistrés ci-dessous.
+
+    Raises:
+        KeyError: Si la vue n'est pas enregistrée pour ce modèle.
+    """
+    function = _REGISTRY.get((model, view))
+    if function is None:
+        if view != 'columns':
+            raise KeyError(f"No '{view}' serializer for {model.__name__}")
+        function = register(model, view, _column_fields(model))
+    return function
+
+
+def serialize(obj, view):
+    """Sérialise un objet selon une vue de son modèle."""
+    return serializer(type(obj), view)(obj)
+
+
+register(Amenity, 'detail', ['id', 'name'])
+
+register(User, 'detail', ['id', 'first_name', 'last_name', 'email'])
+
+# Dates laissées en datetime : l'encodeur JSON les écrit en ISO 8601
+register(Review, 'detail', [
+    'id', 'text', 'rating', 'user_id', 'place_id', 'created_at',
+    'updated_at',
+    Field('first_name', 'user.first_name'),
+    Field('last_name', 'user.last_name'),
+])
+
+_PLACE_COMMON = ['id', 'title', 'description', 'price', 'latitude',
+                 'longitude']
+# rating_histogram : mêmes clés que la propriété Place.rating_histogram
+_PLACE_STATS = ['images', 'review_count', 'average_rating',
+                Group('rating_histogram',
+                      {str(star): f'rating_{star}' for star in range(1, 6)})]
+
+# Carte d'une liste : owner_id, amenities absentes si vides
+register(Place, 'card', _PLACE_COMMON + [
+    'owner_id',
+    NestedList('amenities', Amenity, 'detail', omit_empty=True),
+] + _PLACE_STATS)
+
+# Fiche : propriétaire embarqué à la place de owner_id
+register(Place, 'detail', _PLACE_COMMON + [
+    Nested('owner', User, 'detail'),
+    NestedList('amenities', Amenity, 'detail', omit_empty=True),
+] + _PLACE_STATS)
+
+for _model in (Amenity, User, Review, Place):
+    register(_model, 'columns', _column_fields(_model))
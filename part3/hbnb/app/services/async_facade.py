@@ -0,0 +1,173 @@
+"""Façade asynchrone pour le déploiement ASGI.
+
+Version en lecture seule de HBnBFacade : chaque méthode de lecture est une
+coroutine appuyée sur AsyncSQLAlchemyRepository. Les relations utilisées par
+les endpoints sont chargées à l'avance via les profils de
+app.services.loaders, le chargement paresseux étant impossible en asyncio.
+
+Aucune méthode d'écriture : l'application ASGI délègue toutes les écritures
+à Flask, donc à HBnBFacade, seule à tenir à jour les agrégats d'avis et à
+invalider le cache de lecture et le cache de réponses.
+"""
+from app.persistence.async_repository import (AsyncReviewRepository,
+                                              AsyncSQLAlchemyRepository)
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.services.loaders import loader_options
+
+
+class AsyncHBnBFacade:
+    """Façade asynchrone de lecture des fonctionnalités de l'application.
+
+    Args:
+        session (async_scoped_session): Session asynchrone à portée de tâche.
+    """
+
+    def __init__(self, session):
+        """Initialise la façade avec les repositories asynchrones."""
+        self.session = session
+        self.user_repo = AsyncSQLAlchemyRepository(User, session)
+        self.place_repo = AsyncSQLAlchemyRepository(Place, session)
+        self.review_repo = AsyncReviewRepository(session)
+        self.amenity_repo = AsyncSQLAlchemyRepository(Amenity, session)
+
+    async def close(self):
+        """Libère la session de la tâche courante (fin de requête)."""
+        await self.session.remove()
+
+    async def get_user(self, user_id):
+        """Récupère un utilisateur par son ID."""
+        return await self.user_repo.get(user_id)
+
+    async def get_user_by_email(self, email):
+        """Récupère un utilisateur par son email."""
+        return await self.user_repo.get_by_attribute('email', email)
+
+    async def get_all_users(self):
+        """Récupère tous les utilisateurs."""
+        return await self.user_repo.get_all()
+
+    async def get_users_page(self, limit, cursor=None):
+        """Récupère une page d'utilisateurs (pagination par curseur)."""
+        return await self.user_repo.get_page(limit, cursor)
+
+    async def get_user_version(self, user_id):
+        """Version d'un utilisateur (validateurs HTTP), None s'il n'existe pas."""
+        return await self.user_repo.get_version(user_id)
+
+    async def get_users_version(self):
+        """Version de la collection des utilisateurs."""
+        return await self.user_repo.get_version()
+
+    async def get_place(self, place_id):
+        """Récupère un hébergement par son ID, avec propriétaire et amenities."""
+        return await self.place_repo.get(
+            place_id, options=loader_options(Place, 'detail'))
+
+    async def get_all_places(self):
+        """Récupère tous les hébergements."""
+        return await self.place_repo.get_all(
+            options=loader_options(Place, 'list_card'))
+
+    async def get_places_page(self, limit, cursor=None):
+        """Récupère une page d'hébergements (pagination par curseur)."""
+        return await self.place_repo.get_page(
+            limit, cursor, options=loader_options(Place, 'list_card'))
+
+    async def get_place_version(self, place_id):
+        """Version d'un hébergement (validateurs HTTP), None s'il n'existe pas."""
+        return await self.place_repo.get_version(place_id)
+
+    async def get_places_version(self):
+        """Version de la collection des hébergements."""
+        return await self.place_repo.get_version()
+
+    async def get_places_in_range(self, attr_name, low=None, high=None):
+        """Récupère les hébergements dont un attribut est dans un intervalle.
+
+        Raises:
+            ValueError: Si l'attribut ne peut pas être filtré par intervalle.
+        """
+        if attr_name not in ('price', 'latitude', 'longitude'):
+            raise ValueError(f"Cannot filter places by range on '{attr_name}'")
+        return await self.place_repo.find_range(
+            attr_name, low, high, options=loader_options(Place, 'list_card'))
+
+    async def get_amenity_by_id(self, amenity_id):
+        """Récupère un équipement par son ID."""
+        return await self.amenity_repo.get(amenity_id)
+
+    async def get_amenity(self, amenity_id):
+        """Récupère un équipement par son ID (alias pour get_amenity_by_id)."""
+        return await self.amenity_repo.get(amenity_id)
+
+    async def get_all_amenities(self):
+        """Récupère tous les équipements."""
+        return await self.amenity_repo.get_all()
+
+    async def get_amenities_page(self, limit, cursor=None):
+        """Récupère une page d'équipements (pagination par curseur)."""
+        return await self.amenity_repo.get_page(limit, cursor)
+
+    async def get_amenity_version(self, amenity_id):
+        """Version d'un équipement (validateurs HTTP), None s'il n'existe pas."""
+        return await self.amenity_repo.get_version(amenity_id)
+
+    async def get_amenities_version(self):
+        """Version de la collection des équipements."""
+        return await self.amenity_repo.get_version()
+
+    async def get_review(self, review_id):
+        """Récupère un avis par son ID, avec son auteur et son hébergement."""
+        if not review_id:
+            return None
+        return await self.review_repo.get(
+            review_id, options=loader_options(Review, 'detail'))
+
+    async def get_all_reviews(self):
+        """Récupère tous les avis."""
+        return await self.review_repo.get_all(
+            options=loader_options(Review, 'list_card'))
+
+    async def get_reviews_page(self, limit, cursor=None):
+        """Récupère une page d'avis (pagination par curseur)."""
+        return await self.review_repo.get_page(
+            limit, cursor, options=loader_options(Review, 'list_card'))
+
+    async def get_review_version(self, review_id):
+        """Version d'un avis (validateurs HTTP), None s'il n'existe pas."""
+        return await self.review_repo.get_version(review_id)
+
+    async def get_reviews_version(self):
+        """Version de la collection des avis."""
+        return await self.review_repo.get_version()
+
+    async def get_place_reviews_version(self, place_id):
+        """Version des avis d'un hébergement, None s'il n'existe pas."""
+        return await self.review_repo.get_place_version(place_id)
+
+    async def get_reviews_by_place(self, place_id):
+        """Récupère tous les avis d'un hébergement."""
+        if not place_id:
+            return []
+        return await self.review_repo.get_all(
+            options=loader_options(Review, 'list_card'),
+            criteria=(Review.place_id == place_id,))
+
+    async def get_reviews_by_place_page(self, place_id, limit, cursor=None,
+                                        sort='created_at', order='asc'):
+        """Récupère une page des avis d'un hébergement.
+
+        Raises:
+            ValueError: Si le tri ou le curseur sont invalides.
+        """
+        if sort not in ('created_at', 'rating'):
+            raise ValueError("sort must be 'created_at' or 'rating'")
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        return await self.review_repo.get_page(
+            limit, cursor, options=loader_options(Review, 'list_card'),
+            criteria=(Review.place_id == place_id,),
+            order_by=sort, descending=order == 'desc')
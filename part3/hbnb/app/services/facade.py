@@ -4,12 +4,39 @@ Ce module implémente le pattern Façade pour centraliser l'accès aux fonctionn
 de l'application. Il gère l'interaction avec les repositories et fournit une interface
 unifiée pour toutes les opérations sur les modèles.
 """
-from app.persistence.repository import SQLAlchemyRepository, UserRepository
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.persistence.repository import (SQLAlchemyRepository, UserRepository,
+                                        PlaceRepository, ReviewRepository,
+                                        in_transaction, transaction)
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.review import Review
 from app.models import db
+from app.services.loaders import loader_options, place_include_options
+
+
+def is_duplicate_review_error(error):
+    """Indique si une IntegrityError vient de l'index unique (user, place)."""
+    message = str(error.orig)
+    return 'uq_reviews_user_id_place_id' in message or \
+        ('reviews.user_id' in message and 'reviews.place_id' in message)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _apply_response_invalidations(session):
+    """Invalide les réponses en cache touchées par la transaction validée."""
+    for cache, tags in session.info.pop('response_invalidations', {}).items():
+        cache.invalidate(tags)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_response_invalidations(session):
+    """Rien n'a changé : les réponses en cache restent valides."""
+    session.info.pop('response_invalidations', None)
 
 
 class HBnBFacade:
@@ -22,9 +49,130 @@ class HBnBFacade:
     def __init__(self):
         """Initialise la façade avec les repositories."""
         self.user_repo = UserRepository()
-        self.place_repo = SQLAlchemyRepository(Place)
-        self.review_repo = SQLAlchemyRepository(Review)
+        self.place_repo = PlaceRepository()
+        self.review_repo = ReviewRepository()
         self.amenity_repo = SQLAlchemyRepository(Amenity)
+        self.response_cache = None
+
+    def transaction(self):
+        """Ouvre une unité de travail couvrant plusieurs opérations.
+
+        Exemple:
+            with facade.transaction():
+                place = facade.create_place(...)
+                facade.create_review(...)
+
+        Returns:
+            contextmanager: Bloc validé en un seul commit à la sortie.
+        """
+        return transaction()
+
+    def configure_cache(self, maxsize, ttl=None):
+        """Active ou désactive le cache de lecture de tous les repositories.
+
+        Args:
+            maxsize (int): Nombre d'objets gardés par repository (0 désactive).
+            ttl (float): Durée de vie d'une entrée en secondes.
+        """
+        for repo in (self.user_repo, self.place_repo,
+                     self.review_repo, self.amenity_repo):
+            if maxsize:
+                repo.enable_cache(maxsize, ttl)
+            else:
+                repo.disable_cache()
+
+    def configure_response_cache(self, cache):
+        """Branche (ou retire) le cache de réponses HTTP à invalider.
+
+        Args:
+            cache (ResponseCache): Cache de app.api.response_cache, ou None.
+        """
+        self.response_cache = cache
+
+    def _invalidate(self, *tags):
+        """Invalide les réponses étiquetées par tags au prochain commit.
+
+        À appeler avant le commit de l'écriture ; un rollback annule
+        l'invalidation.
+        """
+        if self.response_cache is None:
+            return
+        pending = db.session.info.setdefault('response_invalidations', {})
+        pending.setdefault(self.response_cache, set()).update(tags)
+
+    def get_cache_stats(self):
+        """Retourne les compteurs (hits, misses, taille) de chaque cache.
+
+        Returns:
+            dict: Statistiques par repository, None si le cache est inactif.
+        """
+        repos = {'users': self.user_repo, 'places': self.place_repo,
+                 'reviews': self.review_repo, 'amenities': self.amenity_repo}
+        return {name: repo.cache.stats() if repo.cache else None
+                for name, repo in repos.items()}
+
+    def _insert_batch(self, repo, results, chunk_size, on_chunk=None,
+                      tags=()):
+        """Insère les objets valides de results par lots transactionnels.
+
+        Un lot refusé par la base est rejoué élément par élément, chacun
+        dans sa transaction : seuls les éléments fautifs échouent. Dans une
+        unité de travail englobante, l'erreur remonte telle quelle, c'est
+        au bloc englobant d'annuler l'ensemble.
+
+        Args:
+            repo (SQLAlchemyRepository): Repository cible.
+            results (list): Liste de tuples (objet ou None, erreur ou None),
+                            modifiée sur place si un élément échoue.
+            chunk_size (int): Nombre d'objets par transaction.
+            on_chunk (callable): Appelé avec les objets de chaque lot, dans
+                                 sa transaction (écritures dérivées).
+            tags (tuple): Réponses en cache invalidées par chaque lot.
+
+        Returns:
+            list: La liste results mise à jour.
+
+        Raises:
+            SQLAlchemyError: Si un lot échoue dans une unité de travail
+                             englobante.
+        """
+        nested = in_transaction()
+
+        def insert(objs):
+            with self.transaction():
+                self._invalidate(*tags)
+                repo.add_many(objs)
+                if on_chunk:
+                    on_chunk(objs)
+
+        pending = [i for i, (obj, _) in enumerate(results) if obj is not None]
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            try:
+                insert([results[i][0] for i in chunk])
+            except SQLAlchemyError as e:
+                if nested:
+                    raise
+                current_app.logger.warning(
+                    "Batch chunk of %d rejected, retrying item by item: %s",
+                    len(chunk), e)
+                # Lot annulé : chaque élément est retenté seul, l'échec
+                # n'est rapporté que dans son résultat
+                for i in chunk:
+                    try:
+                        insert([results[i][0]])
+                    except SQLAlchemyError:
+                        results[i] = (None,
+                                      "Database error, item not created")
+        return results
+
+    def _rollback(self):
+        """Annule la session, sauf si une unité de travail est en cours.
+
+        Dans une transaction, c'est le bloc englobant qui annule tout.
+        """
+        if not in_transaction():
+            db.session.rollback()
 
     def create_user(self, user_data):
         """Crée un nouvel utilisateur.
@@ -77,46 +225,315 @@ class HBnBFacade:
             place.owner_id = owner_id
 
             if amenities_ids:
-                amenities_objects = []
-                for amenity_id in amenities_ids:
-                    amenity = self.amenity_repo.get(amenity_id)
-                    if amenity:
-                        amenities_objects.append(amenity)
-                place.amenities = amenities_objects
+                # Une seule requête pour toutes les amenities
+                place.amenities, _ = self.amenity_repo.get_many(amenities_ids)
 
             # Sauvegarder
-            db.session.add(place)
-            db.session.commit()
+            self._invalidate('places')
+            self.place_repo.add(place)
             
             return place
             
         except Exception as e:
-            db.session.rollback()
+            self._rollback()
             raise e
 
-    def get_place(self, place_id):
+    def create_places_batch(self, places_data, owner_id, chunk_size=500):
+        """Crée plusieurs hébergements pour un même propriétaire.
+
+        Les amenities de tous les éléments sont résolues en une requête,
+        puis les hébergements sont insérés par lots de chunk_size.
+
+        Args:
+            places_data (list): Données des hébergements (déjà validées).
+            owner_id (str): ID du propriétaire de tous les hébergements.
+            chunk_size (int): Nombre d'hébergements par transaction.
+
+        Returns:
+            list: Un tuple (Place ou None, message d'erreur ou None) par
+                  élément, dans l'ordre de places_data.
+
+        Raises:
+            ValueError: Si le propriétaire spécifié n'existe pas.
+        """
+        if not self.get_user(owner_id):
+            raise ValueError("Owner not found")
+
+        amenity_ids = [amenity_id for place_data in places_data
+                       for amenity_id in place_data.get('amenities') or []]
+        amenities, _ = self.amenity_repo.get_many(amenity_ids)
+        amenities_by_id = {amenity.id: amenity for amenity in amenities}
+
+        results = []
+        for place_data in places_data:
+            try:
+                place = Place(
+                    title=place_data['title'],
+                    description=place_data.get('description'),
+                    price=place_data['price'],
+                    latitude=place_data['latitude'],
+                    longitude=place_data['longitude']
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                results.append((None, str(e)))
+                continue
+            place.owner_id = owner_id
+            place.amenities = [
+                amenities_by_id[amenity_id]
+                for amenity_id in dict.fromkeys(place_data.get('amenities') or [])
+                if amenity_id in amenities_by_id]
+            results.append((place, None))
+
+        return self._insert_batch(self.place_repo, results, chunk_size,
+                                  tags=('places',))
+
+    def get_place(self, place_id, profile=None):
         """Récupère un hébergement par son ID.
 
         Args:
             place_id (str): ID de l'hébergement à récupérer.
+            profile (str): Profil de chargement des relations ('minimal',
+                           'list_card', 'detail' ; None = paresseux).
 
         Returns:
             Place: L'objet hébergement ou None s'il n'existe pas.
         """
-        return self.place_repo.get(place_id)
+        return self.place_repo.get(place_id,
+                                   loader_options(Place, profile))
 
-    def get_all_places(self):
+    def get_place_with_includes(self, place_id, include, limit,
+                                cursor=None):
+        """Récupère un hébergement et les relations demandées en une fois.
+
+        Le nombre de requêtes est borné quelle que soit la taille des
+        relations : l'hébergement (et son propriétaire), ses amenities, puis
+        une page de ses avis avec leurs auteurs.
+
+        Args:
+            place_id (str): ID de l'hébergement.
+            include (iterable): Relations à inclure ('owner', 'amenities',
+                                'reviews').
+            limit (int): Nombre maximum d'avis inclus.
+            cursor (str): Curseur de la page d'avis précédente.
+
+        Returns:
+            tuple: (Place ou None, liste des avis ou None si non inclus,
+                    curseur de la page d'avis suivante ou None)
+
+        Raises:
+            ValueError: Si une relation ou le curseur sont invalides.
+        """
+        place = self.place_repo.get(place_id, place_include_options(include))
+        if place is None or 'reviews' not in include:
+            return place, None, None
+        reviews, next_cursor = self.get_reviews_by_place_page(
+            place_id, limit, cursor)
+        return place, reviews, next_cursor
+
+    def get_places_by_ids(self, place_ids, profile='detail'):
+        """Récupère plusieurs hébergements en une requête IN (...).
+
+        Args:
+            place_ids (list): IDs des hébergements.
+            profile (str): Profil de chargement des relations.
+
+        Returns:
+            tuple: (objets Place trouvés dans l'ordre des IDs,
+                    IDs introuvables)
+        """
+        return self.place_repo.get_many(place_ids,
+                                        loader_options(Place, profile))
+
+    def get_all_places(self, profile=None):
         """Récupère tous les hébergements.
 
+        Args:
+            profile (str): Profil de chargement des relations.
+
         Returns:
             list: Liste de tous les objets Place.
         """
-        return self.place_repo.get_all()
+        return self.place_repo.get_all(loader_options(Place, profile))
+
+    def iter_places(self, batch_size=1000, profile='list_card'):
+        """Parcourt tous les hébergements par lots, sans les charger tous
+        en mémoire.
+
+        Args:
+            batch_size (int): Nombre d'hébergements lus à la fois.
+            profile (str): Profil de chargement des relations.
+
+        Returns:
+            iterator: Objets Place triés par date de création.
+        """
+        return self.place_repo.iter_all(batch_size,
+                                        loader_options(Place, profile))
+
+    def get_places_page(self, limit, cursor=None, profile='list_card',
+                        fields=None):
+        """Récupère une page d'hébergements (pagination par curseur).
+
+        Args:
+            limit (int): Nombre maximum d'hébergements à retourner.
+            cursor (str): Curseur renvoyé par la page précédente.
+            profile (str): Profil de chargement des relations.
+            fields (list): Champs demandés ; seules leurs colonnes sont
+                           chargées (remplace profile).
+
+        Returns:
+            tuple: (liste des objets Place, curseur suivant ou None)
+
+        Raises:
+            ValueError: Si un champ ou le curseur sont invalides.
+        """
+        query = Place.query.options(*loader_options(Place, profile, fields))
+        return self.place_repo.get_page(limit, cursor, query)
+
+    def get_place_version(self, place_id, include=()):
+        """Version d'un hébergement, pour les validateurs HTTP (ETag).
+
+        Args:
+            place_id (str): ID de l'hébergement.
+            include (iterable): Relations embarquées (?include=).
+
+        Returns:
+            tuple: Version (dates de modification), None s'il n'existe pas.
+        """
+        return self.place_repo.get_version(place_id, include)
+
+    def get_places_version(self):
+        """Version de la collection des hébergements (max(updated_at), nombre).
+
+        Returns:
+            tuple: Version de la collection.
+        """
+        return self.place_repo.get_version()
+
+    def search_places(self, limit, cursor=None, min_price=None,
+                      max_price=None, amenity_ids=(), bbox=None,
+                      sort=None, order='asc', profile='list_card',
+                      text_query=None, fields=None):
+        """Recherche paginée d'hébergements (texte, prix, amenities, zone).
+
+        Args:
+            limit (int): Nombre maximum d'hébergements à retourner.
+            cursor (str): Curseur renvoyé par la page précédente.
+            min_price (float): Prix minimum inclus.
+            max_price (float): Prix maximum inclus.
+            amenity_ids (list): IDs des amenities toutes requises.
+            bbox (tuple): (min_lat, min_lng, max_lat, max_lng).
+            sort (str): 'relevance' (défaut avec text_query), 'created_at'
+                        (défaut sinon), 'price' ou 'review_count'.
+            order (str): 'asc' ou 'desc' (ignoré pour 'relevance').
+            profile (str): Profil de chargement des relations.
+            text_query (str): Mots recherchés dans le titre, la
+                              description ou les avis.
+            fields (list): Champs demandés (remplace profile).
+
+        Returns:
+            tuple: (liste des objets Place, curseur suivant ou None)
+
+        Raises:
+            ValueError: Si un filtre, un champ, le tri ou le curseur sont
+                        invalides.
+        """
+        if sort is None:
+            sort = 'relevance' if text_query is not None else 'created_at'
+        if sort not in ('relevance', 'created_at', 'price', 'review_count'):
+            raise ValueError("sort must be 'relevance', 'created_at', "
+                             "'price' or 'review_count'")
+        if sort == 'relevance' and text_query is None:
+            raise ValueError("sort 'relevance' requires a text query")
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        if min_price is not None and max_price is not None \
+                and min_price > max_price:
+            raise ValueError("min_price cannot be greater than max_price")
+        if bbox is not None:
+            min_lat, min_lng, max_lat, max_lng = bbox
+            if not (-90 <= min_lat <= max_lat <= 90):
+                raise ValueError(
+                    "Latitudes must satisfy -90 <= min_lat <= max_lat <= 90")
+            if not (-180 <= min_lng <= 180 and -180 <= max_lng <= 180):
+                raise ValueError("Longitudes must be between -180 and 180")
+        options = loader_options(
+            Place, profile, fields,
+            'created_at' if sort == 'relevance' else sort)
+        return self.place_repo.search(
+            limit, cursor, min_price, max_price, amenity_ids, bbox,
+            sort, order == 'desc', options, text_query)
+
+    def get_search_snippets(self, text_query, place_ids):
+        """Extraits surlignés d'une page de résultats de recherche.
+
+        Args:
+            text_query (str): Requête passée à search_places.
+            place_ids (list): IDs des hébergements de la page.
+
+        Returns:
+            dict: place_id -> extrait du titre, de la description ou du
+                  meilleur avis, mots trouvés entre <mark> et </mark>.
+        """
+        return self.place_repo.search_snippets(text_query, place_ids)
+
+    def get_places_nearby(self, latitude, longitude, radius_km, limit,
+                          profile='list_card'):
+        """Récupère les hébergements les plus proches d'une position.
+
+        Args:
+            latitude (float): Latitude du centre de recherche.
+            longitude (float): Longitude du centre de recherche.
+            radius_km (float): Rayon de recherche en kilomètres.
+            limit (int): Nombre maximum d'hébergements à retourner.
+            profile (str): Profil de chargement des relations.
+
+        Returns:
+            list: Tuples (Place, distance en km), du plus proche au plus
+                  lointain.
+
+        Raises:
+            ValueError: Si la position ou le rayon sont invalides.
+        """
+        if not -90 <= latitude <= 90:
+            raise ValueError("Latitude must be between -90 and 90")
+        if not -180 <= longitude <= 180:
+            raise ValueError("Longitude must be between -180 and 180")
+        if not radius_km > 0:
+            raise ValueError("radius_km must be positive")
+        return self.place_repo.nearby(latitude, longitude, radius_km, limit,
+                                      loader_options(Place, profile))
+
+    def index_place_locations(self):
+        """Calcule le geohash des hébergements qui n'en ont pas encore.
+
+        Returns:
+            int: Nombre d'hébergements indexés.
+        """
+        self._invalidate('places')
+        return self.place_repo.fill_missing_geohashes()
+
+    def get_places_in_range(self, attr_name, low=None, high=None):
+        """Récupère les hébergements dont un attribut est dans un intervalle.
+
+        Args:
+            attr_name (str): 'price', 'latitude' ou 'longitude'.
+            low (float): Borne inférieure incluse (None = pas de borne).
+            high (float): Borne supérieure incluse (None = pas de borne).
+
+        Returns:
+            list: Hébergements triés par valeur croissante de attr_name.
+
+        Raises:
+            ValueError: Si l'attribut ne peut pas être filtré par intervalle.
+        """
+        if attr_name not in ('price', 'latitude', 'longitude'):
+            raise ValueError(f"Cannot filter places by range on '{attr_name}'")
+        return self.place_repo.find_range(attr_name, low, high)
 
     def update_place(self, place_id, place_data):
         """Met à jour un hébergement existant."""
         try:
-            place = self.place_repo.get(place_id)
+            place = self.place_repo.get_for_update(place_id)
             if not place:
                 return None
 
@@ -129,19 +546,19 @@ class HBnBFacade:
                     setattr(place, key, value)
 
             if amenity_ids:
-                amenities_objects = []
-                for amenity_id in amenity_ids:
-                    amenity = self.amenity_repo.get(amenity_id)
-                    if amenity:
-                        amenities_objects.append(amenity)
-                place.amenities = amenities_objects
+                # Une seule requête pour toutes les amenities
+                place.amenities, _ = self.amenity_repo.get_many(amenity_ids)
+                # La table d'association seule ne date pas la modification :
+                # sans cela, la version (ETag) de la fiche ne changerait pas
+                place.updated_at = datetime.utcnow()
 
             # Sauvegarder
-            db.session.commit()
+            self._invalidate('places', f'place:{place_id}')
+            self.place_repo.commit()
             return place
             
         except Exception as e:
-            db.session.rollback()
+            self._rollback()
             raise e
 
     def get_user(self, user_id):
@@ -181,6 +598,7 @@ class HBnBFacade:
         try:
             # Cette méthode reçoit un nom, pas un dict
             amenity = Amenity(name=name)
+            self._invalidate('amenities')
             self.amenity_repo.add(amenity)
             return amenity
         except Exception as e:
@@ -189,6 +607,26 @@ class HBnBFacade:
             print(traceback.format_exc())
             raise  # Relève l'exception pour être gérée au niveau supérieur
 
+    def create_amenities_batch(self, names, chunk_size=500):
+        """Crée plusieurs équipements par lots transactionnels.
+
+        Args:
+            names (list): Noms des équipements à créer.
+            chunk_size (int): Nombre d'équipements par transaction.
+
+        Returns:
+            list: Un tuple (Amenity ou None, message d'erreur ou None) par
+                  nom, dans l'ordre de names.
+        """
+        results = []
+        for name in names:
+            try:
+                results.append((Amenity(name=name), None))
+            except (TypeError, ValueError) as e:
+                results.append((None, str(e)))
+        return self._insert_batch(self.amenity_repo, results, chunk_size,
+                                  tags=('amenities',))
+
     def get_amenity_by_id(self, amenity_id):
         """Récupère un équipement par son ID.
 
@@ -200,6 +638,15 @@ class HBnBFacade:
         """
         return self.amenity_repo.get(amenity_id)
 
+    def get_amenities_by_ids(self, amenity_ids):
+        """Récupère plusieurs équipements en une requête IN (...).
+
+        Returns:
+            tuple: (objets Amenity trouvés dans l'ordre des IDs,
+                    IDs introuvables)
+        """
+        return self.amenity_repo.get_many(amenity_ids)
+
     def get_all_amenities(self):
         """Récupère tous les équipements.
 
@@ -208,6 +655,41 @@ class HBnBFacade:
         """
         return self.amenity_repo.get_all()
 
+    def get_amenities_page(self, limit, cursor=None, fields=None):
+        """Récupère une page d'équipements (pagination par curseur).
+
+        Args:
+            limit (int): Nombre maximum d'équipements à retourner.
+            cursor (str): Curseur renvoyé par la page précédente.
+            fields (list): Champs demandés ; seules leurs colonnes sont
+                           chargées.
+
+        Returns:
+            tuple: (liste des objets Amenity, curseur suivant ou None)
+        """
+        query = Amenity.query.options(
+            *loader_options(Amenity, fields=fields))
+        return self.amenity_repo.get_page(limit, cursor, query)
+
+    def get_amenity_version(self, amenity_id):
+        """Version d'un équipement, pour les validateurs HTTP (ETag).
+
+        Args:
+            amenity_id (str): ID de l'équipement.
+
+        Returns:
+            tuple: Version (dates de modification), None s'il n'existe pas.
+        """
+        return self.amenity_repo.get_version(amenity_id)
+
+    def get_amenities_version(self):
+        """Version de la collection des équipements (max(updated_at), nombre).
+
+        Returns:
+            tuple: Version de la collection.
+        """
+        return self.amenity_repo.get_version()
+
     def update_amenity(self, amenity_id, name):
         """Met à jour un équipement existant.
 
@@ -219,14 +701,16 @@ class HBnBFacade:
             Amenity: L'objet équipement mis à jour ou None s'il n'existe pas.
         """
         # Récupère l'équipement à mettre à jour
-        amenity = self.amenity_repo.get(amenity_id)
+        amenity = self.amenity_repo.get_for_update(amenity_id)
         if not amenity:
             return None
 
         # Met à jour le nom et sauvegarde
         amenity.name = name
         amenity.save()  # Mettre à jour le timestamp updated_at
-        db.session.commit()
+        # Listes et fiches d'hébergements embarquent les amenities
+        self._invalidate('amenities')
+        self.amenity_repo.commit()
         return amenity
 
     def get_amenity(self, amenity_id):
@@ -240,6 +724,15 @@ class HBnBFacade:
         """
         return self.amenity_repo.get(amenity_id)
 
+    def get_users_by_ids(self, user_ids):
+        """Récupère plusieurs utilisateurs en une requête IN (...).
+
+        Returns:
+            tuple: (objets User trouvés dans l'ordre des IDs,
+                    IDs introuvables)
+        """
+        return self.user_repo.get_many(user_ids)
+
     def get_all_users(self):
         """Récupère tous les utilisateurs.
 
@@ -248,6 +741,40 @@ class HBnBFacade:
         """
         return self.user_repo.get_all()
 
+    def get_users_page(self, limit, cursor=None, fields=None):
+        """Récupère une page d'utilisateurs (pagination par curseur).
+
+        Args:
+            limit (int): Nombre maximum d'utilisateurs à retourner.
+            cursor (str): Curseur renvoyé par la page précédente.
+            fields (list): Champs demandés ; seules leurs colonnes sont
+                           chargées (jamais le mot de passe).
+
+        Returns:
+            tuple: (liste des objets User, curseur suivant ou None)
+        """
+        query = User.query.options(*loader_options(User, fields=fields))
+        return self.user_repo.get_page(limit, cursor, query)
+
+    def get_user_version(self, user_id):
+        """Version d'un utilisateur, pour les validateurs HTTP (ETag).
+
+        Args:
+            user_id (str): ID de l'utilisateur.
+
+        Returns:
+            tuple: Version (dates de modification), None s'il n'existe pas.
+        """
+        return self.user_repo.get_version(user_id)
+
+    def get_users_version(self):
+        """Version de la collection des utilisateurs (max(updated_at), nombre).
+
+        Returns:
+            tuple: Version de la collection.
+        """
+        return self.user_repo.get_version()
+
     def update_user(self, user_id, user_data):
         """Met à jour un utilisateur existant.
 
@@ -259,7 +786,7 @@ class HBnBFacade:
             User: L'objet utilisateur mis à jour ou None s'il n'existe pas.
         """
         # Vérifie que l'utilisateur existe
-        user = self.user_repo.get(user_id)
+        user = self.user_repo.get_for_update(user_id)
         if not user:
             return None
 
@@ -269,6 +796,8 @@ class HBnBFacade:
             # Supprimer le password du dict pour éviter de l'écraser
             user_data.pop('password')
 
+        # Les fiches d'hébergements et les avis embarquent l'utilisateur
+        self._invalidate('users')
         # Met à jour les autres champs et retourne l'objet mis à jour
         if user_data:  # S'il reste des champs à mettre à jour
             self.user_repo.update(user_id, user_data)
@@ -276,7 +805,13 @@ class HBnBFacade:
         return self.user_repo.get(user_id)
 
     def create_review(self, review_data):
-        """Crée un nouvel avis avec les foreign keys."""
+        """Crée un nouvel avis avec les foreign keys.
+
+        Raises:
+            ValueError: Si user_id ou place_id manquent, ou si l'utilisateur
+                        a déjà noté cet hébergement (index unique
+                        uq_reviews_user_id_place_id).
+        """
         # Extraire user_id et place_id depuis review_data
         user_id = review_data.get('user_id')
         place_id = review_data.get('place_id')
@@ -294,35 +829,208 @@ class HBnBFacade:
         review.user_id = user_id
         review.place_id = place_id
 
-        self.review_repo.add(review)
+        try:
+            # L'avis et les agrégats de l'hébergement dans un même commit
+            with self.transaction():
+                self._invalidate_place_reviews(place_id)
+                self.review_repo.add(review)
+                self.place_repo.adjust_rating_stats(place_id,
+                                                    {review.rating: 1})
+        except IntegrityError as e:
+            self._rollback()
+            # Deux soumissions simultanées ont passé la vérification
+            # has_reviewed_place : la contrainte unique tranche
+            if is_duplicate_review_error(e):
+                raise ValueError("You have already reviewed this place")
+            raise
         return review
 
-    def get_review(self, review_id):
+    def create_reviews_batch(self, reviews_data, user_id, chunk_size=500):
+        """Crée plusieurs avis d'un même auteur par lots transactionnels.
+
+        Les hébergements visés et les avis déjà existants de l'auteur sont
+        chargés en une requête chacun, quelle que soit la taille du lot.
+
+        Args:
+            reviews_data (list): Données des avis (text, rating, place_id).
+            user_id (str): ID de l'auteur de tous les avis.
+            chunk_size (int): Nombre d'avis par transaction.
+
+        Returns:
+            list: Un tuple (Review ou None, message d'erreur ou None) par
+                  élément, dans l'ordre de reviews_data.
+        """
+        place_ids = [review_data.get('place_id') for review_data in reviews_data]
+        places, _ = self.place_repo.get_many(
+            [place_id for place_id in place_ids if place_id])
+        places_by_id = {place.id: place for place in places}
+        reviewed = self.review_repo.get_reviewed_place_ids(
+            user_id, places_by_id.keys())
+
+        results = []
+        for review_data in reviews_data:
+            place = places_by_id.get(review_data.get('place_id'))
+            if not place:
+                results.append(
+                    (None, f"Place with ID {review_data.get('place_id')} not found"))
+                continue
+            if place.owner_id == user_id:
+                results.append((None, "You cannot review your own place"))
+                continue
+            if place.id in reviewed:
+                results.append((None, "You have already reviewed this place"))
+                continue
+            try:
+                review = Review(text=review_data.get('text'),
+                                rating=review_data.get('rating'))
+            except (TypeError, ValueError) as e:
+                results.append((None, str(e)))
+                continue
+            review.user_id = user_id
+            review.place_id = place.id
+            # Empêche aussi les doublons à l'intérieur du lot
+            reviewed.add(place.id)
+            results.append((review, None))
+
+        return self._insert_batch(self.review_repo, results, chunk_size,
+                                  self._add_rating_stats)
+
+    def _add_rating_stats(self, reviews):
+        """Répercute des avis créés sur les agrégats de leurs hébergements."""
+        changes_by_place = {}
+        for review in reviews:
+            changes = changes_by_place.setdefault(review.place_id, {})
+            changes[review.rating] = changes.get(review.rating, 0) + 1
+        for place_id, changes in changes_by_place.items():
+            self._invalidate_place_reviews(place_id)
+            self.place_repo.adjust_rating_stats(place_id, changes)
+
+    def _invalidate_place_reviews(self, place_id):
+        """Invalide les avis d'un hébergement et ses agrégats affichés."""
+        # Fiche et cartes portent review_count, average_rating...
+        self._invalidate(f'place-reviews:{place_id}', f'place:{place_id}',
+                         'places')
+
+    def repair_rating_stats(self):
+        """Recalcule les agrégats d'avis de tous les hébergements.
+
+        À lancer après un import SQL direct ou une mise à niveau du schéma ;
+        en temps normal les agrégats sont maintenus à chaque écriture.
+
+        Returns:
+            int: Nombre d'hébergements ayant au moins un avis.
+        """
+        self._invalidate('places')
+        return self.place_repo.recompute_rating_stats()
+
+    def get_review(self, review_id, profile=None):
         """Récupère un avis par son ID.
 
         Args:
             review_id (str): ID de l'avis à récupérer.
+            profile (str): Profil de chargement des relations.
 
         Returns:
             Review: L'objet avis ou None s'il n'existe pas.
         """
         if not review_id:
             return None
-        return self.review_repo.get(review_id)
+        return self.review_repo.get(review_id,
+                                    loader_options(Review, profile))
+
+    def get_reviews_by_ids(self, review_ids, profile='detail'):
+        """Récupère plusieurs avis (et leurs auteurs) en une requête.
+
+        Args:
+            review_ids (list): IDs des avis.
+            profile (str): Profil de chargement des relations.
+
+        Returns:
+            tuple: (objets Review trouvés dans l'ordre des IDs,
+                    IDs introuvables)
+        """
+        return self.review_repo.get_many(review_ids,
+                                         loader_options(Review, profile))
 
-    def get_all_reviews(self):
+    def get_all_reviews(self, profile=None):
         """Récupère tous les avis.
 
+        Args:
+            profile (str): Profil de chargement des relations.
+
         Returns:
             list: Liste de tous les objets Review.
         """
-        return self.review_repo.get_all()
+        return self.review_repo.get_all(loader_options(Review, profile))
+
+    def iter_reviews(self, batch_size=1000, profile='list_card'):
+        """Parcourt tous les avis par lots, sans les charger tous en mémoire.
+
+        Args:
+            batch_size (int): Nombre d'avis lus à la fois.
+            profile (str): Profil de chargement des relations.
+
+        Returns:
+            iterator: Objets Review triés par date de création.
+        """
+        return self.review_repo.iter_all(batch_size,
+                                         loader_options(Review, profile))
+
+    def get_reviews_page(self, limit, cursor=None, profile='list_card',
+                         fields=None):
+        """Récupère une page d'avis (pagination par curseur).
+
+        Args:
+            limit (int): Nombre maximum d'avis à retourner.
+            cursor (str): Curseur renvoyé par la page précédente.
+            profile (str): Profil de chargement des relations.
+            fields (list): Champs demandés ; seules leurs colonnes sont
+                           chargées (remplace profile).
+
+        Returns:
+            tuple: (liste des objets Review, curseur suivant ou None)
+        """
+        query = Review.query.options(
+            *loader_options(Review, profile, fields))
+        return self.review_repo.get_page(limit, cursor, query)
+
+    def get_review_version(self, review_id):
+        """Version d'un avis, pour les validateurs HTTP (ETag).
+
+        Args:
+            review_id (str): ID de l'avis.
+
+        Returns:
+            tuple: Version (dates de modification), None s'il n'existe pas.
+        """
+        return self.review_repo.get_version(review_id)
+
+    def get_reviews_version(self):
+        """Version de la collection des avis (max(updated_at), nombre).
+
+        Returns:
+            tuple: Version de la collection.
+        """
+        return self.review_repo.get_version()
+
+    def get_place_reviews_version(self, place_id):
+        """Version des avis d'un hébergement, pour les validateurs HTTP.
+
+        Args:
+            place_id (str): ID de l'hébergement.
+
+        Returns:
+            tuple: Version (dates de modification, nombre d'avis), None si
+                   l'hébergement n'existe pas.
+        """
+        return self.review_repo.get_place_version(place_id)
 
-    def get_reviews_by_place(self, place_id):
+    def get_reviews_by_place(self, place_id, profile=None):
         """Récupère tous les avis pour un hébergement spécifique.
 
         Args:
             place_id (str): ID de l'hébergement dont on veut récupérer les avis.
+            profile (str): Profil de chargement des relations.
 
         Returns:
             list: Liste des avis pour l'hébergement spécifié.
@@ -331,15 +1039,49 @@ class HBnBFacade:
         if not place_id:
             return []
 
-        # On récupère toutes les reviews
-        all_reviews = self.review_repo.get_all()
+        # Filtré en SQL sur reviews.place_id (indexé), plus de scan en Python
+        return self.review_repo.get_by_place(
+            place_id, loader_options(Review, profile))
+
+    def get_reviews_by_place_page(self, place_id, limit, cursor=None,
+                                  sort='created_at', order='asc',
+                                  profile='list_card'):
+        """Récupère une page des avis d'un hébergement.
+
+        Args:
+            place_id (str): ID de l'hébergement.
+            limit (int): Nombre maximum d'avis à retourner.
+            cursor (str): Curseur renvoyé par la page précédente.
+            sort (str): Critère de tri, 'created_at' ou 'rating'.
+            order (str): Sens du tri, 'asc' ou 'desc'.
+            profile (str): Profil de chargement des relations.
+
+        Returns:
+            tuple: (liste des objets Review, curseur suivant ou None)
 
-        # On filtre les reviews et on garde que celles du lieu spécifié
-        place_reviews = []
-        for review in all_reviews:
-            if review.place and review.place.id == place_id:
-                place_reviews.append(review)
-        return place_reviews
+        Raises:
+            ValueError: Si le tri ou le curseur sont invalides.
+        """
+        if sort not in ('created_at', 'rating'):
+            raise ValueError("sort must be 'created_at' or 'rating'")
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        return self.review_repo.get_page_by_place(
+            place_id, limit, cursor, sort, order == 'desc',
+            loader_options(Review, profile))
+
+    def has_reviewed_place(self, user_id, place_id):
+        """Indique si un utilisateur a déjà noté un hébergement.
+
+        Args:
+            user_id (str): ID de l'utilisateur.
+            place_id (str): ID de l'hébergement.
+
+        Returns:
+            bool: True si un avis de cet utilisateur existe déjà.
+        """
+        return place_id in self.review_repo.get_reviewed_place_ids(
+            user_id, [place_id])
 
     def update_review(self, review_id, review_data):
         """Met à jour un avis existant.
@@ -352,11 +1094,12 @@ class HBnBFacade:
             Review: L'objet avis mis à jour ou None s'il n'existe pas.
         """
         # On récupère la review existante
-        review = self.review_repo.get(review_id)
+        review = self.review_repo.get_for_update(review_id)
 
         # On vérifie si elle existe
         if not review:
             return None
+        old_rating = review.rating
 
         # Validation de la note si présente
         if 'rating' in review_data:
@@ -378,8 +1121,13 @@ class HBnBFacade:
         if 'rating' in review_data:
             review.rating = review_data['rating']
 
-        # Sauvegarde des modifications
-        db.session.commit()
+        # Sauvegarde des modifications et des agrégats en un seul commit
+        changes = {}
+        if review.rating != old_rating:
+            changes = {old_rating: -1, review.rating: 1}
+        with self.transaction():
+            self._invalidate_place_reviews(review.place_id)
+            self.place_repo.adjust_rating_stats(review.place_id, changes)
         return review
 
     def delete_review(self, review_id):
@@ -392,12 +1140,16 @@ class HBnBFacade:
             bool: True si l'avis a été supprimé, False sinon.
         """
         # On vérifie si la review existe
-        review = self.review_repo.get(review_id)
+        review = self.review_repo.get_for_update(review_id)
         if not review:
             return False
 
-        # On supprime la review du repository
-        self.review_repo.delete(review_id)
+        # On supprime la review et on la retire des agrégats
+        place_id, rating = review.place_id, review.rating
+        with self.transaction():
+            self._invalidate_place_reviews(place_id)
+            self.review_repo.delete(review_id)
+            self.place_repo.adjust_rating_stats(place_id, {rating: -1})
 
         # Return True pour indiquer que la suppression a réussi
         return True
\ No newline at end of file
@@ -0,0 +1,176 @@
+#!/usr/bin/python3
+"""Profils de chargement des relations, choisis par la façade.
+
+Chaque profil fixe à l'avance les relations chargées avec l'objet, si bien
+qu'un endpoint exécute un nombre de requêtes constant quelle que soit la
+taille du résultat (plus de N+1 par chargement paresseux) :
+
+- ``minimal`` : aucune relation ; tout accès à une relation lève une
+  erreur au lieu d'émettre une requête (vérifications d'existence,
+  contrôles de droits via les clés étrangères).
+- ``list_card`` : ce qu'affiche une ligne de liste. Les relations servies
+  par une clé étrangère (owner_id, place_id) ne sont pas chargées ; les
+  autres le sont en une requête pour toute la page, le reste est interdit.
+- ``detail`` : tout ce qu'affiche la fiche d'un objet. Pas de raiseload :
+  la fiche est un objet unique, souvent suivi d'une modification.
+
+Un jeu de champs (``?fields=id,title,price``) remplace le profil : seules
+les colonnes et relations nécessaires à ces champs sont chargées
+(load_only), tout autre accès lève une erreur au lieu d'une requête.
+"""
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+PROFILES = ('minimal', 'list_card', 'detail')
+
+# Relations incluables dans la fiche d'un hébergement (?include=)
+PLACE_INCLUDES = ('owner', 'amenities', 'reviews')
+
+# Champs exposés par les listes -> colonnes du modèle dont ils dépendent
+FIELDSETS = {
+    Place: {
+        'id': (), 'title': ('title',), 'description': ('description',),
+        'price': ('price',), 'latitude': ('latitude',),
+        'longitude': ('longitude',), 'owner_id': ('owner_id',),
+        'amenities': (), 'images': ('images',),
+        'review_count': ('review_count',),
+        'average_rating': ('review_count', 'rating_sum'),
+        'rating_histogram': tuple(f'rating_{star}' for star in range(1, 6)),
+    },
+    Review: {
+        'id': (), 'text': ('text',), 'rating': ('rating',),
+        'user_id': ('user_id',), 'place_id': ('place_id',),
+        'created_at': ('created_at',), 'updated_at': ('updated_at',),
+        'first_name': ('user_id',), 'last_name': ('user_id',),
+    },
+    User: {
+        'id': (), 'first_name': ('first_name',), 'last_name': ('last_name',),
+        'email': ('email',),
+    },
+    Amenity: {'id': (), 'name': ('name',)},
+}
+
+# Champs servis par une relation : (nom de la relation, colonnes chargées)
+_RELATED_FIELDS = {
+    (Place, 'amenities'): ('amenities', ('name',)),
+    (Review, 'first_name'): ('user', ('first_name', 'last_name')),
+    (Review, 'last_name'): ('user', ('first_name', 'last_name')),
+}
+
+
+def _profile_options(model, profile):
+    # Construites à l'appel : les backrefs (Place.owner, Review.user...)
+    # n'existent qu'une fois les mappers configurés
+    if profile == 'minimal':
+        return (raiseload('*'),)
+    if model is Place:
+        if profile == 'list_card':
+            return (selectinload(Place.amenities), raiseload('*'))
+        return (joinedload(Place.owner), selectinload(Place.amenities))
+    if model is Review:
+        if profile == 'list_card':
+            return (joinedload(Review.user), raiseload('*'))
+        # L'hébergement n'est affiché que par son ID (place_id)
+        return (joinedload(Review.user),)
+    if model in (User, Amenity) and profile == 'list_card':
+        return (raiseload('*'),)
+    return ()
+
+
+def fieldset_options(model, fields, order_by='created_at'):
+    """Options de chargement limitées aux colonnes d'un jeu de champs.
+
+    Args:
+        model: Classe du modèle chargé.
+        fields (iterable): Champs demandés (clés de FIELDSETS[model]).
+        order_by (str): Colonne de tri de la pagination, toujours chargée
+                        avec l'id pour calculer le curseur.
+
+    Returns:
+        tuple: Options à passer à Query.options().
+
+    Raises:
+        ValueError: Si un champ est inconnu pour ce modèle.
+    """
+    fieldset = FIELDSETS[model]
+    columns, related = {'id', order_by}, {}
+    for field in fields:
+        if field not in fieldset:
+            raise ValueError(f"Unknown field '{field}'; expected one of: "
+                             f"{', '.join(fieldset)}")
+        columns.update(fieldset[field])
+        if (model, field) in _RELATED_FIELDS:
+            name, related_columns = _RELATED_FIELDS[(model, field)]
+            related[name] = related_columns
+
+    options = [load_only(*(getattr(model, column) for column in columns),
+                         raiseload=True)]
+    for name, related_columns in related.items():
+        attribute = getattr(model, name)
+        target = attribute.property.mapper.class_
+        # Collection : une requête IN pour la page ; objet : une jointure
+        loader = selectinload if attribute.property.uselist else joinedload
+        options.append(loader(attribute).load_only(
+            *(getattr(target, column) for column in related_columns),
+            raiseload=True))
+    options.append(raiseload('*'))
+    return tuple(options)
+
+
+def place_include_options(include):
+    """Options de chargement d'une fiche d'hébergement avec ses inclusions.
+
+    Le propriétaire est joint à la requête de l'hébergement et les
+    amenities chargées en une requête IN ; les avis, paginés, sont lus
+    à part (voir HBnBFacade.get_place_with_includes). Toute autre relation
+    est interdite.
+
+    Args:
+        include (iterable): Relations demandées (valeurs de PLACE_INCLUDES).
+
+    Returns:
+        tuple: Options à passer à Session.get().
+
+    Raises:
+        ValueError: Si une relation est inconnue.
+    """
+    for name in include:
+        if name not in PLACE_INCLUDES:
+            raise ValueError(f"Unknown include '{name}'; expected one of: "
+                             f"{', '.join(PLACE_INCLUDES)}")
+    options = []
+    if 'owner' in include:
+        options.append(joinedload(Place.owner))
+    if 'amenities' in include:
+        options.append(selectinload(Place.amenities))
+    options.append(raiseload('*'))
+    return tuple(options)
+
+
+def loader_options(model, profile=None, fields=None, order_by='created_at'):
+    """Retourne les options de chargement d'un profil pour un modèle.
+
+    Args:
+        model: Classe du modèle chargé (Place, Review, User, Amenity).
+        profile (str): 'minimal', 'list_card', 'detail' ou None (chargement
+                       paresseux par défaut des relations).
+        fields (iterable): Jeu de champs demandé ; s'il est donné, il
+                           remplace le profil (voir fieldset_options).
+        order_by (str): Colonne de tri, chargée avec un jeu de champs.
+
+    Returns:
+        tuple: Options à passer à Query.options() ou Session.get().
+
+    Raises:
+        ValueError: Si le profil ou un champ est inconnu.
+    """
+    if fields is not None:
+        return fieldset_options(model, fields, order_by)
+    if profile is None:
+        return ()
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown loader profile '{profile}'")
+    return _profile_options(model, profile)
@@ -0,0 +1,4 @@
+from app.asgi import create_asgi_app
+
+# Point d'entrée ASGI : uvicorn asgi:app (ou hypercorn asgi:app)
+app = create_asgi_app()
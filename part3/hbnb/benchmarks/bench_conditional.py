@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""Benchmark : GET complet (200) vs revalidation conditionnelle (304).
+
+Génère un jeu synthétique (par défaut 20 000 hébergements avec
+propriétaire, amenities et un avis chacun) dans une base fichier
+temporaire, puis mesure via le client de test Flask le temps d'une
+réponse complète et d'une réponse 304 (If-None-Match avec l'ETag reçu)
+sur une grande liste et sur la fiche d'un hébergement avec ses relations.
+
+Usage (depuis part3/hbnb) :
+    python -m benchmarks.bench_conditional [--places 20000] [--limit 500]
+"""
+import argparse
+import os
+import tempfile
+from benchmarks.bench_json_encoding import add_reviews, best_time
+from benchmarks.bench_place_search import _make_config, populate
+from app import create_app
+from app.models import db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'conditional.db')
+    config = type('ConditionalBenchConfig', (_make_config(db_path),), {
+        'PAGINATION_MAX_LIMIT': max(args.limit, 500)})
+    app = create_app(config)
+    with app.app_context():
+        populate(args.places, 50)
+        place_ids = [row.id for row in db.session.execute(
+            db.text('SELECT id FROM places'))]
+        add_reviews(place_ids, args.users)
+        client = app.test_client()
+        urls = [f'/api/v1/places/?limit={args.limit}',
+                f'/api/v1/reviews/?limit={args.limit}',
+                f'/api/v1/places/{place_ids[0]}'
+                '?include=owner,amenities,reviews']
+        print(f"{args.places} places, best of {args.repeat}")
+        for url in urls:
+            etag = client.get(url).headers['ETag']
+            full = best_time(lambda: client.get(url).data, args.repeat)
+            revalidated = best_time(lambda: client.get(
+                url, headers={'If-None-Match': etag}).data, args.repeat)
+            print(f"  {url[:40]:40} 200={full * 1000:8.2f}ms  "
+                  f"304={revalidated * 1000:6.2f}ms")
+        db.session.remove()
+        db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
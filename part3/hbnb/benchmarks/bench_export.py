@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""Benchmark : mémoire d'un export complet, liste en mémoire vs streaming.
+
+Pour des tables d'avis de tailles croissantes (par défaut 10 000, 40 000
+et 160 000 avis, un par hébergement), mesure le pic de mémoire Python
+(tracemalloc) et la durée d'un dump JSON de tous les avis :
+
+- list   : get_all_reviews() puis une liste de dicts encodée d'un bloc,
+  comme un GET non paginé ;
+- stream : le corps de GET /reviews/export, lu lot par lot (yield_per)
+  et encodé au fil de l'eau.
+
+Usage (depuis part3/hbnb) :
+    python -m benchmarks.bench_export [--sizes 10000 40000 160000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from benchmarks.bench_json_encoding import add_reviews
+from benchmarks.bench_place_search import _make_config, populate
+from app import create_app
+from app.api.v1.export import export_response
+from app.api.v1.reviews import review_details
+from app.models import db
+from app.services import facade
+
+
+def dump_list(encoder):
+    """Dump en mémoire : tous les objets, tous les dicts, un seul corps."""
+    reviews = facade.get_all_reviews('list_card')
+    return len(encoder.dumps([review_details(review) for review in reviews]))
+
+
+def dump_stream(encoder):
+    """Dump streamé : consomme le corps de l'export sans le conserver."""
+    response = export_response(facade.iter_reviews, review_details)
+    return sum(len(chunk) for chunk in response.response)
+
+
+def measure(function, encoder):
+    """Retourne (octets produits, pic mémoire en Mio, durée en s)."""
+    db.session.expunge_all()
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = function(encoder)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size, peak / 2 ** 20, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10000, 40000, 160000])
+    parser.add_argument('--users', type=int, default=2000)
+    args = parser.parse_args()
+
+    for count in args.sizes:
+        db_path = os.path.join(tempfile.mkdtemp(), 'export.db')
+        app = create_app(_make_config(db_path))
+        with app.test_request_context():
+            populate(count, 50)
+            add_reviews([row.id for row in db.session.execute(
+                db.text('SELECT id FROM places'))], args.users)
+            encoder = app.extensions['json_encoder']
+            print(f"{count} reviews")
+            for name, function in (('list', dump_list),
+                                   ('stream', dump_stream)):
+                size, peak, elapsed = measure(function, encoder)
+                print(f"  {name:6} {size / 2 ** 20:7.1f} MiB body  "
+                      f"peak={peak:7.1f} MiB  time={elapsed * 1000:8.1f}ms")
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""Benchmark : débit d'encodage JSON des grandes listes de l'API.
+
+Génère un jeu synthétique (par défaut 20 000 hébergements avec
+propriétaire, amenities et avis) dans une base fichier temporaire, puis
+pour chaque encodeur disponible (json standard, orjson) et chaque grande
+liste (GET /places/, /reviews/, /users/ avec ?limit=) mesure :
+
+- encode : le seul encodage de la page sérialisée en dicts, dates comprises
+  (Mio/s) ;
+- request : la requête complète via le client de test Flask (ms).
+
+Usage (depuis part3/hbnb) :
+    python -m benchmarks.bench_json_encoding [--places 20000]
+                                             [--limit 500] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from benchmarks.bench_place_search import _make_config, populate
+from app import create_app
+from app.api.encoders import orjson
+from app.api.v1.places import place_card
+from app.api.v1.reviews import review_details
+from app.api.v1.users import user_details
+from app.models import db
+from app.models.review import Review
+from app.models.user import User
+from app.services import facade
+
+# Endpoint -> page de la façade et sérialisation de chaque élément
+ENDPOINTS = {
+    '/api/v1/places/': (facade.get_places_page, place_card),
+    '/api/v1/reviews/': (facade.get_reviews_page, review_details),
+    '/api/v1/users/': (facade.get_users_page, user_details),
+}
+
+
+def add_reviews(place_ids, users):
+    """Ajoute des auteurs et un avis par hébergement, en SQL direct."""
+    now = datetime.utcnow()
+    user_ids = [str(uuid.uuid4()) for _ in range(users)]
+    db.session.execute(User.__table__.insert(), [
+        {'id': user_id, 'created_at': now, 'updated_at': now,
+         'first_name': f'Guest {i}', 'last_name': 'Bench',
+         'email': f'guest{i}@example.com', 'password': 'x',
+         'is_admin': False}
+        for i, user_id in enumerate(user_ids)])
+    db.session.execute(Review.__table__.insert(), [
+        {'id': str(uuid.uuid4()), 'created_at': now, 'updated_at': now,
+         'text': 'A lovely stay, would come back ' * 3,
+         'rating': random.randint(1, 5), 'user_id': random.choice(user_ids),
+         'place_id': place_id}
+        for place_id in place_ids])
+    db.session.commit()
+
+
+def best_time(function, repeat):
+    """Meilleur temps (en secondes) de function() sur repeat essais."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'json.db')
+    encoders = ['json'] + (['orjson'] if orjson is not None else [])
+    for name in encoders:
+        config = type('JsonBenchConfig', (_make_config(db_path),), {
+            'JSON_ENCODER': name,
+            'PAGINATION_MAX_LIMIT': max(args.limit, 500)})
+        app = create_app(config)
+        with app.app_context():
+            if name == encoders[0]:
+                populate(args.places, 50)
+                add_reviews([row.id for row in db.session.execute(
+                    db.text('SELECT id FROM places'))], args.users)
+            encoder = app.extensions['json_encoder']
+            client = app.test_client()
+            print(f"encoder={encoder.name}")
+            for endpoint, (get_page, to_dict) in ENDPOINTS.items():
+                url = f'{endpoint}?limit={args.limit}'
+                objs, _ = get_page(args.limit)
+                items = [to_dict(obj) for obj in objs]
+                size = len(encoder.dumps(items))
+                encode = best_time(lambda: encoder.dumps(items), args.repeat)
+                request = best_time(lambda: client.get(url).data,
+                                    args.repeat)
+                print(f"  {endpoint:18} {len(items):5} items "
+                      f"{size / 1024:8.1f} KiB  "
+                      f"encode={size / encode / 2 ** 20:7.1f} MiB/s  "
+                      f"request={request * 1000:7.1f}ms")
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""Benchmark : latence de la recherche d'hébergements (GET /places/search).
+
+Génère un jeu synthétique (par défaut 1 million d'hébergements, chacun
+avec quelques amenities) directement en SQL dans une base fichier
+temporaire, puis exécute des recherches aléatoires (prix, amenities,
+zone, tri) via facade.search_places et affiche les percentiles p50/p99
+de la première page.
+
+Usage (depuis part3/hbnb) :
+    python -m benchmarks.bench_place_search [--places 1000000]
+                                            [--amenities 50]
+                                            [--queries 500] [--limit 20]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from app import create_app
+from app.models import db
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.user import User
+from app.services import facade
+from config import ProductionConfig
+
+
+def _make_config(db_path):
+    """Crée une configuration de production pointant sur db_path."""
+    return type('SearchBenchConfig', (ProductionConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+    })
+
+
+def populate(places, amenities, chunk=20000):
+    """Insère le jeu synthétique par lots (executemany, sans ORM).
+
+    Returns:
+        list: IDs des amenities créées.
+    """
+    owner_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+    db.session.execute(User.__table__.insert(), [{
+        'id': owner_id, 'created_at': now, 'updated_at': now,
+        'first_name': 'Bench', 'last_name': 'Owner',
+        'email': 'bench@example.com', 'password': 'x', 'is_admin': False}])
+    amenity_ids = [str(uuid.uuid4()) for _ in range(amenities)]
+    db.session.execute(Amenity.__table__.insert(), [
+        {'id': amenity_id, 'created_at': now, 'updated_at': now,
+         'name': f'amenity {i}'}
+        for i, amenity_id in enumerate(amenity_ids)])
+
+    start = now - timedelta(days=365)
+    for offset in range(0, places, chunk):
+        rows, links = [], []
+        for i in range(offset, min(offset + chunk, places)):
+            place_id = str(uuid.uuid4())
+            created_at = start + timedelta(seconds=i)
+            rows.append({
+                'id': place_id, 'created_at': created_at,
+                'updated_at': created_at, 'title': f'Place {i}',
+                'price': round(random.uniform(20, 1000), 2),
+                'latitude': random.uniform(-60, 70),
+                'longitude': random.uniform(-180, 180),
+                'owner_id': owner_id,
+                'review_count': random.randint(0, 200)})
+            links += [{'place_id': place_id, 'amenity_id': amenity_id}
+                      for amenity_id in random.sample(amenity_ids, 4)]
+        db.session.execute(Place.__table__.insert(), rows)
+        db.session.execute(place_amenity.insert(), links)
+        db.session.commit()
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+    return amenity_ids
+
+
+def random_search(amenity_ids):
+    """Tire au hasard une combinaison de filtres de recherche."""
+    kwargs = {'sort': random.choice(['created_at', 'price', 'review_count']),
+              'order': random.choice(['asc', 'desc'])}
+    if random.random() < 0.7:
+        low = random.uniform(20, 900)
+        kwargs['min_price'] = low
+        kwargs['max_price'] = low + random.uniform(20, 200)
+    if random.random() < 0.5:
+        kwargs['amenity_ids'] = random.sample(amenity_ids,
+                                              random.randint(1, 2))
+    if random.random() < 0.5:
+        lat = random.uniform(-60, 60)
+        lng = random.uniform(-180, 170)
+        kwargs['bbox'] = (lat, lng, lat + 10, lng + 10)
+    return kwargs
+
+
+def percentile(values, ratio):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=1000000)
+    parser.add_argument('--amenities', type=int, default=50)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'search.db')
+    app = create_app(_make_config(db_path))
+    with app.app_context():
+        started = time.perf_counter()
+        amenity_ids = populate(args.places, args.amenities)
+        print(f"populated {args.places} places in "
+              f"{time.perf_counter() - started:.1f}s ({db_path})")
+
+        timings = []
+        for _ in range(args.queries):
+            kwargs = random_search(amenity_ids)
+            started = time.perf_counter()
+            facade.search_places(args.limit, **kwargs)
+            timings.append((time.perf_counter() - started) * 1000)
+            db.session.remove()
+        db.engine.dispose()
+
+    print(f"{args.queries} searches  p50={percentile(timings, 0.50):.1f}ms  "
+          f"p99={percentile(timings, 0.99):.1f}ms  "
+          f"max={max(timings):.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
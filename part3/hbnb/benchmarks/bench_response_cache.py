@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""Benchmark : réponse calculée (miss) vs réponse du cache (hit).
+
+Génère un jeu synthétique (par défaut 20 000 hébergements avec
+propriétaire, amenities et un avis chacun) dans une base fichier
+temporaire, active le cache de réponses en mémoire, puis mesure via le
+client de test Flask le temps d'une réponse recalculée (le cache est
+invalidé avant chaque essai, comme après une écriture) et d'un hit, sur
+les routes publiques mises en cache.
+
+Usage (depuis part3/hbnb) :
+    python -m benchmarks.bench_response_cache [--places 20000] [--limit 500]
+"""
+import argparse
+import os
+import tempfile
+from benchmarks.bench_json_encoding import add_reviews, best_time
+from benchmarks.bench_place_search import _make_config, populate
+from app import create_app
+from app.models import db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'response_cache.db')
+    config = type('ResponseCacheBenchConfig', (_make_config(db_path),), {
+        'PAGINATION_MAX_LIMIT': max(args.limit, 500),
+        'RESPONSE_CACHE_BACKEND': 'memory',
+        'RESPONSE_CACHE_MAX_BODY': 64 * 1024 * 1024})
+    app = create_app(config)
+    with app.app_context():
+        populate(args.places, 50)
+        place_ids = [row.id for row in db.session.execute(
+            db.text('SELECT id FROM places'))]
+        add_reviews(place_ids, args.users)
+        cache = app.extensions['response_cache']
+        client = app.test_client()
+        tags = ['places', 'amenities', 'users', f'place:{place_ids[0]}',
+                f'place-reviews:{place_ids[0]}']
+
+        def miss(url):
+            cache.invalidate(tags)
+            return client.get(url).data
+
+        urls = [f'/api/v1/places/?limit={args.limit}',
+                f'/api/v1/amenities/?limit={args.limit}',
+                f'/api/v1/places/{place_ids[0]}',
+                f'/api/v1/reviews/places/{place_ids[0]}/reviews']
+        print(f"{args.places} places, best of {args.repeat}")
+        for url in urls:
+            computed = best_time(lambda: miss(url), args.repeat)
+            client.get(url)
+            hit = best_time(lambda: client.get(url).data, args.repeat)
+            print(f"  {url[:40]:40} miss={computed * 1000:8.2f}ms  "
+                  f"hit={hit * 1000:6.2f}ms")
+        print(f"  {cache.stats()}")
+        db.session.remove()
+        db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""Benchmark : sérialiseurs précompilés vs dicts construits à la main.
+
+Charge un jeu synthétique d'hébergements (par défaut 100 000, chacun avec
+son propriétaire et quatre amenities) depuis une base fichier temporaire,
+puis mesure la seule sérialisation de tous les objets, sans requête SQL :
+
+- card    : ancienne place_card (dict littéral + if) vs vue 'card'
+- detail  : ancienne fiche de PlaceResource.get vs vue 'detail'
+- to_dict : ancien BaseModel.to_dict (boucle sur __dict__) vs vue 'columns'
+
+Usage (depuis part3/hbnb) :
+    python -m benchmarks.bench_serializers [--places 100000] [--repeat 5]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+from benchmarks.bench_place_search import _make_config, populate
+from app import create_app
+from app.models import db
+from app.models.place import Place
+from app.serializers import serializer
+from app.services.loaders import loader_options
+
+
+def legacy_rating_stats(place):
+    return {"review_count": place.review_count,
+            "average_rating": place.average_rating,
+            "rating_histogram": place.rating_histogram}
+
+
+def legacy_place_card(place):
+    """place_card avant le registre de sérialiseurs."""
+    result = {"id": place.id,
+              "title": place.title,
+              "description": place.description,
+              "price": place.price,
+              "latitude": place.latitude,
+              "longitude": place.longitude,
+              "owner_id": place.owner_id}
+    if place.amenities:
+        result["amenities"] = [{"id": amenity.id, "name": amenity.name}
+                               for amenity in place.amenities]
+    result["images"] = place.images
+    result.update(legacy_rating_stats(place))
+    return result
+
+
+def legacy_place_details(place):
+    """Fiche de PlaceResource.get avant le registre de sérialiseurs."""
+    owner_details = {
+        "id": place.owner.id,
+        "first_name": place.owner.first_name,
+        "last_name": place.owner.last_name,
+        "email": place.owner.email
+    }
+    if place.amenities:
+        amenities_list = [{"id": amenity.id, "name": amenity.name}
+                          for amenity in place.amenities]
+        return {"id": place.id, "title": place.title,
+                "description": place.description, "price": place.price,
+                "latitude": place.latitude, "longitude": place.longitude,
+                "owner": owner_details, "amenities": amenities_list,
+                "images": place.images, **legacy_rating_stats(place)}
+    return {"id": place.id, "title": place.title,
+            "description": place.description, "price": place.price,
+            "latitude": place.latitude, "longitude": place.longitude,
+            "owner": owner_details, "images": place.images,
+            **legacy_rating_stats(place)}
+
+
+def legacy_to_dict(obj):
+    """BaseModel.to_dict avant le registre de sérialiseurs."""
+    result = {}
+    for key, value in obj.__dict__.items():
+        if isinstance(value, datetime):
+            result[key] = value.isoformat()
+        else:
+            result[key] = value
+    result['__class__'] = obj.__class__.__name__
+    return result
+
+
+def best_time(function, objs, repeat):
+    """Meilleur temps (en secondes) de sérialisation de tous les objets."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for obj in objs:
+            function(obj)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=100000)
+    parser.add_argument('--amenities', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'serializers.db')
+    app = create_app(_make_config(db_path))
+    with app.app_context():
+        populate(args.places, args.amenities)
+        places = Place.query.options(
+            *loader_options(Place, 'detail')).all()
+        # Les relations sont chargées : seule la sérialisation est mesurée
+        cases = [
+            ('card', legacy_place_card, serializer(Place, 'card')),
+            ('detail', legacy_place_details, serializer(Place, 'detail')),
+            ('to_dict', legacy_to_dict, serializer(Place, 'columns')),
+        ]
+        print(f"{len(places)} places, best of {args.repeat}")
+        for name, legacy, compiled in cases:
+            before = best_time(legacy, places, args.repeat)
+            after = best_time(compiled, places, args.repeat)
+            print(f"{name:8} legacy={before * 1000:8.1f}ms  "
+                  f"compiled={after * 1000:8.1f}ms  "
+                  f"({before / after:.2f}x)")
+        db.session.remove()
+        db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
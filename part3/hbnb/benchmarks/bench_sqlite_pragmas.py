@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""Benchmark : défauts SQLite vs profil ProductionConfig (WAL, mmap...).
+
+Lance des threads écrivains (un commit par création d'amenity) et des
+threads lecteurs (get_amenity sur des IDs existants) en parallèle, via la
+façade, sur une base fichier temporaire, puis affiche le débit et le
+nombre d'erreurs "database is locked" pour chaque profil.
+
+Usage (depuis part3/hbnb) :
+    python -m benchmarks.bench_sqlite_pragmas [--seconds 5] [--writers 4]
+                                              [--readers 8]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from sqlalchemy.exc import OperationalError
+from app import create_app
+from app.models import db
+from app.services import facade
+from config import Config, ProductionConfig
+
+
+def _make_config(name, base, db_path):
+    """Crée une classe de configuration pointant sur db_path."""
+    return type(name, (base,), {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+    })
+
+
+def _worker(app, stop, counters, key, action):
+    with app.app_context():
+        while not stop.is_set():
+            try:
+                action()
+                counters[key] += 1
+            except OperationalError:
+                counters['locked'] += 1
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+
+def run_profile(name, base, seconds, writers, readers, seed_rows=1000):
+    """Mesure le débit lecture/écriture d'un profil de configuration.
+
+    Returns:
+        dict: Opérations par seconde et nombre d'erreurs de verrouillage.
+    """
+    db_path = os.path.join(tempfile.mkdtemp(), f'{name}.db')
+    app = create_app(_make_config(name, base, db_path))
+    with app.app_context():
+        ids = [obj.id for obj, _ in
+               facade.create_amenities_batch([f'seed {i}' for i in
+                                              range(seed_rows)], 500)]
+        db.session.remove()
+
+    counters = {'writes': 0, 'reads': 0, 'locked': 0}
+    stop = threading.Event()
+    threads = [threading.Thread(
+        target=_worker, args=(app, stop, counters, 'writes',
+                              lambda: facade.create_amenity('bench')))
+        for _ in range(writers)]
+    threads += [threading.Thread(
+        target=_worker, args=(app, stop, counters, 'reads',
+                              lambda: facade.get_amenity(random.choice(ids))))
+        for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    with app.app_context():
+        db.engine.dispose()
+    return {'writes/s': counters['writes'] / seconds,
+            'reads/s': counters['reads'] / seconds,
+            'locked': counters['locked']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    args = parser.parse_args()
+
+    for name, base in (('defaults', Config), ('production', ProductionConfig)):
+        result = run_profile(name, base, args.seconds, args.writers,
+                             args.readers)
+        print(f"{name:<12} writes/s={result['writes/s']:>9.1f}  "
+              f"reads/s={result['reads/s']:>9.1f}  "
+              f"locked={result['locked']}")
+
+
+if __name__ == '__main__':
+    main()
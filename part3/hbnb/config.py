@@ -6,6 +6,46 @@ class Config:
     JWT_SECRET_KEY = SECRET_KEY 
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', '3600'))
     DEBUG = False
+    # Pagination des listes : taille par défaut et plafond de ?limit=
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv('PAGINATION_DEFAULT_LIMIT', '50'))
+    PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', '500'))
+    # Imports en masse : taille maximale d'un lot et éléments par transaction
+    BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '10000'))
+    BATCH_CHUNK_SIZE = int(os.getenv('BATCH_CHUNK_SIZE', '500'))
+    # Lecture groupée par IDs (?ids= ou POST /lookup) : IDs par requête
+    LOOKUP_MAX_IDS = int(os.getenv('LOOKUP_MAX_IDS', '1000'))
+    # Encodeur JSON des réponses ('auto' = orjson s'il est installé) ;
+    # listes d'au moins JSON_STREAM_MIN_ITEMS éléments envoyées par tranches
+    # (0 = jamais)
+    JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto')
+    JSON_STREAM_MIN_ITEMS = int(os.getenv('JSON_STREAM_MIN_ITEMS', '1000'))
+    JSON_STREAM_CHUNK_ITEMS = int(os.getenv('JSON_STREAM_CHUNK_ITEMS', '500'))
+    # Exports complets (/places/export, /reviews/export) : lignes lues et
+    # encodées par lot
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '1000'))
+    # Cache de lecture des repositories (0 = désactivé), TTL en secondes
+    REPOSITORY_CACHE_SIZE = int(os.getenv('REPOSITORY_CACHE_SIZE', '0'))
+    REPOSITORY_CACHE_TTL = float(os.getenv('REPOSITORY_CACHE_TTL', '60'))
+    # Cache des réponses des lectures publiques ('' = désactivé, 'memory'
+    # = par processus, 'redis' = partagé entre workers) : nombre de
+    # réponses gardées en mémoire, TTL en secondes, URL Redis et taille
+    # maximale d'un corps gardé en octets
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', '')
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '1024'))
+    RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '300'))
+    RESPONSE_CACHE_REDIS_URL = os.getenv('RESPONSE_CACHE_REDIS_URL',
+                                         'redis://localhost:6379/0')
+    RESPONSE_CACHE_MAX_BODY = int(os.getenv('RESPONSE_CACHE_MAX_BODY',
+                                            str(1024 * 1024)))
+    # PRAGMA SQLite rejoués à chaque connexion du pool (vide = défauts SQLite)
+    SQLITE_PRAGMAS = {}
+    # Réplicas en lecture seule (URIs séparées par des virgules) et durée
+    # pendant laquelle un client qui vient d'écrire lit sur le primaire
+    SQLALCHEMY_REPLICA_URIS = [
+        uri for uri in os.getenv('SQLALCHEMY_REPLICA_URIS', '').split(',')
+        if uri]
+    REPLICA_READ_YOUR_WRITES_SECONDS = float(
+        os.getenv('REPLICA_READ_YOUR_WRITES_SECONDS', '5'))
 
 
 class DevelopmentConfig(Config):
@@ -13,7 +53,42 @@ class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+
+class ProductionConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL',
+                                        'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # WAL : les lectures ne bloquent plus les écritures (et inversement) ;
+    # synchronous=NORMAL est sûr en WAL et évite un fsync par commit ;
+    # busy_timeout fait attendre un écrivain au lieu de lever
+    # "database is locked"
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
+        # Valeur négative = taille en KiB (ici 64 Mo de cache de pages)
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', '-65536')),
+        'temp_store': 'MEMORY',
+    }
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '10')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '20')),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '3600')),
+        'pool_pre_ping': True,
+    }
+
+
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
@@ -1,8 +1,10 @@
+import os
 from app import create_app
 from flask_cors import CORS
 
-app = create_app()
-CORS(app)
+# HBNB_CONFIG=config.ProductionConfig pour le profil SQLite de production
+app = create_app(os.getenv('HBNB_CONFIG', 'config.DevelopmentConfig'))
+CORS(app, expose_headers=['X-Next-Cursor'])
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,120 @@
+from app import create_app
+from app.models import db
+from app.services import facade
+from contextlib import ExitStack
+from unittest import mock
+import unittest
+
+
+class TestBatchEndpoints(unittest.TestCase):
+    """Tests des endpoints /batch (résultat par élément, 201 ou 207)"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.client = self.app.test_client()
+        owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'})
+        guest = facade.create_user({
+            'email': 'guest@example.com', 'first_name': 'Guest',
+            'last_name': 'User', 'password': 'password123'})
+        place = facade.create_place({
+            'title': 'Flat', 'price': 80.0, 'latitude': 48.8,
+            'longitude': 2.3, 'owner_id': owner.id})
+        self.owner_id, self.guest_id = owner.id, guest.id
+        self.place_id = place.id
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def post(self, url, items, identity):
+        """POST authentifié : le jeton est remplacé par identity."""
+        with ExitStack() as stack:
+            stack.enter_context(mock.patch(
+                'flask_jwt_extended.view_decorators.verify_jwt_in_request'))
+            for module in ('amenities', 'places', 'reviews'):
+                stack.enter_context(mock.patch(
+                    f'app.api.v1.{module}.get_jwt_identity',
+                    return_value=identity))
+            return self.client.post(url, json=items)
+
+    def admin(self):
+        return {'id': self.owner_id, 'is_admin': True}
+
+    def test_amenities_batch_created(self):
+        response = self.post('/api/v1/amenities/batch',
+                             [{'name': 'WiFi'}, {'name': 'Pool'}],
+                             self.admin())
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json['created'], 2)
+        ids = [result['id'] for result in response.json['results']]
+        self.assertEqual(facade.get_amenity(ids[1]).name, 'Pool')
+
+    def test_amenities_batch_invalid_items_are_reported(self):
+        items = [{'name': 'WiFi'}, {'name': 42}, {'name': ['Pool']},
+                 {'name': {'x': 1}}, {}, {'name': 'x' * 51}, 'Sauna']
+        response = self.post('/api/v1/amenities/batch', items, self.admin())
+        self.assertEqual(response.status_code, 207)
+        body = response.json
+        self.assertEqual((body['created'], body['failed']), (1, 6))
+        errors = [result.get('error') for result in body['results']]
+        self.assertIsNone(errors[0])
+        self.assertEqual(errors[1:4], ['Name must be a string'] * 3)
+        self.assertEqual(errors[4], 'Name is required')
+        self.assertEqual(errors[5], 'Name must be less than 50 characters')
+        self.assertEqual(errors[6], 'Each item must be a JSON object')
+
+    def test_amenities_batch_requires_admin(self):
+        response = self.post('/api/v1/amenities/batch', [{'name': 'WiFi'}],
+                             {'id': self.guest_id, 'is_admin': False})
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post('/api/v1/amenities/batch',
+                                    json=[{'name': 'WiFi'}])
+        self.assertEqual(response.status_code, 401)
+
+    def test_batch_payload_must_be_a_list(self):
+        for payload in ({'name': 'WiFi'}, []):
+            response = self.post('/api/v1/amenities/batch', payload,
+                                 self.admin())
+            self.assertEqual(response.status_code, 400)
+        self.app.config['BATCH_MAX_ITEMS'] = 1
+        response = self.post('/api/v1/amenities/batch',
+                             [{'name': 'WiFi'}, {'name': 'Pool'}],
+                             self.admin())
+        self.assertEqual(response.status_code, 400)
+
+    def test_places_batch(self):
+        items = [{'title': 'Loft', 'price': 90.0, 'latitude': 45.7,
+                  'longitude': 4.8},
+                 {'title': 'Room', 'price': -1, 'latitude': 1.0,
+                  'longitude': 2.0}]
+        response = self.post('/api/v1/places/batch', items,
+                             {'id': self.owner_id, 'is_admin': False})
+        self.assertEqual(response.status_code, 207)
+        results = response.json['results']
+        self.assertEqual(facade.get_place(results[0]['id']).owner_id,
+                         self.owner_id)
+        self.assertEqual(results[1]['error'],
+                         'Price must be a positive number')
+
+    def test_reviews_batch(self):
+        items = [{'text': 'Great', 'rating': 5, 'place_id': self.place_id},
+                 {'text': 'Again', 'rating': 4, 'place_id': self.place_id},
+                 {'text': 'Lost', 'rating': 3, 'place_id': 'unknown'}]
+        response = self.post('/api/v1/reviews/batch', items,
+                             {'id': self.guest_id, 'is_admin': False})
+        self.assertEqual(response.status_code, 207)
+        errors = [result.get('error') for result in response.json['results']]
+        self.assertEqual(errors, [
+            None, 'You have already reviewed this place',
+            'Place with ID unknown not found'])
+        self.assertEqual(facade.get_place(self.place_id).review_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+from app import create_app
+from app.models import db
+from app.services import facade
+from datetime import datetime, timedelta
+from unittest import mock
+from werkzeug.http import http_date, parse_date
+import unittest
+
+
+class TestConditionalGet(unittest.TestCase):
+    """Tests des validateurs HTTP (ETag, Last-Modified, 304)"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.client = self.app.test_client()
+        owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'})
+        guest = facade.create_user({
+            'email': 'guest@example.com', 'first_name': 'Guest',
+            'last_name': 'User', 'password': 'password123'})
+        wifi = facade.create_amenity("WiFi")
+        pool = facade.create_amenity("Pool")
+        place = facade.create_place({
+            'title': 'Flat', 'price': 80.0, 'latitude': 48.8,
+            'longitude': 2.3, 'owner_id': owner.id, 'amenities': [wifi.id]})
+        self.owner_id, self.guest_id = owner.id, guest.id
+        self.wifi_id, self.pool_id = wifi.id, pool.id
+        self.place_id = place.id
+        self.place_url = f'/api/v1/places/{place.id}'
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def get(self, url, **headers):
+        return self.client.get(url, headers=headers)
+
+    def assertChanges(self, url, write):
+        """L'écriture change l'ETag de url et l'ancien ne donne plus 304."""
+        etag = self.get(url).headers['ETag']
+        write()
+        db.session.remove()
+        response = self.get(url, **{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_object_validators_and_304(self):
+        response = self.get(self.place_url)
+        etag = response.headers['ETag']
+        self.assertFalse(etag.startswith('W/'))
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        self.assertIsNotNone(parse_date(response.headers['Last-Modified']))
+
+        with mock.patch.object(facade, 'get_place') as get_place:
+            response = self.get(self.place_url, **{'If-None-Match': etag})
+        # Aucune lecture complète pour une 304
+        get_place.assert_not_called()
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+    def test_object_version_covers_embedded_objects(self):
+        self.assertChanges(self.place_url, lambda: facade.update_place(
+            self.place_id, {'title': 'Loft'}))
+        self.assertChanges(self.place_url, lambda: facade.update_place(
+            self.place_id, {'amenities': [self.pool_id]}))
+        self.assertChanges(self.place_url, lambda: facade.update_user(
+            self.owner_id, {'first_name': 'Renamed'}))
+        # Agrégats d'avis mis à jour par un UPDATE SQL (onupdate)
+        self.assertChanges(self.place_url, lambda: facade.create_review({
+            'text': 'Great', 'rating': 5, 'user_id': self.guest_id,
+            'place_id': self.place_id}))
+
+    def test_representations_have_distinct_etags(self):
+        plain = self.get(self.place_url).headers['ETag']
+        included = self.get(f'{self.place_url}?include=reviews')
+        self.assertEqual(included.status_code, 200)
+        self.assertNotEqual(included.headers['ETag'], plain)
+
+    def test_collection_validators(self):
+        url = '/api/v1/places/?limit=1'
+        etag = self.get(url).headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        self.assertEqual(self.get(url, **{'If-None-Match': etag})
+                         .status_code, 304)
+        self.assertNotEqual(self.get('/api/v1/places/?limit=2')
+                            .headers['ETag'], etag)
+        self.assertChanges(url, lambda: facade.create_place({
+            'title': 'Room', 'price': 30.0, 'latitude': 1.0,
+            'longitude': 2.0, 'owner_id': self.owner_id}))
+        # Cartes des hébergements : noms des amenities embarqués
+        self.assertChanges(url, lambda: facade.update_amenity(
+            self.wifi_id, 'Fast WiFi'))
+
+    def test_lookup_version_covers_owner(self):
+        url = f'/api/v1/places/?ids={self.place_id}'
+        etag = self.get(url).headers['ETag']
+        self.assertEqual(self.get(url, **{'If-None-Match': etag})
+                         .status_code, 304)
+        # Fiches complètes : propriétaire embarqué
+        self.assertChanges(url, lambda: facade.update_user(
+            self.owner_id, {'first_name': 'Renamed'}))
+        response = self.get(url)
+        self.assertEqual(response.json['results'][self.place_id]['owner']
+                         ['first_name'], 'Renamed')
+
+    def test_if_modified_since(self):
+        last_modified = self.get(self.place_url).headers['Last-Modified']
+        later = http_date(parse_date(last_modified) + timedelta(hours=1))
+        earlier = http_date(parse_date(last_modified) - timedelta(hours=1))
+        self.assertEqual(self.get(self.place_url, **{
+            'If-Modified-Since': last_modified}).status_code, 304)
+        self.assertEqual(self.get(self.place_url, **{
+            'If-Modified-Since': later}).status_code, 304)
+        self.assertEqual(self.get(self.place_url, **{
+            'If-Modified-Since': earlier}).status_code, 200)
+        # If-None-Match prime sur If-Modified-Since
+        self.assertEqual(self.get(self.place_url, **{
+            'If-None-Match': '"stale"',
+            'If-Modified-Since': later}).status_code, 200)
+
+    def test_unknown_object_has_no_validators(self):
+        response = self.get('/api/v1/places/unknown', **{
+            'If-None-Match': '*',
+            'If-Modified-Since': http_date(datetime.utcnow())})
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
+
+    def test_place_reviews_validators(self):
+        url = f'/api/v1/reviews/places/{self.place_id}/reviews'
+        response = self.get(url)
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        with mock.patch.object(facade, 'get_reviews_by_place_page') as page:
+            response = self.get(url, **{'If-None-Match': etag})
+        page.assert_not_called()
+        self.assertEqual(response.status_code, 304)
+
+        review = facade.create_review({
+            'text': 'Great', 'rating': 5, 'user_id': self.guest_id,
+            'place_id': self.place_id})
+        review_id = review.id
+        db.session.remove()
+        self.assertEqual(self.get(url, **{'If-None-Match': etag})
+                         .status_code, 200)
+        # Nom de l'auteur embarqué dans chaque avis
+        self.assertChanges(url, lambda: facade.update_user(
+            self.guest_id, {'first_name': 'Renamed'}))
+        self.assertChanges(url, lambda: facade.delete_review(review_id))
+        # Version propre aux avis : la fiche de l'hébergement n'y entre pas
+        etag = self.get(url).headers['ETag']
+        facade.update_place(self.place_id, {'title': 'Loft'})
+        db.session.remove()
+        self.assertEqual(self.get(url, **{'If-None-Match': etag})
+                         .status_code, 304)
+
+    def test_place_reviews_of_unknown_place(self):
+        response = self.get('/api/v1/reviews/places/unknown/reviews',
+                            **{'If-None-Match': '*'})
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
+
+    def test_other_resources(self):
+        for url in (f'/api/v1/users/{self.owner_id}',
+                    f'/api/v1/amenities/{self.wifi_id}', '/api/v1/users/',
+                    '/api/v1/amenities/', '/api/v1/reviews/'):
+            etag = self.get(url).headers['ETag']
+            self.assertEqual(self.get(url, **{'If-None-Match': etag})
+                             .status_code, 304, url)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+from app import create_app
+from app.api.encoders import (OrjsonEncoder, StdlibEncoder, create_encoder,
+                              iter_json_list, orjson)
+from app.models import db
+from app.services import facade
+from datetime import datetime
+from unittest import mock
+from uuid import UUID
+import json
+import unittest
+
+SAMPLE = {'id': UUID('12345678-1234-5678-1234-567812345678'),
+          'created_at': datetime(2024, 5, 1, 12, 30, 15, 250),
+          'day': datetime(2024, 5, 1).date(), 'name': 'Café', 'rating': 4.5}
+
+
+class TestEncoders(unittest.TestCase):
+    """Tests des encodeurs JSON interchangeables"""
+
+    def test_stdlib_handles_dates_and_uuid(self):
+        self.assertEqual(json.loads(StdlibEncoder().dumps(SAMPLE)), {
+            'id': '12345678-1234-5678-1234-567812345678',
+            'created_at': '2024-05-01T12:30:15.000250',
+            'day': '2024-05-01', 'name': 'Café', 'rating': 4.5})
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson_matches_stdlib(self):
+        for value in (SAMPLE, datetime(2024, 5, 1, 12, 30)):
+            self.assertEqual(json.loads(OrjsonEncoder().dumps(value)),
+                             json.loads(StdlibEncoder().dumps(value)))
+
+    def test_unknown_encoder(self):
+        with self.assertRaises(ValueError):
+            create_encoder('ujson')
+
+    def test_fallback_to_stdlib(self):
+        logger = mock.Mock()
+        with mock.patch('app.api.encoders.orjson', None):
+            self.assertIsInstance(create_encoder('auto'), StdlibEncoder)
+            self.assertIsInstance(create_encoder('orjson', logger=logger),
+                                  StdlibEncoder)
+        logger.warning.assert_called_once()
+        # RESTX_JSON ne s'applique qu'au module json
+        encoder = create_encoder('auto', {'sort_keys': True})
+        self.assertIsInstance(encoder, StdlibEncoder)
+
+    def test_iter_json_list(self):
+        items = [{'n': n} for n in range(7)]
+        for size in (1, 3, 7, 10):
+            body = b''.join(iter_json_list(StdlibEncoder(), items, size))
+            self.assertEqual(json.loads(body), items)
+        self.assertEqual(b''.join(iter_json_list(StdlibEncoder(), [], 3)),
+                         b'[]\n')
+
+
+class TestJsonResponses(unittest.TestCase):
+    """Tests des réponses application/json de l'API"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app.config.update(JSON_STREAM_MIN_ITEMS=3,
+                               JSON_STREAM_CHUNK_ITEMS=2)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_short_lists_not_streamed(self):
+        facade.create_amenity('Wifi')
+        response = self.client.get('/api/v1/amenities/')
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.content_length, len(response.data))
+        self.assertTrue(response.data.endswith(b'\n'))
+
+    def test_long_lists_streamed(self):
+        for name in ('Wifi', 'Pool', 'Sauna'):
+            facade.create_amenity(name)
+        response = self.client.get('/api/v1/amenities/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertIsNone(response.content_length)
+        self.assertEqual(sorted(item['name'] for item in response.get_json()),
+                         ['Pool', 'Sauna', 'Wifi'])
+
+
+if __name__ == '__main__':
+    unittest.main()
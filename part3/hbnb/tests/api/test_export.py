@@ -0,0 +1,93 @@
+from app import create_app
+from app.api.v1.export import export_response, get_export_format
+from app.api.v1.places import place_card
+from app.api.v1.reviews import review_details
+from app.models import db
+from app.services import facade
+import json
+import unittest
+
+
+class TestExport(unittest.TestCase):
+    """Tests des exports streamés"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app.config['EXPORT_BATCH_SIZE'] = 2
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'})
+        guest = facade.create_user({
+            'email': 'guest@example.com', 'first_name': 'Guest',
+            'last_name': 'User', 'password': 'password123'})
+        wifi = facade.create_amenity("WiFi")
+        self.place_ids = []
+        for n in range(5):
+            place = facade.create_place({
+                'title': f'Place {n}', 'price': 50.0 + n, 'latitude': 1.0,
+                'longitude': 2.0, 'owner_id': owner.id,
+                'amenities': [wifi.id]})
+            facade.create_review({'text': f'Review {n}', 'rating': 4,
+                                  'user_id': guest.id, 'place_id': place.id})
+            self.place_ids.append(place.id)
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _export(self, iter_objs, to_dict, export_format, **environ):
+        with self.app.test_request_context(**environ):
+            response = export_response(iter_objs, to_dict, export_format)
+            return response.mimetype, b''.join(response.response)
+
+    def test_iter_places_in_creation_order(self):
+        places = list(facade.iter_places(batch_size=2))
+        self.assertEqual([place.id for place in places], self.place_ids)
+        # Amenities chargées lot par lot avec les hébergements
+        self.assertEqual(place_card(places[-1])['amenities'][0]['name'],
+                         'WiFi')
+
+    def test_export_json_array(self):
+        mimetype, body = self._export(facade.iter_places, place_card, 'json')
+        self.assertEqual(mimetype, 'application/json')
+        places = json.loads(body)
+        self.assertEqual([place['id'] for place in places], self.place_ids)
+        expected = [place_card(place) for place in
+                    facade.get_places_by_ids(self.place_ids, 'list_card')[0]]
+        self.assertEqual(places, expected)
+
+    def test_export_ndjson(self):
+        mimetype, body = self._export(facade.iter_reviews, review_details,
+                                      'ndjson')
+        self.assertEqual(mimetype, 'application/x-ndjson')
+        lines = body.decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 5)
+        reviews = [json.loads(line) for line in lines]
+        self.assertEqual([review['text'] for review in reviews],
+                         [f'Review {n}' for n in range(5)])
+        self.assertEqual(reviews[0]['first_name'], 'Guest')
+
+    def test_export_format(self):
+        with self.app.test_request_context('/?format=ndjson'):
+            self.assertEqual(get_export_format(), 'ndjson')
+        with self.app.test_request_context(
+                headers={'Accept': 'application/x-ndjson'}):
+            self.assertEqual(get_export_format(), 'ndjson')
+        with self.app.test_request_context():
+            self.assertEqual(get_export_format(), 'json')
+        with self.app.test_request_context('/?format=csv'):
+            with self.assertRaises(ValueError):
+                get_export_format()
+
+    def test_export_requires_authentication(self):
+        client = self.app.test_client()
+        for url in ('/api/v1/places/export', '/api/v1/reviews/export'):
+            self.assertEqual(client.get(url).status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
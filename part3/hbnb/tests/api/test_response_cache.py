@@ -0,0 +1,277 @@
+from app import create_app
+from app.api import response_cache
+from app.api.response_cache import (MemoryBackend, RedisBackend,
+                                    ResponseCache, create_response_cache)
+from app.models import db
+from app.services import facade
+from config import TestingConfig
+from unittest import mock
+import unittest
+
+
+class ResponseCacheConfig(TestingConfig):
+    RESPONSE_CACHE_BACKEND = 'memory'
+
+
+class FakeRedis:
+    """Client minimal compatible redis-py (get, set, mget, mset), en mémoire"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def mset(self, mapping):
+        for key, value in mapping.items():
+            self.set(key, value)
+        return True
+
+
+class TestResponseCache(unittest.TestCase):
+    """Tests du cache de réponses HTTP et de ses invalidations"""
+
+    config = ResponseCacheConfig
+
+    def setUp(self):
+        self.app = create_app(self.config)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.client = self.app.test_client()
+        owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'})
+        guest = facade.create_user({
+            'email': 'guest@example.com', 'first_name': 'Guest',
+            'last_name': 'User', 'password': 'password123'})
+        wifi = facade.create_amenity("WiFi")
+        place = facade.create_place({
+            'title': 'Flat', 'price': 80.0, 'latitude': 48.8,
+            'longitude': 2.3, 'owner_id': owner.id, 'amenities': [wifi.id]})
+        self.owner_id, self.guest_id = owner.id, guest.id
+        self.wifi_id, self.place_id = wifi.id, place.id
+        self.place_url = f'/api/v1/places/{place.id}'
+        self.reviews_url = f'/api/v1/reviews/places/{place.id}/reviews'
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def get(self, url, **headers):
+        return self.client.get(url, headers=headers)
+
+    def assertCache(self, url, expected):
+        response = self.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-Cache'], expected, url)
+        return response
+
+    def add_review(self, rating=5):
+        return facade.create_review({
+            'user_id': self.guest_id, 'place_id': self.place_id,
+            'text': 'Great stay', 'rating': rating})
+
+    def test_hit_served_without_the_view(self):
+        miss = self.assertCache(self.place_url, 'MISS')
+        with mock.patch.object(facade, 'get_place') as get_place, \
+                mock.patch.object(facade, 'get_place_version') as version:
+            hit = self.assertCache(self.place_url, 'HIT')
+        get_place.assert_not_called()
+        version.assert_not_called()
+        self.assertEqual(hit.data, miss.data)
+        self.assertEqual(hit.headers['ETag'], miss.headers['ETag'])
+
+    def test_key_covers_path_and_query(self):
+        self.assertCache('/api/v1/places/', 'MISS')
+        self.assertCache('/api/v1/places/?limit=1', 'MISS')
+        self.assertCache('/api/v1/places/?limit=1', 'HIT')
+        self.assertCache('/api/v1/places/', 'HIT')
+
+    def test_hit_answers_conditional_requests(self):
+        etag = self.assertCache('/api/v1/amenities/', 'MISS').headers['ETag']
+        response = self.get('/api/v1/amenities/', **{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['X-Cache'], 'HIT')
+        self.assertEqual(response.headers['ETag'], etag)
+
+    def test_errors_are_not_cached(self):
+        url = '/api/v1/places/unknown'
+        self.assertEqual(self.get(url).status_code, 404)
+        self.assertEqual(self.get(url).headers['X-Cache'], 'MISS')
+
+    def test_create_review_invalidates_place_and_its_reviews(self):
+        urls = [self.place_url, self.reviews_url, '/api/v1/places/',
+                '/api/v1/amenities/']
+        for url in urls:
+            self.assertCache(url, 'MISS')
+        self.add_review()
+        db.session.remove()
+
+        response = self.assertCache(self.place_url, 'MISS')
+        self.assertEqual(response.json['review_count'], 1)
+        response = self.assertCache(self.reviews_url, 'MISS')
+        self.assertEqual(len(response.json), 1)
+        self.assertCache('/api/v1/places/', 'MISS')
+        # Sans rapport avec les avis : toujours en cache
+        self.assertCache('/api/v1/amenities/', 'HIT')
+
+    def test_update_and_delete_review_invalidate(self):
+        review_id = self.add_review().id
+        db.session.remove()
+        self.assertCache(self.reviews_url, 'MISS')
+        facade.update_review(review_id, {'rating': 2})
+        db.session.remove()
+        response = self.assertCache(self.reviews_url, 'MISS')
+        self.assertEqual(response.json[0]['rating'], 2)
+        facade.delete_review(review_id)
+        db.session.remove()
+        self.assertEqual(self.assertCache(self.reviews_url, 'MISS').json, [])
+
+    def test_amenity_and_user_updates_invalidate_embedding_responses(self):
+        self.assertCache(self.place_url, 'MISS')
+        self.assertCache('/api/v1/places/', 'MISS')
+        facade.update_amenity(self.wifi_id, "Fiber")
+        db.session.remove()
+        response = self.assertCache(self.place_url, 'MISS')
+        self.assertEqual(response.json['amenities'][0]['name'], "Fiber")
+        self.assertCache('/api/v1/places/', 'MISS')
+
+        facade.update_user(self.owner_id, {'first_name': 'Renamed'})
+        db.session.remove()
+        response = self.assertCache(self.place_url, 'MISS')
+        self.assertEqual(response.json['owner']['first_name'], 'Renamed')
+
+    def test_update_place_invalidates_only_that_place(self):
+        other = facade.create_place({
+            'title': 'Loft', 'price': 120.0, 'latitude': 45.7,
+            'longitude': 4.8, 'owner_id': self.owner_id})
+        other_url = f'/api/v1/places/{other.id}'
+        db.session.remove()
+        self.assertCache(self.place_url, 'MISS')
+        self.assertCache(other_url, 'MISS')
+        facade.update_place(self.place_id, {'title': 'Studio'})
+        db.session.remove()
+        response = self.assertCache(self.place_url, 'MISS')
+        self.assertEqual(response.json['title'], 'Studio')
+        self.assertCache(other_url, 'HIT')
+
+    def test_rollback_keeps_cached_responses(self):
+        self.add_review()
+        db.session.remove()
+        self.assertCache(self.reviews_url, 'MISS')
+        # Doublon refusé par l'index unique : transaction annulée
+        with self.assertRaises(ValueError):
+            self.add_review(rating=1)
+        db.session.remove()
+        self.assertCache(self.reviews_url, 'HIT')
+
+    def test_batch_insert_invalidates(self):
+        self.assertCache('/api/v1/amenities/', 'MISS')
+        facade.create_amenities_batch(['Pool', 'Sauna'])
+        db.session.remove()
+        response = self.assertCache('/api/v1/amenities/', 'MISS')
+        self.assertEqual(len(response.json), 3)
+
+    def test_streamed_lists_are_not_cached(self):
+        self.app.config['JSON_STREAM_MIN_ITEMS'] = 1
+        self.get('/api/v1/amenities/')
+        self.assertCache('/api/v1/amenities/', 'MISS')
+
+    def test_shared_backend(self):
+        # Deux workers partageant le même Redis
+        client = FakeRedis()
+        local = ResponseCache(RedisBackend(client, ttl=60))
+        remote = ResponseCache(RedisBackend(client, ttl=60))
+        self.app.extensions['response_cache'] = local
+        facade.configure_response_cache(remote)
+
+        miss = self.assertCache(self.place_url, 'MISS')
+        hit = self.assertCache(self.place_url, 'HIT')
+        self.assertEqual(hit.data, miss.data)
+        self.assertEqual(hit.headers['ETag'], miss.headers['ETag'])
+        # Écriture faite par l'autre worker
+        self.add_review()
+        db.session.remove()
+        self.assertCache(self.place_url, 'MISS')
+        self.assertEqual(local.stats()['backend'], 'redis')
+
+
+class TestResponseCacheDisabled(unittest.TestCase):
+    """Cache désactivé par défaut"""
+
+    def test_disabled_by_default(self):
+        app = create_app("config.TestingConfig")
+        with app.app_context():
+            self.assertIsNone(app.extensions['response_cache'])
+            self.assertIsNone(facade.response_cache)
+            response = app.test_client().get('/api/v1/places/')
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('X-Cache', response.headers)
+            db.drop_all()
+
+
+class TestBackends(unittest.TestCase):
+    """Tests des backends et de la configuration"""
+
+    def test_memory_invalidation_changes_keys(self):
+        cache = ResponseCache(MemoryBackend(maxsize=10))
+        key = cache.key('json:0:/api/v1/places/?', 'public', ['places'])
+        self.assertEqual(
+            cache.key('json:0:/api/v1/places/?', 'public', ['places']), key)
+        self.assertNotEqual(
+            cache.key('json:0:/api/v1/places/?', 'user-1', ['places']), key)
+        self.assertTrue(cache.set(key, 200, [('ETag', '"a"')], b'[]\n'))
+        self.assertEqual(cache.get(key), (200, [('ETag', '"a"')], b'[]\n'))
+        cache.invalidate(['amenities'])
+        self.assertEqual(
+            cache.key('json:0:/api/v1/places/?', 'public', ['places']), key)
+        cache.invalidate(['places'])
+        self.assertNotEqual(
+            cache.key('json:0:/api/v1/places/?', 'public', ['places']), key)
+
+    def test_only_small_ok_responses_are_stored(self):
+        cache = ResponseCache(MemoryBackend(), max_body=4)
+        self.assertFalse(cache.set('a', 404, [], b'{}'))
+        self.assertFalse(cache.set('b', 200, [], b'[1, 2]'))
+        self.assertTrue(cache.set('c', 200, [('Content-Length', '2'),
+                                             ('X-Cache', 'MISS')], b'[]'))
+        self.assertEqual(cache.get('c'), (200, [], b'[]'))
+
+    def test_redis_round_trip(self):
+        backend = RedisBackend(FakeRedis(), ttl=30)
+        backend.set('k', (200, [('ETag', '"a"')], 'café'.encode()))
+        self.assertEqual(backend.get('k'),
+                         (200, [('ETag', '"a"')], 'café'.encode()))
+        tokens = backend.tokens(['places', 'users'])
+        self.assertEqual(backend.tokens(['places', 'users']), tokens)
+        backend.invalidate(['users'])
+        self.assertEqual(backend.tokens(['places'])[0], tokens[0])
+        self.assertNotEqual(backend.tokens(['users'])[0], tokens[1])
+
+    def test_create_from_config(self):
+        self.assertIsNone(create_response_cache({}))
+        cache = create_response_cache({'RESPONSE_CACHE_BACKEND': 'memory',
+                                       'RESPONSE_CACHE_SIZE': 8})
+        self.assertEqual(cache.stats()['maxsize'], 8)
+        with self.assertRaises(ValueError):
+            create_response_cache({'RESPONSE_CACHE_BACKEND': 'memcached'})
+        with mock.patch.object(response_cache, 'redis', None):
+            with self.assertRaises(RuntimeError):
+                create_response_cache({
+                    'RESPONSE_CACHE_BACKEND': 'redis',
+                    'RESPONSE_CACHE_REDIS_URL': 'redis://localhost:6379/0'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+from app.persistence.cache import LRUCache
+from unittest import mock
+import unittest
+
+
+class TestLRUCache(unittest.TestCase):
+    """Tests du cache LRU/TTL"""
+
+    def test_hits_and_misses(self):
+        cache = LRUCache(maxsize=2)
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_entries_expire_after_ttl(self):
+        cache = LRUCache(maxsize=2, ttl=10)
+        with mock.patch('app.persistence.cache.time.monotonic', return_value=100):
+            cache.set('a', 1)
+        with mock.patch('app.persistence.cache.time.monotonic', return_value=105):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('app.persistence.cache.time.monotonic', return_value=111):
+            self.assertIsNone(cache.get('a'))
+
+    def test_delete(self):
+        cache = LRUCache()
+        cache.set('a', 1)
+        cache.delete('a')
+        cache.delete('missing')
+        self.assertIsNone(cache.get('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+from app import create_app
+from app.models import db
+from app.persistence.fulltext import match_expression
+from config import TestingConfig
+from sqlalchemy import create_engine
+import os
+import tempfile
+import unittest
+
+
+class TestFullTextIndex(unittest.TestCase):
+    """Tests des tables FTS5 et de la traduction des requêtes"""
+
+    def test_match_expression_quotes_every_word(self):
+        self.assertEqual(match_expression('grand "loft" OR vue*'),
+                         '"grand" "loft" "OR" "vue"*')
+        with self.assertRaises(ValueError):
+            match_expression(' -* ')
+
+    def test_existing_rows_are_indexed_at_creation(self):
+        db_path = os.path.join(tempfile.mkdtemp(), 'old.db')
+        config = type('FullTextConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+        app = create_app(config)
+        with app.app_context():
+            db.engine.dispose()
+        # Base antérieure aux tables FTS5, avec un hébergement existant
+        engine = create_engine(f'sqlite:///{db_path}')
+        with engine.begin() as connection:
+            for trigger in ('ai', 'ad', 'au'):
+                connection.exec_driver_sql(
+                    f"DROP TRIGGER places_fts_{trigger}")
+            connection.exec_driver_sql("DROP TABLE places_fts")
+            connection.exec_driver_sql(
+                "INSERT INTO places (id, title, price, latitude, longitude, "
+                "owner_id) VALUES ('place-1', 'Cabane perchée', 80, 1, 2, "
+                "'owner')")
+        engine.dispose()
+
+        app = create_app(config)
+        with app.app_context():
+            from app.services import facade
+            places, _ = facade.search_places(10, text_query='cabane')
+            self.assertEqual([place.id for place in places], ['place-1'])
+            db.session.remove()
+            db.engine.dispose()
+
+    def _file_app(self):
+        db_path = os.path.join(tempfile.mkdtemp(), 'fts.db')
+        config = type('FullTextConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+        return db_path, config
+
+    def test_index_survives_rowid_renumbering(self):
+        db_path, config = self._file_app()
+        app = create_app(config)
+        with app.app_context():
+            from app.services import facade
+            owner = facade.create_user({
+                'email': 'owner@example.com', 'first_name': 'Property',
+                'last_name': 'Owner', 'password': 'password123'}).id
+            for title in ('Cabane', 'Chalet', 'Moulin'):
+                facade.create_place({
+                    'title': title, 'price': 50.0, 'latitude': 1.0,
+                    'longitude': 2.0, 'owner_id': owner})
+            db.session.execute(db.text(
+                "DELETE FROM places WHERE title = 'Cabane'"))
+            # Ce que VACUUM a le droit de faire au rowid implicite d'une
+            # table à clé UUID (SQLite ne le garantit pas stable)
+            db.session.execute(db.text(
+                "UPDATE places SET rowid = rowid + 1000"))
+            db.session.commit()
+            db.session.remove()
+            with db.engine.connect().execution_options(
+                    isolation_level='AUTOCOMMIT') as connection:
+                connection.exec_driver_sql("VACUUM")
+            for query, title in (('moulin', 'Moulin'), ('chalet', 'Chalet')):
+                places, _ = facade.search_places(10, text_query=query)
+                self.assertEqual([place.title for place in places], [title])
+            places, _ = facade.search_places(10, text_query='cabane')
+            self.assertEqual(places, [])
+            db.session.remove()
+            db.engine.dispose()
+
+    def test_rowid_index_is_replaced(self):
+        db_path, config = self._file_app()
+        app = create_app(config)
+        with app.app_context():
+            db.engine.dispose()
+        # Index d'une version antérieure, lié au rowid de places
+        engine = create_engine(f'sqlite:///{db_path}')
+        with engine.begin() as connection:
+            for trigger in ('ai', 'ad', 'au'):
+                connection.exec_driver_sql(
+                    f"DROP TRIGGER places_fts_{trigger}")
+            for statement in ("DROP TABLE places_fts",
+                              "DROP VIEW places_fts_content",
+                              "DROP TABLE places_fts_docs"):
+                connection.exec_driver_sql(statement)
+            connection.exec_driver_sql(
+                "CREATE VIRTUAL TABLE places_fts USING fts5(title, "
+                "description, content='places', content_rowid='rowid')")
+            connection.exec_driver_sql(
+                "INSERT INTO places (id, title, price, latitude, longitude, "
+                "owner_id) VALUES ('place-1', 'Cabane perchée', 80, 1, 2, "
+                "'owner')")
+        engine.dispose()
+
+        app = create_app(config)
+        with app.app_context():
+            from app.services import facade
+            places, _ = facade.search_places(10, text_query='cabane')
+            self.assertEqual([place.id for place in places], ['place-1'])
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
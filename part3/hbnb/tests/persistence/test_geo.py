@@ -0,0 +1,67 @@
+from app.persistence import geo
+from app.persistence.geo import (bounding_boxes, distances_km,
+                                 encode_geohash, geohash_cells)
+from unittest import mock
+import random
+import unittest
+
+
+class TestGeohash(unittest.TestCase):
+    """Tests de l'index geohash et des distances"""
+
+    def test_encode_known_positions(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11),
+                         'u4pruydqqvj')
+        self.assertEqual(encode_geohash(48.8584, 2.2945), 'u09tunquc')
+
+    def test_distance_paris_london(self):
+        paris_london, same = distances_km(
+            48.8566, 2.3522, [(51.5074, -0.1278), (48.8566, 2.3522)])
+        self.assertAlmostEqual(paris_london, 343.6, delta=0.5)
+        self.assertEqual(same, 0.0)
+
+    def test_distance_without_numpy(self):
+        with mock.patch.object(geo, 'numpy', None):
+            paris_london, = distances_km(48.8566, 2.3522,
+                                         [(51.5074, -0.1278)])
+        self.assertAlmostEqual(paris_london, 343.6, delta=0.5)
+
+    @unittest.skipIf(geo.numpy is None, "numpy is not installed")
+    def test_vectorized_matches_scalar(self):
+        random.seed(2)
+        points = [(random.uniform(-90, 90), random.uniform(-180, 180))
+                  for _ in range(200)]
+        vectorized = distances_km(10.0, 20.0, points)
+        with mock.patch.object(geo, 'numpy', None):
+            scalar = distances_km(10.0, 20.0, points)
+        self.assertEqual(type(vectorized[0]), float)
+        for a, b in zip(vectorized, scalar):
+            self.assertAlmostEqual(a, b, places=6)
+        self.assertEqual(distances_km(10.0, 20.0, []), [])
+
+    def test_cells_cover_the_circle(self):
+        random.seed(1)
+        for lat, lng, radius in [(48.85, 2.35, 5), (-17.0, 179.9, 50),
+                                 (89.9, 0.0, 50), (0.0, 0.0, 2000)]:
+            boxes = bounding_boxes(lat, lng, radius)
+            cells = set()
+            for box in boxes:
+                cells |= geohash_cells(*box)
+            self.assertLessEqual(len(cells), 32 * len(boxes))
+            # Tout point du cercle tombe dans une des cellules
+            for _ in range(500):
+                box = random.choice(boxes)
+                point = (random.uniform(box[0], box[2]),
+                         random.uniform(box[1], box[3]))
+                if distances_km(lat, lng, [point])[0] <= radius:
+                    geohash = encode_geohash(*point)
+                    self.assertTrue(any(geohash.startswith(cell)
+                                        for cell in cells), point)
+
+    def test_antimeridian_splits_the_box(self):
+        self.assertEqual(len(bounding_boxes(-17.0, 179.9, 50)), 2)
+        self.assertEqual(len(bounding_boxes(-17.0, 0.0, 50)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+from app import create_app
+from app.models import db
+from app.services import facade
+from config import TestingConfig
+from sqlalchemy import create_engine, text
+import os
+import shutil
+import tempfile
+import unittest
+
+
+class TestReplicaRouting(unittest.TestCase):
+    """Tests du routage des lectures vers un réplica (copie SQLite)"""
+
+    def setUp(self):
+        db_dir = tempfile.mkdtemp()
+        self.primary_path = os.path.join(db_dir, 'primary.db')
+        self.replica_path = os.path.join(db_dir, 'replica.db')
+        config = type('ReplicaTestConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{self.primary_path}',
+            'SQLALCHEMY_REPLICA_URIS': [f'sqlite:///{self.replica_path}'],
+            'REPLICA_READ_YOUR_WRITES_SECONDS': 60,
+        })
+        self.app = create_app(config)
+        self.router = self.app.extensions['replica_router']
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+        replicated_id = facade.create_amenity("Replicated").id
+        db.session.remove()
+        shutil.copyfile(self.primary_path, self.replica_path)
+        self.ids = (replicated_id, facade.create_amenity("Primary only").id)
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        self.router.dispose()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_reads_own_writes_within_window(self):
+        self.assertIsNotNone(facade.get_amenity(self.ids[1]))
+        self.assertEqual(self.router.replica_reads, 0)
+
+    def test_reads_served_by_replica_after_window(self):
+        self.router._recent_writes.clear()
+        self.assertIsNotNone(facade.get_amenity(self.ids[0]))
+        self.assertIsNone(facade.get_amenity(self.ids[1]))
+        self.assertEqual(len(facade.get_all_amenities()), 1)
+        self.assertGreater(self.router.replica_reads, 0)
+
+    def test_unit_of_work_reads_primary(self):
+        self.router._recent_writes.clear()
+        with facade.transaction():
+            amenity = facade.amenity_repo.get_by_attribute('name',
+                                                           'Primary only')
+            self.assertIsNotNone(amenity)
+
+    def test_writes_go_to_primary(self):
+        self.router._recent_writes.clear()
+        facade.update_amenity(self.ids[0], "Renamed")
+        db.session.remove()
+        engine = create_engine(f'sqlite:///{self.primary_path}')
+        with engine.connect() as connection:
+            name = connection.execute(
+                text("SELECT name FROM amenities WHERE id = :id"),
+                {'id': self.ids[0]}).scalar()
+        engine.dispose()
+        self.assertEqual(name, "Renamed")
+        # La fenêtre est rouverte par l'écriture : lecture sur le primaire
+        self.assertEqual(facade.get_amenity(self.ids[0]).name, "Renamed")
+
+
+if __name__ == '__main__':
+    unittest.main()
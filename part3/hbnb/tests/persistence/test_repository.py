@@ -0,0 +1,243 @@
+from app import create_app
+from app.models import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.persistence.repository import (SQLAlchemyRepository,
+                                        InMemoryRepository, decode_cursor,
+                                        transaction)
+from sqlalchemy import event
+import unittest
+
+
+class TestSQLAlchemyRepository(unittest.TestCase):
+    """Tests du repository SQLAlchemy sur une base SQLite en mémoire"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.repo = SQLAlchemyRepository(Amenity)
+        self.amenities = []
+        for i in range(5):
+            amenity = Amenity(name=f"Amenity {i}")
+            self.repo.add(amenity)
+            self.amenities.append(amenity)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_get_page_walks_all_rows_once(self):
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = self.repo.get_page(2, cursor)
+            self.assertLessEqual(len(page), 2)
+            seen.extend(amenity.id for amenity in page)
+            if not cursor:
+                break
+        self.assertEqual(sorted(seen), sorted(a.id for a in self.amenities))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_get_page_last_page_has_no_cursor(self):
+        page, cursor = self.repo.get_page(10)
+        self.assertEqual(len(page), 5)
+        self.assertIsNone(cursor)
+
+    def test_get_page_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.repo.get_page(2, "not-a-cursor")
+
+    def test_get_many_keeps_order_and_reports_misses(self):
+        wanted = [self.amenities[3].id, "unknown", self.amenities[0].id,
+                  self.amenities[3].id]
+        found, missing = self.repo.get_many(wanted)
+        self.assertEqual([a.id for a in found],
+                         [self.amenities[3].id, self.amenities[0].id])
+        self.assertEqual(missing, ["unknown"])
+
+    def test_get_many_empty(self):
+        self.assertEqual(self.repo.get_many([]), ([], []))
+
+    def test_add_many_single_commit(self):
+        commits = []
+        event.listen(db.session(), 'after_commit', commits.append)
+        self.repo.add_many([Amenity(name=f"Bulk {i}") for i in range(20)])
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(len(self.repo.get_all()), 25)
+
+    def test_transaction_commits_once(self):
+        commits = []
+        event.listen(db.session(), 'after_commit', commits.append)
+        with transaction():
+            self.repo.add(Amenity(name="Sauna"))
+            self.repo.add(Amenity(name="Jacuzzi"))
+            self.repo.delete(self.amenities[0].id)
+        self.assertEqual(len(commits), 1)
+        self.assertEqual(len(self.repo.get_all()), 6)
+
+    def test_transaction_rolls_back_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with transaction():
+                self.repo.add(Amenity(name="Sauna"))
+                raise RuntimeError("boom")
+        self.assertIsNone(self.repo.get_by_attribute('name', "Sauna"))
+
+    def test_staging_repository_does_not_commit(self):
+        staging = SQLAlchemyRepository(Amenity, autocommit=False)
+        staging.add(Amenity(name="Sauna"))
+        db.session.rollback()
+        self.assertIsNone(self.repo.get_by_attribute('name', "Sauna"))
+
+    def test_cached_get_skips_database(self):
+        self.repo.enable_cache(maxsize=10, ttl=60)
+        try:
+            amenity_id = self.amenities[0].id
+            db.session.remove()
+            self.assertEqual(self.repo.get(amenity_id).name, "Amenity 0")
+            db.session.remove()
+
+            statements = []
+            event.listen(db.engine, 'before_cursor_execute',
+                         lambda *args: statements.append(args[2]))
+            self.assertEqual(self.repo.get(amenity_id).name, "Amenity 0")
+            self.assertEqual(statements, [])
+            self.assertEqual(self.repo.cache.stats()['hits'], 1)
+        finally:
+            self.repo.disable_cache()
+
+    def test_cache_invalidated_by_any_write(self):
+        self.repo.enable_cache(maxsize=10, ttl=60)
+        try:
+            amenity_id = self.amenities[1].id
+            amenity = self.repo.get(amenity_id)
+            # Modification hors repository, comme dans la façade
+            amenity.name = "Renamed"
+            db.session.commit()
+            db.session.remove()
+            self.assertEqual(self.repo.get(amenity_id).name, "Renamed")
+
+            self.repo.delete(amenity_id)
+            db.session.remove()
+            self.assertIsNone(self.repo.get(amenity_id))
+        finally:
+            self.repo.disable_cache()
+
+    def test_cache_entry_recached_before_commit_is_evicted(self):
+        self.repo.enable_cache(maxsize=10, ttl=60)
+        try:
+            amenity_id = self.amenities[2].id
+            amenity = self.repo.get(amenity_id)
+            stale = self.repo._snapshot(amenity)
+            amenity.name = "Renamed"
+            db.session.flush()
+            # Une autre requête relit la ligne encore validée entre le flush
+            # et le commit, et la remet en cache
+            self.repo.cache.set(amenity_id, stale)
+            db.session.commit()
+            db.session.remove()
+            self.assertEqual(self.repo.get(amenity_id).name, "Renamed")
+
+            amenity = self.repo.get(amenity_id)
+            amenity.name = "Cancelled"
+            db.session.flush()
+            self.repo.cache.set(amenity_id, self.repo._snapshot(amenity))
+            db.session.rollback()
+            db.session.remove()
+            self.assertEqual(self.repo.get(amenity_id).name, "Renamed")
+        finally:
+            self.repo.disable_cache()
+
+    def test_list_endpoint_returns_next_cursor_header(self):
+        client = self.app.test_client()
+        response = client.get('/api/v1/amenities/?limit=3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), 3)
+        cursor = response.headers.get('X-Next-Cursor')
+        self.assertIsNotNone(cursor)
+
+        response = client.get(f'/api/v1/amenities/?limit=3&cursor={cursor}')
+        self.assertEqual(len(response.json), 2)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_list_endpoint_rejects_invalid_limit(self):
+        client = self.app.test_client()
+        response = client.get('/api/v1/amenities/?limit=0')
+        self.assertEqual(response.status_code, 400)
+
+
+class TestInMemoryRepository(unittest.TestCase):
+    """Tests du repository en mémoire"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.repo = InMemoryRepository()
+        self.amenities = []
+        for i in range(5):
+            amenity = Amenity(name=f"Amenity {i}")
+            amenity.id = f"id-{i}"
+            self.repo.add(amenity)
+            self.amenities.append(amenity)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_get_page(self):
+        page, cursor = self.repo.get_page(3)
+        self.assertEqual([a.id for a in page], ["id-0", "id-1", "id-2"])
+        self.assertEqual(decode_cursor(cursor)[1], "id-2")
+        page, cursor = self.repo.get_page(3, cursor)
+        self.assertEqual([a.id for a in page], ["id-3", "id-4"])
+        self.assertIsNone(cursor)
+
+    def test_get_many(self):
+        found, missing = self.repo.get_many(["id-4", "nope", "id-1"])
+        self.assertEqual([a.id for a in found], ["id-4", "id-1"])
+        self.assertEqual(missing, ["nope"])
+
+
+
+class TestInMemoryRepositoryRangeIndexes(unittest.TestCase):
+    """Tests des index ordonnés (recherche par intervalle)"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.repo = InMemoryRepository(range_indexes=('price',))
+        self.places = []
+        for i, price in enumerate((120.0, 45.0, 80.0, 45.0, 300.0)):
+            place = Place(f"Place {i}", "", price, 0.0, 0.0)
+            place.id = f"id-{i}"
+            self.places.append(place)
+        self.repo.add_many(self.places)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_find_range_sorted_and_inclusive(self):
+        found = self.repo.find_range('price', 45.0, 120.0)
+        self.assertEqual([p.price for p in found], [45.0, 45.0, 80.0, 120.0])
+        self.assertEqual([p.price for p in self.repo.find_range('price',
+                                                                low=100)],
+                         [120.0, 300.0])
+
+    def test_find_range_follows_update_and_delete(self):
+        self.repo.update("id-4", {'price': 50.0})
+        self.repo.delete("id-1")
+        found = self.repo.find_range('price', 40.0, 60.0)
+        self.assertEqual([p.id for p in found], ["id-3", "id-4"])
+
+    def test_find_range_without_index_scans(self):
+        self.assertEqual(len(self.repo.find_range('latitude', -1.0, 1.0)), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+from app import create_app
+from app.models import db
+from config import TestingConfig
+import os
+import sqlite3
+import tempfile
+import unittest
+
+# Tables places et reviews telles que créées avant les agrégats d'avis
+OLD_SCHEMA = """
+    CREATE TABLE places (
+        title VARCHAR(100) NOT NULL, description VARCHAR(500),
+        price FLOAT NOT NULL, latitude FLOAT NOT NULL,
+        longitude FLOAT NOT NULL, owner_id VARCHAR(36) NOT NULL,
+        id VARCHAR(36) NOT NULL, created_at DATETIME,
+        updated_at DATETIME, images, PRIMARY KEY (id));
+    CREATE TABLE reviews (
+        text VARCHAR NOT NULL, rating INTEGER NOT NULL,
+        user_id VARCHAR(36) NOT NULL, place_id VARCHAR(36) NOT NULL,
+        id VARCHAR(36) NOT NULL, created_at DATETIME,
+        updated_at DATETIME, PRIMARY KEY (id));
+    INSERT INTO places (title, price, latitude, longitude, owner_id, id)
+    VALUES ('Flat', 80, 48.8584, 2.2945, 'owner', 'place-1');
+    INSERT INTO reviews (text, rating, user_id, place_id, id)
+    VALUES ('Nice', 4, 'guest', 'place-1', 'r1'),
+           ('Again', 2, 'other', 'place-1', 'r2');
+"""
+
+
+class TestUpgradeSchema(unittest.TestCase):
+    """Tests de la mise à niveau d'une base existante au démarrage"""
+
+    def setUp(self):
+        self.db_path = os.path.join(tempfile.mkdtemp(), 'old.db')
+        connection = sqlite3.connect(self.db_path)
+        connection.executescript(OLD_SCHEMA)
+        connection.close()
+        config = type('OldSchemaConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{self.db_path}'})
+        self.app = create_app(config)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+    def test_missing_columns_are_added_and_filled(self):
+        with self.app.app_context():
+            row = db.session.execute(db.text(
+                "SELECT review_count, rating_sum, rating_2, rating_4 "
+                "FROM places")).one()
+            indexes = {name for name, in db.session.execute(db.text(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"))}
+        self.assertEqual(tuple(row), (2, 6, 1, 1))
+        self.assertIn('ix_places_review_count_id', indexes)
+        self.assertIn('ix_reviews_place_id_created_at', indexes)
+
+    def test_missing_geohashes_are_filled(self):
+        with self.app.app_context():
+            geohash = db.session.execute(db.text(
+                "SELECT geohash FROM places")).scalar()
+        self.assertEqual(geohash, 'u09tunquc')
+
+    def test_old_database_is_served(self):
+        response = self.app.test_client().get('/api/v1/places/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json[0]['review_count'], 2)
+
+    def test_unique_index_violated_by_old_rows_is_skipped(self):
+        connection = sqlite3.connect(self.db_path)
+        connection.executescript("""
+            DROP INDEX uq_reviews_user_id_place_id;
+            INSERT INTO reviews (text, rating, user_id, place_id, id)
+            VALUES ('Twice', 5, 'guest', 'place-1', 'r3');
+        """)
+        connection.close()
+        config = type('DuplicatesConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{self.db_path}'})
+        with self.assertLogs('app', level='WARNING') as logs:
+            app = create_app(config)
+        self.assertIn('uq_reviews_user_id_place_id', logs.output[0])
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
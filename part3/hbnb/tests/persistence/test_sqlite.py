@@ -0,0 +1,49 @@
+from app import create_app
+from app.models import db
+from app.persistence.sqlite import (configure_sqlite_pragmas,
+                                    get_sqlite_pragmas)
+from config import ProductionConfig
+from sqlalchemy import create_engine
+import os
+import tempfile
+import unittest
+
+
+class TestSQLitePragmas(unittest.TestCase):
+    """Tests des PRAGMA SQLite appliqués à chaque connexion"""
+
+    def test_production_config_applies_pragmas(self):
+        db_path = os.path.join(tempfile.mkdtemp(), 'production.db')
+        config = type('ProductionTestConfig', (ProductionConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+        app = create_app(config)
+        with app.app_context():
+            with db.engine.connect() as connection:
+                values = get_sqlite_pragmas(
+                    connection, ['journal_mode', 'synchronous',
+                                 'busy_timeout', 'cache_size'])
+            db.engine.dispose()
+        self.assertEqual(values['journal_mode'], 'wal')
+        self.assertEqual(values['synchronous'], 1)  # NORMAL
+        self.assertEqual(values['busy_timeout'], 5000)
+        self.assertEqual(values['cache_size'], -65536)
+
+    def test_pragmas_applied_to_every_pooled_connection(self):
+        engine = create_engine('sqlite://')
+        configure_sqlite_pragmas(engine, {'cache_size': -1024})
+        with engine.connect() as first, engine.connect() as second:
+            for connection in (first, second):
+                self.assertEqual(
+                    get_sqlite_pragmas(connection, ['cache_size']),
+                    {'cache_size': -1024})
+
+    def test_invalid_pragma_rejected(self):
+        engine = create_engine('sqlite://')
+        with self.assertRaises(ValueError):
+            configure_sqlite_pragmas(engine, {'journal_mode': 'WAL; DROP'})
+        with self.assertRaises(ValueError):
+            configure_sqlite_pragmas(engine, {'bad name': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+from app.api.response_cache import MemoryBackend, ResponseCache
+from app.asgi import create_asgi_app
+from app.models import db
+from app.services import facade
+from config import TestingConfig
+import json
+import os
+import tempfile
+import unittest
+
+
+class AsyncTestingConfig(TestingConfig):
+    """Base SQLite fichier, partagée entre le moteur sync et async"""
+    _db_dir = tempfile.mkdtemp()
+    SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(_db_dir, 'async.db')}"
+
+
+class TestAsgiApp(unittest.IsolatedAsyncioTestCase):
+    """Tests de l'application ASGI et de la façade asynchrone"""
+
+    def setUp(self):
+        self.asgi_app = create_asgi_app(AsyncTestingConfig)
+        with self.asgi_app.flask_app.app_context():
+            owner = facade.create_user({
+                'email': 'owner@example.com', 'first_name': 'Property',
+                'last_name': 'Owner', 'password': 'password123'})
+            wifi = facade.create_amenity("WiFi")
+            place = facade.create_place({
+                'title': 'Flat', 'price': 80.0, 'latitude': 48.8,
+                'longitude': 2.3, 'owner_id': owner.id,
+                'amenities': [wifi.id]})
+            self.owner_id, self.place_id = owner.id, place.id
+
+    async def asyncTearDown(self):
+        await self.asgi_app.engine.dispose()
+        with self.asgi_app.flask_app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    async def request(self, path, query=b'', headers=(), method='GET',
+                      body=b''):
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {'type': 'http', 'http_version': '1.1', 'method': method,
+                 'path': path, 'scheme': 'http',
+                 'query_string': query, 'headers': list(headers)}
+        await self.asgi_app(scope, receive, send)
+        content = b''.join(m.get('body', b'') for m in messages
+                           if m['type'] == 'http.response.body')
+        return messages[0]['status'], dict(messages[0]['headers']), \
+            json.loads(content) if content else None
+
+    async def test_get_place_details(self):
+        status, _, body = await self.request(f'/api/v1/places/{self.place_id}')
+        self.assertEqual(status, 200)
+        self.assertEqual(body['owner']['id'], self.owner_id)
+        self.assertEqual(body['amenities'][0]['name'], "WiFi")
+
+    async def test_list_places_paginated(self):
+        status, headers, body = await self.request('/api/v1/places/', b'limit=1')
+        self.assertEqual(status, 200)
+        self.assertEqual([p['id'] for p in body], [self.place_id])
+        self.assertNotIn(b'x-next-cursor', headers)
+
+    async def test_unknown_place(self):
+        status, _, body = await self.request('/api/v1/places/unknown')
+        self.assertEqual(status, 404)
+
+    async def test_conditional_get(self):
+        path = f'/api/v1/places/{self.place_id}'
+        status, headers, _ = await self.request(path)
+        etag = headers[b'etag']
+        # Mêmes validateurs que la route Flask
+        flask_response = self.asgi_app.flask_app.test_client().get(path)
+        self.assertEqual(etag.decode(), flask_response.headers['ETag'])
+        status, headers, body = await self.request(
+            path, headers=[(b'if-none-match', etag)])
+        self.assertEqual((status, body), (304, None))
+        self.assertEqual(headers[b'etag'], etag)
+
+        status, headers, _ = await self.request('/api/v1/places/unknown')
+        self.assertEqual(status, 404)
+        self.assertNotIn(b'etag', headers)
+
+    async def test_place_reviews_conditional_get(self):
+        path = f'/api/v1/reviews/places/{self.place_id}/reviews'
+        status, headers, _ = await self.request(path)
+        etag = headers[b'etag']
+        flask_response = self.asgi_app.flask_app.test_client().get(path)
+        self.assertEqual(etag.decode(), flask_response.headers['ETag'])
+        status, _, _ = await self.request(
+            path, headers=[(b'if-none-match', etag)])
+        self.assertEqual(status, 304)
+        status, headers, _ = await self.request(
+            '/api/v1/reviews/places/unknown/reviews')
+        self.assertEqual(status, 404)
+        self.assertNotIn(b'etag', headers)
+
+    async def test_response_cache(self):
+        cache = ResponseCache(MemoryBackend())
+        self.asgi_app.cache = cache
+        facade.configure_response_cache(cache)
+        self.addCleanup(facade.configure_response_cache, None)
+        path = f'/api/v1/places/{self.place_id}'
+        status, headers, body = await self.request(path)
+        self.assertEqual((status, headers[b'x-cache']), (200, b'MISS'))
+        status, hit_headers, hit_body = await self.request(path)
+        self.assertEqual((status, hit_headers[b'x-cache']), (200, b'HIT'))
+        self.assertEqual(hit_body, body)
+        self.assertEqual(hit_headers[b'etag'], headers[b'etag'])
+        status, _, _ = await self.request(
+            path, headers=[(b'if-none-match', headers[b'etag'])])
+        self.assertEqual(status, 304)
+
+        # Écriture servie par Flask : invalide aussi la voie ASGI
+        with self.asgi_app.flask_app.app_context():
+            facade.update_place(self.place_id, {'title': 'Studio'})
+            db.session.remove()
+        status, headers, body = await self.request(path)
+        self.assertEqual((headers[b'x-cache'], body['title']),
+                         (b'MISS', 'Studio'))
+
+    async def test_other_routes_delegated_to_flask(self):
+        status, _, body = await self.request('/api/v1/protected/')
+        self.assertEqual(status, 401)
+
+    async def test_fields_and_include_delegated_to_flask(self):
+        status, _, body = await self.request('/api/v1/places/',
+                                             b'fields=title')
+        self.assertEqual(status, 200)
+        self.assertEqual(body, [{'id': self.place_id, 'title': 'Flat'}])
+        status, _, body = await self.request(
+            f'/api/v1/places/{self.place_id}', b'include=reviews')
+        self.assertEqual(status, 200)
+        self.assertEqual(body['reviews'], [])
+
+    async def test_writes_delegated_to_flask(self):
+        # Pas d'écriture asynchrone : POST passe par Flask et son JWT
+        status, _, _ = await self.request(
+            '/api/v1/amenities/', method='POST', body=b'{"name": "Pool"}',
+            headers=[(b'content-type', b'application/json')])
+        self.assertEqual(status, 401)
+        self.assertFalse(hasattr(self.asgi_app.facade, 'create_amenity'))
+
+if __name__ == '__main__':
+    unittest.main()
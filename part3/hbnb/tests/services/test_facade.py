@@ -0,0 +1,529 @@
+from app import create_app
+from app.models import db
+from app.services import facade
+from app.persistence import repository
+from sqlalchemy.exc import IntegrityError
+from unittest import mock
+import unittest
+
+
+class TestFacadeBatch(unittest.TestCase):
+    """Tests des créations en masse de la façade"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'})
+        self.guest = facade.create_user({
+            'email': 'guest@example.com', 'first_name': 'Guest',
+            'last_name': 'User', 'password': 'password123'})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_create_places_batch(self):
+        wifi = facade.create_amenity("WiFi")
+        results = facade.create_places_batch([
+            {'title': 'Flat', 'price': 80.0, 'latitude': 48.8,
+             'longitude': 2.3, 'amenities': [wifi.id, 'unknown']},
+            {'title': 'Loft', 'price': -5.0, 'latitude': 48.8,
+             'longitude': 2.3},
+            {'title': 'Barn', 'price': 20.0, 'latitude': 45.0,
+             'longitude': 1.0},
+        ], self.owner.id, chunk_size=1)
+
+        self.assertEqual(results[0][0].amenities, [wifi])
+        self.assertIsNone(results[1][0])
+        self.assertEqual(results[1][1], "Price must be positive")
+        self.assertIsNotNone(results[2][0])
+        self.assertEqual(len(facade.get_all_places()), 2)
+
+    def test_create_places_batch_unknown_owner(self):
+        with self.assertRaises(ValueError):
+            facade.create_places_batch([], 'unknown')
+
+    def test_create_reviews_batch(self):
+        place = facade.create_place({
+            'title': 'Flat', 'price': 80.0, 'latitude': 48.8,
+            'longitude': 2.3, 'owner_id': self.owner.id})
+        results = facade.create_reviews_batch([
+            {'text': 'Great', 'rating': 5, 'place_id': place.id},
+            {'text': 'Again', 'rating': 4, 'place_id': place.id},
+            {'text': 'Where?', 'rating': 4, 'place_id': 'unknown'},
+        ], self.guest.id)
+
+        self.assertIsNotNone(results[0][0])
+        self.assertEqual(results[1][1], "You have already reviewed this place")
+        self.assertEqual(results[2][1], "Place with ID unknown not found")
+
+        results = facade.create_reviews_batch([
+            {'text': 'Mine', 'rating': 5, 'place_id': place.id}],
+            self.owner.id)
+        self.assertEqual(results[0][1], "You cannot review your own place")
+        self.assertEqual(len(facade.get_all_reviews()), 1)
+
+
+    def _concurrent_duplicate(self):
+        """Trois hébergements, dont un déjà noté par un autre processus."""
+        places = [facade.create_place({
+            'title': f'Place {n}', 'price': 80.0, 'latitude': 48.8,
+            'longitude': 2.3, 'owner_id': self.owner.id}) for n in range(3)]
+        facade.create_review({'text': 'First', 'rating': 5,
+                              'user_id': self.guest.id,
+                              'place_id': places[1].id})
+        # Avis créé après la vérification has_reviewed, comme une requête
+        # concurrente : seule la contrainte unique le détecte
+        patch = mock.patch.object(facade.review_repo,
+                                  'get_reviewed_place_ids',
+                                  return_value=set())
+        items = [{'text': f'Review {n}', 'rating': 4, 'place_id': place.id}
+                 for n, place in enumerate(places)]
+        return [place.id for place in places], patch, items
+
+    def test_failed_chunk_is_retried_item_by_item(self):
+        place_ids, patch, items = self._concurrent_duplicate()
+        with patch, self.assertLogs('app', level='WARNING') as logs:
+            results = facade.create_reviews_batch(items, self.guest.id)
+        db.session.remove()
+
+        # Un seul message pour le lot, pas un par élément
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('retrying item by item', logs.output[0])
+        self.assertIsNotNone(results[0][0])
+        self.assertEqual(results[1], (None, "Database error, item not created"))
+        self.assertIsNotNone(results[2][0])
+        self.assertEqual(len(facade.get_all_reviews()), 3)
+        # Agrégats : uniquement les avis réellement créés
+        self.assertEqual([facade.get_place(place_id).review_count
+                          for place_id in place_ids], [1, 1, 1])
+
+    def test_batch_failure_propagates_in_unit_of_work(self):
+        _, patch, items = self._concurrent_duplicate()
+        with patch, self.assertRaises(IntegrityError):
+            with facade.transaction():
+                facade.create_amenity("Pool")
+                facade.create_reviews_batch(items, self.guest.id)
+        db.session.remove()
+        # Tout le bloc est annulé, rien n'est validé à moitié
+        self.assertEqual(len(facade.get_all_reviews()), 1)
+        self.assertEqual(facade.get_all_amenities(), [])
+
+
+class TestFacadeRange(unittest.TestCase):
+    """Tests des filtres par intervalle de la façade"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'})
+        for price in (120.0, 45.0, 80.0, 300.0):
+            facade.create_place({
+                'title': f'Place {price}', 'price': price, 'latitude': 10.0,
+                'longitude': 20.0, 'owner_id': owner.id})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_get_places_in_range(self):
+        places = facade.get_places_in_range('price', 45.0, 120.0)
+        self.assertEqual([p.price for p in places], [45.0, 80.0, 120.0])
+        places = facade.get_places_in_range('price', low=100.0)
+        self.assertEqual([p.price for p in places], [120.0, 300.0])
+
+    def test_get_places_in_range_rejects_other_attributes(self):
+        with self.assertRaises(ValueError):
+            facade.get_places_in_range('title', 'a', 'z')
+
+
+
+class TestFacadeReviewsByPlace(unittest.TestCase):
+    """Tests des avis d'un hébergement (requête indexée et paginée)"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'})
+        self.place = facade.create_place({
+            'title': 'Flat', 'price': 80.0, 'latitude': 48.8,
+            'longitude': 2.3, 'owner_id': owner.id})
+        other = facade.create_place({
+            'title': 'Loft', 'price': 90.0, 'latitude': 48.8,
+            'longitude': 2.3, 'owner_id': owner.id})
+        self.guests = []
+        for i, rating in enumerate((4, 2, 5, 2)):
+            guest = facade.create_user({
+                'email': f'guest{i}@example.com', 'first_name': 'Guest',
+                'last_name': 'User', 'password': 'password123'})
+            self.guests.append(guest)
+            facade.create_review({'text': 'Nice', 'rating': rating,
+                                  'user_id': guest.id,
+                                  'place_id': self.place.id})
+        facade.create_review({'text': 'Other', 'rating': 1,
+                              'user_id': self.guests[0].id,
+                              'place_id': other.id})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_get_reviews_by_place_filters_on_place(self):
+        reviews = facade.get_reviews_by_place(self.place.id)
+        self.assertEqual(len(reviews), 4)
+        self.assertTrue(all(r.place_id == self.place.id for r in reviews))
+
+    def test_pages_sorted_by_rating(self):
+        ratings, cursor = [], None
+        while True:
+            page, cursor = facade.get_reviews_by_place_page(
+                self.place.id, 3, cursor, sort='rating', order='desc')
+            ratings.extend(review.rating for review in page)
+            if not cursor:
+                break
+        self.assertEqual(ratings, [5, 4, 2, 2])
+
+    def test_invalid_sort_rejected(self):
+        with self.assertRaises(ValueError):
+            facade.get_reviews_by_place_page(self.place.id, 10, sort='text')
+        with self.assertRaises(ValueError):
+            facade.get_reviews_by_place_page(self.place.id, 10,
+                                             cursor='not-a-cursor')
+
+    def test_duplicate_review_rejected_by_unique_index(self):
+        # Simule une course : la vérification applicative est contournée
+        with self.assertRaises(ValueError) as ctx:
+            facade.create_review({'text': 'Again', 'rating': 3,
+                                  'user_id': self.guests[0].id,
+                                  'place_id': self.place.id})
+        self.assertEqual(str(ctx.exception),
+                         "You have already reviewed this place")
+        self.assertEqual(len(facade.get_reviews_by_place(self.place.id)), 4)
+
+    def test_has_reviewed_place(self):
+        self.assertTrue(facade.has_reviewed_place(self.guests[1].id,
+                                                  self.place.id))
+        self.assertFalse(facade.has_reviewed_place(self.guests[1].id,
+                                                   'unknown'))
+
+
+
+class TestFacadeRatingStats(unittest.TestCase):
+    """Tests des agrégats d'avis maintenus sur Place"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'})
+        self.place_id = facade.create_place({
+            'title': 'Flat', 'price': 80.0, 'latitude': 48.8,
+            'longitude': 2.3, 'owner_id': owner.id}).id
+        self.guests = [facade.create_user({
+            'email': f'guest{i}@example.com', 'first_name': 'Guest',
+            'last_name': 'User', 'password': 'password123'}).id
+            for i in range(3)]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _review(self, guest, rating):
+        return facade.create_review({'text': 'Nice', 'rating': rating,
+                                     'user_id': guest,
+                                     'place_id': self.place_id})
+
+    def _stats(self):
+        db.session.remove()
+        place = facade.get_place(self.place_id)
+        return (place.review_count, place.rating_sum, place.average_rating,
+                place.rating_histogram)
+
+    def test_new_place_has_empty_stats(self):
+        self.assertEqual(self._stats(), (0, 0, None, {
+            '1': 0, '2': 0, '3': 0, '4': 0, '5': 0}))
+
+    def test_stats_follow_create_update_delete(self):
+        first = self._review(self.guests[0], 5).id
+        self._review(self.guests[1], 2)
+        self.assertEqual(self._stats()[:3], (2, 7, 3.5))
+
+        facade.update_review(first, {'rating': 4})
+        count, total, _, histogram = self._stats()
+        self.assertEqual((count, total), (2, 6))
+        self.assertEqual((histogram['4'], histogram['5']), (1, 0))
+
+        facade.delete_review(first)
+        self.assertEqual(self._stats()[:3], (1, 2, 2.0))
+
+    def test_batch_creation_updates_stats(self):
+        facade.create_reviews_batch(
+            [{'text': 'Nice', 'rating': 3, 'place_id': self.place_id}],
+            self.guests[2])
+        self.assertEqual(self._stats()[:2], (1, 3))
+
+    def test_repair_recomputes_from_reviews(self):
+        self._review(self.guests[0], 5)
+        self._review(self.guests[1], 1)
+        db.session.execute(db.text(
+            "UPDATE places SET review_count = 42, rating_5 = 0"))
+        db.session.commit()
+
+        self.assertEqual(facade.repair_rating_stats(), 1)
+        count, total, _, histogram = self._stats()
+        self.assertEqual((count, total), (2, 6))
+        self.assertEqual((histogram['1'], histogram['5']), (1, 1))
+
+
+
+class TestFacadeSearch(unittest.TestCase):
+    """Tests de la recherche filtrée d'hébergements"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'})
+        self.wifi = facade.create_amenity("WiFi").id
+        self.pool = facade.create_amenity("Pool").id
+        self.places = {}
+        for title, price, lat, lng, amenities in [
+                ('Paris', 80.0, 48.8, 2.3, [self.wifi]),
+                ('Nice', 150.0, 43.7, 7.2, [self.wifi, self.pool]),
+                ('Lyon', 60.0, 45.7, 4.8, []),
+                ('Fiji', 200.0, -17.7, 178.0, [self.pool]),
+                ('Samoa', 120.0, -13.8, -172.1, [self.pool])]:
+            self.places[title] = facade.create_place({
+                'title': title, 'price': price, 'latitude': lat,
+                'longitude': lng, 'owner_id': owner.id,
+                'amenities': amenities}).id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _titles(self, **kwargs):
+        places, _ = facade.search_places(50, **kwargs)
+        return sorted(place.title for place in places)
+
+    def test_price_range(self):
+        self.assertEqual(self._titles(min_price=70, max_price=150),
+                         ['Nice', 'Paris', 'Samoa'])
+        with self.assertRaises(ValueError):
+            facade.search_places(50, min_price=100, max_price=10)
+
+    def test_amenities_are_all_required(self):
+        self.assertEqual(self._titles(amenity_ids=[self.wifi]),
+                         ['Nice', 'Paris'])
+        self.assertEqual(self._titles(amenity_ids=[self.wifi, self.pool]),
+                         ['Nice'])
+
+    def test_bounding_box(self):
+        self.assertEqual(self._titles(bbox=(42.0, -5.0, 51.0, 8.0)),
+                         ['Lyon', 'Nice', 'Paris'])
+        # Zone qui traverse l'antiméridien
+        self.assertEqual(self._titles(bbox=(-20.0, 170.0, -10.0, -170.0)),
+                         ['Fiji', 'Samoa'])
+        with self.assertRaises(ValueError):
+            facade.search_places(50, bbox=(50.0, 0.0, 40.0, 10.0))
+
+    def test_sorted_pages(self):
+        titles, cursor = [], None
+        while True:
+            places, cursor = facade.search_places(
+                2, cursor, min_price=70, sort='price', order='desc')
+            titles += [place.title for place in places]
+            if cursor is None:
+                break
+        self.assertEqual(titles, ['Fiji', 'Nice', 'Samoa', 'Paris'])
+        with self.assertRaises(ValueError):
+            facade.search_places(2, sort='title')
+
+
+
+class TestFacadeNearby(unittest.TestCase):
+    """Tests de la recherche de proximité (index geohash)"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'}).id
+        self.places = {}
+        for title, lat, lng in [('Louvre', 48.8606, 2.3376),
+                                ('Eiffel', 48.8584, 2.2945),
+                                ('Versailles', 48.8049, 2.1204),
+                                ('London', 51.5074, -0.1278),
+                                ('Fiji', -17.7, 179.9),
+                                ('Samoa', -17.7, -179.9)]:
+            self._place(title, lat, lng)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _place(self, title, lat, lng):
+        self.places[title] = facade.create_place({
+            'title': title, 'price': 100.0, 'latitude': lat,
+            'longitude': lng, 'owner_id': self.owner}).id
+
+    def _nearby(self, lat, lng, radius_km, limit=10):
+        return [(place.title, round(distance, 1)) for place, distance in
+                facade.get_places_nearby(lat, lng, radius_km, limit)]
+
+    def test_ordered_by_distance_within_radius(self):
+        # Depuis Notre-Dame
+        self.assertEqual(self._nearby(48.853, 2.3499, 20),
+                         [('Louvre', 1.2), ('Eiffel', 4.1),
+                          ('Versailles', 17.6)])
+        self.assertEqual(self._nearby(48.853, 2.3499, 20, limit=1),
+                         [('Louvre', 1.2)])
+        self.assertEqual(self._nearby(48.853, 2.3499, 0.5), [])
+
+    def test_across_the_antimeridian(self):
+        self.assertEqual([title for title, _ in self._nearby(-17.7, 179.95, 50)],
+                         ['Fiji', 'Samoa'])
+
+    def test_moved_place_is_reindexed(self):
+        facade.update_place(self.places['London'],
+                            {'latitude': 48.86, 'longitude': 2.35})
+        db.session.remove()
+        self.assertEqual(self._nearby(48.86, 2.35, 0.1)[0][0], 'London')
+
+    def test_unindexed_place_is_not_skipped(self):
+        # Import SQL direct : pas encore de geohash
+        db.session.execute(db.text(
+            "INSERT INTO places (id, title, price, latitude, longitude, "
+            "owner_id) VALUES ('imported', 'Imported', 80, 48.8530, 2.3500, "
+            ":owner)"), {'owner': self.owner})
+        db.session.commit()
+        self.assertEqual(self._nearby(48.853, 2.3499, 2),
+                         [('Imported', 0.0), ('Louvre', 1.2)])
+
+    def test_candidates_read_in_chunks(self):
+        with mock.patch.object(repository, 'NEARBY_CHUNK_SIZE', 1):
+            self.assertEqual(self._nearby(48.853, 2.3499, 20, limit=2),
+                             [('Louvre', 1.2), ('Eiffel', 4.1)])
+
+    def test_invalid_position(self):
+        with self.assertRaises(ValueError):
+            facade.get_places_nearby(95.0, 0.0, 10, 10)
+        with self.assertRaises(ValueError):
+            facade.get_places_nearby(0.0, 0.0, 0, 10)
+
+
+
+class TestFacadeFullText(unittest.TestCase):
+    """Tests de la recherche plein texte (FTS5)"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'}).id
+        self.guest = facade.create_user({
+            'email': 'guest@example.com', 'first_name': 'Guest',
+            'last_name': 'User', 'password': 'password123'}).id
+        self.places = {}
+        for title, description, price in [
+                ('Terrasse sur le canal', 'Studio calme', 60.0),
+                ('Loft', 'Grand loft avec terrasse', 90.0),
+                ('Chalet', 'Chalet en bois près des pistes', 120.0)]:
+            self.places[title] = facade.create_place({
+                'title': title, 'description': description, 'price': price,
+                'latitude': 45.0, 'longitude': 6.0, 'owner_id': owner}).id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _titles(self, query, **kwargs):
+        places, _ = facade.search_places(50, text_query=query, **kwargs)
+        return [place.title for place in places]
+
+    def test_title_match_ranks_first(self):
+        self.assertEqual(self._titles('terrasse'),
+                         ['Terrasse sur le canal', 'Loft'])
+        self.assertEqual(self._titles('terrasse', max_price=80),
+                         ['Terrasse sur le canal'])
+
+    def test_words_are_required_last_one_is_a_prefix(self):
+        self.assertEqual(self._titles('PRES pist'), ['Chalet'])
+        self.assertEqual(self._titles('chalet terrasse'), [])
+        with self.assertRaises(ValueError):
+            facade.search_places(50, text_query='" * ')
+
+    def test_reviews_are_searched_and_kept_in_sync(self):
+        review = facade.create_review({
+            'text': 'Piscine chauffée, parfait', 'rating': 5,
+            'user_id': self.guest, 'place_id': self.places['Chalet']})
+        self.assertEqual(self._titles('piscine'), ['Chalet'])
+        excerpts = facade.get_search_snippets('piscine',
+                                              [self.places['Chalet']])
+        self.assertEqual(excerpts[self.places['Chalet']],
+                         '<mark>Piscine</mark> chauffée, parfait')
+
+        facade.update_review(review.id, {'text': 'Jacuzzi'})
+        self.assertEqual(self._titles('piscine'), [])
+        facade.delete_review(review.id)
+        self.assertEqual(self._titles('jacuzzi'), [])
+
+    def test_snippets_escape_user_html(self):
+        place_id = facade.create_place({
+            'title': '<script>alert(1)</script> Cabane & "lac"',
+            'price': 50.0, 'latitude': 45.0, 'longitude': 6.0,
+            'owner_id': self.guest}).id
+        excerpts = facade.get_search_snippets('cabane', [place_id])
+        self.assertEqual(
+            excerpts[place_id],
+            '&lt;script&gt;alert(1)&lt;/script&gt; <mark>Cabane</mark> '
+            '&amp; &quot;lac&quot;')
+
+    def test_updated_place_is_reindexed(self):
+        facade.update_place(self.places['Chalet'],
+                            {'description': 'Chalet en pierre'})
+        self.assertEqual(self._titles('bois'), [])
+        self.assertEqual(self._titles('pierre'), ['Chalet'])
+
+    def test_relevance_pages(self):
+        titles, cursor = [], None
+        while True:
+            places, cursor = facade.search_places(
+                1, cursor, text_query='terrasse')
+            titles += [place.title for place in places]
+            if cursor is None:
+                break
+        self.assertEqual(titles, ['Terrasse sur le canal', 'Loft'])
+        self.assertEqual(self._titles('terrasse', sort='price',
+                                      order='desc'),
+                         ['Loft', 'Terrasse sur le canal'])
+        with self.assertRaises(ValueError):
+            facade.search_places(10, sort='relevance')
+
+
+if __name__ == '__main__':
+    unittest.main()
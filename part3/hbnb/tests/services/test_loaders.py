@@ -0,0 +1,254 @@
+from app import create_app
+from app.models import db
+from app.services import facade
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+import unittest
+
+
+class QueryCountTestCase(unittest.TestCase):
+    """Application de test qui enregistre les requêtes SQL exécutées"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.statements = []
+        event.listen(db.engine, 'before_cursor_execute', self._count)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._count)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _count(self, conn, cursor, statement, parameters, context,
+               executemany):
+        # Requête d'agrégat des validateurs HTTP : hors lecture des données
+        if not context.execution_options.get('resource_version'):
+            self.statements.append(statement)
+
+    def _seed(self, count):
+        wifi = facade.create_amenity("WiFi")
+        guest = facade.create_user({
+            'email': f'guest{count}@example.com', 'first_name': 'Guest',
+            'last_name': 'User', 'password': 'password123'})
+        for i in range(count):
+            owner = facade.create_user({
+                'email': f'owner{count}-{i}@example.com',
+                'first_name': 'Owner', 'last_name': str(i),
+                'password': 'password123'})
+            place = facade.create_place({
+                'title': f'Place {i}', 'price': 50.0, 'latitude': 1.0,
+                'longitude': 2.0, 'owner_id': owner.id,
+                'amenities': [wifi.id]})
+            facade.create_review({'text': 'Nice', 'rating': 4,
+                                  'user_id': guest.id, 'place_id': place.id})
+        db.session.remove()
+
+    def _queries_for(self, url):
+        self.statements = []
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(self.statements), response.get_json()
+
+
+class TestLoaderProfiles(QueryCountTestCase):
+    """Les listes exécutent un nombre de requêtes fixe (pas de N+1)"""
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        self._seed(2)
+        small_places, _ = self._queries_for('/api/v1/places/')
+        small_reviews, _ = self._queries_for('/api/v1/reviews/')
+        self._seed(8)
+        places_queries, places = self._queries_for('/api/v1/places/')
+        reviews_queries, reviews = self._queries_for('/api/v1/reviews/')
+
+        self.assertEqual(len(places), 10)
+        self.assertEqual(places[0]['amenities'][0]['name'], 'WiFi')
+        self.assertEqual(reviews[0]['first_name'], 'Guest')
+        self.assertEqual(places_queries, small_places)
+        self.assertEqual(reviews_queries, small_reviews)
+
+    def test_detail_loads_owner_and_amenities_up_front(self):
+        self._seed(1)
+        place_id = facade.get_all_places()[0].id
+        db.session.remove()
+        queries, place = self._queries_for(f'/api/v1/places/{place_id}')
+        self.assertEqual(place['owner']['first_name'], 'Owner')
+        self.assertLessEqual(queries, 2)
+
+    def test_minimal_profile_forbids_lazy_loads(self):
+        self._seed(1)
+        place_id = facade.get_all_places()[0].id
+        db.session.remove()
+        place = facade.get_place(place_id, profile='minimal')
+        self.assertIsNotNone(place.owner_id)
+        with self.assertRaises(InvalidRequestError):
+            place.owner
+
+    def test_unknown_profile(self):
+        with self.assertRaises(ValueError):
+            facade.get_place('any', profile='everything')
+
+
+class TestFieldsets(QueryCountTestCase):
+    """?fields= ne charge et ne renvoie que les champs demandés"""
+
+    def test_getters_match_fieldsets(self):
+        from app.api.v1.amenities import AMENITY_FIELDS
+        from app.api.v1.places import PLACE_FIELDS
+        from app.api.v1.reviews import REVIEW_FIELDS
+        from app.api.v1.users import USER_FIELDS
+        from app.models.amenity import Amenity
+        from app.models.place import Place
+        from app.models.review import Review
+        from app.models.user import User
+        from app.services.loaders import FIELDSETS
+        for model, getters in ((Place, PLACE_FIELDS), (Review, REVIEW_FIELDS),
+                               (User, USER_FIELDS),
+                               (Amenity, AMENITY_FIELDS)):
+            self.assertEqual(set(getters), set(FIELDSETS[model]))
+
+    def test_places_select_only_requested_columns(self):
+        self._seed(3)
+        queries, places = self._queries_for(
+            '/api/v1/places/?fields=title,price')
+        self.assertEqual(queries, 1)
+        self.assertEqual(places[0], {'id': places[0]['id'],
+                                     'title': 'Place 0', 'price': 50.0})
+        self.assertIn('places.price', self.statements[0])
+        self.assertNotIn('places.description', self.statements[0])
+
+    def test_related_fields(self):
+        self._seed(2)
+        _, places = self._queries_for('/api/v1/places/?fields=amenities')
+        self.assertEqual(places[0]['amenities'][0]['name'], 'WiFi')
+        _, reviews = self._queries_for(
+            '/api/v1/reviews/?fields=rating,first_name')
+        self.assertEqual(set(reviews[0]), {'id', 'rating', 'first_name'})
+        self.assertEqual(reviews[0]['first_name'], 'Guest')
+        self.assertNotIn('users_1.email', self.statements[-1])
+
+    def test_users_and_amenities(self):
+        self._seed(1)
+        _, users = self._queries_for('/api/v1/users/?fields=email')
+        self.assertEqual(set(users[0]), {'id', 'email'})
+        _, amenities = self._queries_for('/api/v1/amenities/?fields=name')
+        self.assertEqual(amenities[0]['name'], 'WiFi')
+
+    def test_unknown_field(self):
+        response = self.client.get('/api/v1/places/?fields=title,secret')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/users/?fields=password')
+        self.assertEqual(response.status_code, 400)
+
+
+class TestPlaceIncludes(QueryCountTestCase):
+    """?include= embarque les relations en un nombre borné de requêtes"""
+
+    def test_compound_document(self):
+        self._seed(1)
+        place = facade.get_all_places()[0]
+        guest = facade.get_user_by_email('guest1@example.com')
+        for i in range(4):
+            author = facade.create_user({
+                'email': f'author{i}@example.com', 'first_name': f'A{i}',
+                'last_name': 'Author', 'password': 'password123'})
+            facade.create_review({'text': 'Good', 'rating': 5,
+                                  'user_id': author.id,
+                                  'place_id': place.id})
+        place_id, guest_id = place.id, guest.id
+        db.session.remove()
+
+        url = (f'/api/v1/places/{place_id}'
+               '?include=owner,amenities,reviews&limit=3')
+        self.statements = []
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertLessEqual(len(self.statements), 3)
+        self.assertEqual(body['owner']['first_name'], 'Owner')
+        self.assertEqual(body['amenities'][0]['name'], 'WiFi')
+        self.assertEqual(len(body['reviews']), 3)
+        self.assertEqual(body['reviews'][0]['user_id'], guest_id)
+        self.assertEqual(body['reviews'][0]['first_name'], 'Guest')
+
+        cursor = response.headers['X-Next-Cursor']
+        _, body = self._queries_for(f'{url}&cursor={cursor}')
+        self.assertEqual([r['first_name'] for r in body['reviews']],
+                         ['A2', 'A3'])
+
+    def test_only_requested_relations(self):
+        self._seed(1)
+        place_id = facade.get_all_places()[0].id
+        db.session.remove()
+        queries, body = self._queries_for(
+            f'/api/v1/places/{place_id}?include=amenities')
+        self.assertEqual(queries, 2)
+        self.assertIn('owner_id', body)
+        self.assertNotIn('owner', body)
+        self.assertNotIn('reviews', body)
+
+    def test_unknown_include(self):
+        response = self.client.get('/api/v1/places/any?include=secrets')
+        self.assertEqual(response.status_code, 400)
+
+
+class TestLookup(QueryCountTestCase):
+    """?ids= et POST /lookup résolvent des IDs en une requête IN"""
+
+    def test_places_by_ids(self):
+        self._seed(5)
+        place_ids = [place.id for place in facade.get_all_places()]
+        db.session.remove()
+        wanted = [place_ids[3], 'unknown', place_ids[0], place_ids[3]]
+        queries, body = self._queries_for(
+            f"/api/v1/places/?ids={','.join(wanted)}")
+        self.assertLessEqual(queries, 2)
+        self.assertEqual(list(body['results']), [place_ids[3], place_ids[0]])
+        self.assertEqual(body['results'][place_ids[0]]['owner']['last_name'],
+                         '0')
+        self.assertEqual(body['missing'], ['unknown'])
+
+    def test_post_variant(self):
+        self._seed(3)
+        review_ids = [review.id for review in facade.get_all_reviews()]
+        db.session.remove()
+        self.statements = []
+        response = self.client.post('/api/v1/reviews/lookup',
+                                    json={'ids': review_ids + ['x']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.statements), 1)
+        body = response.get_json()
+        self.assertEqual(list(body['results']), review_ids)
+        self.assertEqual(body['results'][review_ids[0]]['first_name'],
+                         'Guest')
+        self.assertEqual(body['missing'], ['x'])
+
+    def test_users_and_amenities(self):
+        self._seed(1)
+        user = facade.get_user_by_email('guest1@example.com')
+        user_id, amenity_id = user.id, facade.get_all_amenities()[0].id
+        _, body = self._queries_for(f'/api/v1/users/?ids={user_id}')
+        self.assertEqual(set(body['results'][user_id]),
+                         {'id', 'first_name', 'last_name', 'email'})
+        response = self.client.post('/api/v1/amenities/lookup',
+                                    json={'ids': [amenity_id]})
+        self.assertEqual(response.get_json()['results'][amenity_id]['name'],
+                         'WiFi')
+
+    def test_invalid_ids(self):
+        self.assertEqual(self.client.get('/api/v1/places/?ids=,').status_code,
+                         400)
+        response = self.client.post('/api/v1/users/lookup',
+                                    json={'ids': 'not-a-list'})
+        self.assertEqual(response.status_code, 400)
+        self.app.config['LOOKUP_MAX_IDS'] = 2
+        response = self.client.get('/api/v1/amenities/?ids=a,b,c')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
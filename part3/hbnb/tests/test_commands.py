@@ -0,0 +1,67 @@
+from app import create_app
+from app.models import db
+from config import TestingConfig
+import os
+import tempfile
+import unittest
+
+
+class TestRepairRatingStatsCommand(unittest.TestCase):
+    """Tests de la commande flask repair-rating-stats"""
+
+    def test_recomputes_after_direct_sql_import(self):
+        db_path = os.path.join(tempfile.mkdtemp(), 'import.db')
+        config = type('ImportConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+        app = create_app(config)
+        with app.app_context():
+            db.session.execute(db.text(
+                "INSERT INTO places (id, title, price, latitude, longitude, "
+                "owner_id) VALUES ('place-1', 'Flat', 80, 1, 2, 'owner')"))
+            db.session.execute(db.text(
+                "INSERT INTO reviews (id, text, rating, user_id, place_id) "
+                "VALUES ('r1', 'Nice', 4, 'guest', 'place-1')"))
+            db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=['repair-rating-stats'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('1 places with reviews', result.output)
+        with app.app_context():
+            row = db.session.execute(db.text(
+                "SELECT review_count, rating_sum, rating_4 FROM places")).one()
+            db.session.remove()
+            db.engine.dispose()
+        self.assertEqual(tuple(row), (1, 4, 1))
+
+
+
+class TestIndexPlaceLocationsCommand(unittest.TestCase):
+    """Tests de la commande flask index-place-locations"""
+
+    def test_fills_missing_geohashes(self):
+        db_path = os.path.join(tempfile.mkdtemp(), 'old.db')
+        config = type('GeoConfig', (TestingConfig,), {
+            'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}'})
+        app = create_app(config)
+        with app.app_context():
+            db.session.execute(db.text(
+                "INSERT INTO places (id, title, price, latitude, longitude, "
+                "owner_id) VALUES ('place-1', 'Flat', 80, 48.8584, 2.2945, "
+                "'owner')"))
+            db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=['index-place-locations'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Geohash computed for 1 places', result.output)
+        with app.app_context():
+            geohash = db.session.execute(db.text(
+                "SELECT geohash FROM places")).scalar()
+            db.session.remove()
+            db.engine.dispose()
+        self.assertEqual(geohash, 'u09tunquc')
+
+
+if __name__ == '__main__':
+    unittest.main()
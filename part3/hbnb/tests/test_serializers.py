@@ -0,0 +1,96 @@
+from app import create_app
+from app.models import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.serializers import Field, compile_serializer, serialize, serializer
+from app.services import facade
+from app.services.loaders import loader_options
+from sqlalchemy.exc import InvalidRequestError
+import unittest
+
+
+class TestSerializers(unittest.TestCase):
+    """Tests des sérialiseurs précompilés"""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        owner = facade.create_user({
+            'email': 'owner@example.com', 'first_name': 'Property',
+            'last_name': 'Owner', 'password': 'password123'})
+        wifi = facade.create_amenity("WiFi")
+        place = facade.create_place({
+            'title': 'Flat', 'description': 'Nice flat', 'price': 80.0,
+            'latitude': 48.8, 'longitude': 2.3, 'owner_id': owner.id,
+            'amenities': [wifi.id]})
+        bare = facade.create_place({
+            'title': 'Room', 'price': 30.0, 'latitude': 1.0,
+            'longitude': 2.0, 'owner_id': owner.id})
+        self.owner_id, self.wifi_id = owner.id, wifi.id
+        self.place_id, self.bare_id = place.id, bare.id
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _expected_card(self, place):
+        return {"id": place.id, "title": place.title,
+                "description": place.description, "price": place.price,
+                "latitude": place.latitude, "longitude": place.longitude,
+                "owner_id": place.owner_id,
+                "amenities": [{"id": self.wifi_id, "name": "WiFi"}],
+                "images": None, "review_count": 0, "average_rating": None,
+                "rating_histogram": {str(star): 0 for star in range(1, 6)}}
+
+    def test_card_and_detail(self):
+        place = facade.get_place(self.place_id, profile='detail')
+        card = serializer(Place, 'card')(place)
+        self.assertEqual(card, self._expected_card(place))
+        self.assertEqual(list(card), list(self._expected_card(place)))
+
+        detail = serialize(place, 'detail')
+        self.assertNotIn('owner_id', detail)
+        self.assertEqual(detail['owner'], {
+            'id': self.owner_id, 'first_name': 'Property',
+            'last_name': 'Owner', 'email': 'owner@example.com'})
+
+    def test_empty_amenities_omitted(self):
+        place = facade.get_place(self.bare_id, profile='detail')
+        self.assertNotIn('amenities', serialize(place, 'card'))
+
+    def test_unloaded_attributes_fall_back(self):
+        place = facade.get_place(self.place_id, profile='detail')
+        expected = serialize(place, 'card')
+        # Après un commit, les attributs sont expirés : lecture paresseuse
+        db.session.commit()
+        self.assertNotIn('title', place.__dict__)
+        self.assertEqual(serialize(place, 'card'), expected)
+
+    def test_raiseload_still_raises(self):
+        place = db.session.get(Place, self.place_id,
+                               options=loader_options(Place, 'minimal'))
+        with self.assertRaises(InvalidRequestError):
+            serialize(place, 'card')
+
+    def test_to_dict_uses_mapped_columns(self):
+        amenity = db.session.get(Amenity, self.wifi_id)
+        result = amenity.to_dict()
+        self.assertNotIn('_sa_instance_state', result)
+        self.assertEqual(result['name'], 'WiFi')
+        self.assertEqual(result['__class__'], 'Amenity')
+        self.assertIsInstance(result['created_at'], str)
+
+    def test_unknown_view(self):
+        with self.assertRaises(KeyError):
+            serializer(Place, 'everything')
+
+    def test_invalid_source(self):
+        with self.assertRaises(ValueError):
+            compile_serializer('bad', [Field('x', 'os.system("x")')])
+
+
+if __name__ == '__main__':
+    unittest.main()
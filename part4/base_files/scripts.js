@@ -188,23 +188,42 @@ function getCookie(cookieName) {
 }
 
 // ------------------------------------------------------
-// Récupère la liste des lieux via l’API, et l’affiche (pour la page d'accueil/index.html)
+// Récupère les lieux via la recherche de l’API (prix max filtré par le serveur),
+// page après page jusqu’à la dernière, et les affiche (page d'accueil/index.html)
 // ------------------------------------------------------
-async function fetchPlaces(token) {
-    const response = await fetch('http://127.0.0.1:5000/api/v1/places/', {
-        method: 'GET',
-        headers: {
-            'Content-Type': 'application/json',
-            ...(token ? { 'Authorization': `Bearer ${token}` } : {})
+let latestPlacesRequest = 0;
+
+async function fetchPlaces(token, maxPrice = 'All') {
+    const request = ++latestPlacesRequest;
+    const params = new URLSearchParams({ limit: '500' });
+    if (maxPrice !== 'All') {
+        params.set('max_price', maxPrice);
+    }
+    const places = [];
+    let cursor = null;
+    do {
+        if (cursor) {
+            params.set('cursor', cursor);
         }
-    });
+        const response = await fetch(`http://127.0.0.1:5000/api/v1/places/search?${params}`, {
+            method: 'GET',
+            headers: {
+                'Content-Type': 'application/json',
+                ...(token ? { 'Authorization': `Bearer ${token}` } : {})
+            }
+        });
+        if (!response.ok) {
+            await showApiError(response, "Impossible de charger les lieux.");
+            return;
+        }
+        places.push(...await response.json());
+        // Curseur de la page suivante (absent sur la dernière page)
+        cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor);
 
-    if (response.ok) {
-        const places = await response.json();
-        window.allPlaces = places; // Stockage global (pour filtrer sans re-fetch)
+    // Un changement de filtre plus récent a déjà relancé le chargement
+    if (request === latestPlacesRequest) {
         displayPlaces(places);
-    } else {
-        await showApiError(response, "Impossible de charger les lieux.");
     }
 }
 
@@ -228,7 +247,6 @@ function displayPlaces(places) {
             <p>Location: Lat. ${place.latitude}, Long. ${place.longitude}</p>
             <a href="place.html?id=${place.id}" class="details-button">View Details</a>
         `;
-        card.dataset.price = place.price; // Pour le filtrage client
         placesList.appendChild(card);
     });
 }
@@ -254,14 +272,12 @@ function populatePriceFilter() {
 // ------------------------------------------------------
 function filterPlacesByPrice() {
     const maxPrice = document.getElementById('price-filter').value;
-    if (window.allPlaces && Array.isArray(window.allPlaces) && window.allPlaces.length > 0) {
-        let filtered = window.allPlaces;
-        if (maxPrice !== 'All') {
-            filtered = filtered.filter(place => Number(place.price) <= Number(maxPrice));
-        }
-        displayPlaces(filtered);
+    const token = getCookie('token');
+    if (token) {
+        // Filtre appliqué par l’API, sur tous les lieux (pas seulement une page)
+        fetchPlaces(token, maxPrice);
     } else {
-        // Fallback si la liste globale n'est pas dispo (ex : tout était en HTML, non JS)
+        // Fallback : cartes statiques de la page (non connecté)
         document.querySelectorAll('.place-card').forEach(card => {
             const priceP = Array.from(card.querySelectorAll('p')).find(p => p.textContent.includes('Price per night'));
             if (!priceP) return;
@@ -289,8 +305,8 @@ function getPlaceIdFromURL() {
 // ------------------------------------------------------
 async function fetchPlaceDetails(token, placeId) {
     try {
-        // 1. D’abord, récupère les détails du lieu
-        const response = await fetch(`http://127.0.0.1:5000/api/v1/places/${placeId}`, {
+        // Détails du lieu, propriétaire, équipements et avis en un seul appel
+        const response = await fetch(`http://127.0.0.1:5000/api/v1/places/${placeId}?include=owner,amenities,reviews`, {
             method: 'GET',
             headers: {
                 'Content-Type': 'application/json',
@@ -299,21 +315,6 @@ async function fetchPlaceDetails(token, placeId) {
         });
         if (response.ok) {
             const place = await response.json();
-
-            // 2. Ensuite, récupère toutes les reviews de ce lieu
-            const reviewsResponse = await fetch(`http://127.0.0.1:5000/api/v1/reviews/places/${placeId}/reviews`, {
-                method: 'GET',
-                headers: {
-                    'Content-Type': 'application/json',
-                    ...(token ? { 'Authorization': `Bearer ${token}` } : {})
-                }
-            });
-            if (reviewsResponse.ok) {
-                place.reviews = await reviewsResponse.json();
-            } else {
-                place.reviews = [];
-            }
-
             displayPlaceDetails(place);
         } else {
             document.getElementById('place-details').innerHTML = '<p>Erreur de chargement du lieu.</p>';